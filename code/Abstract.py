@@ -1,12 +1,26 @@
 import heapq
-from GraphStruct import SimpleGraph
+import numpy as np
+from GraphStruct import SimpleGraph, FrozenGraph, linear_cost
 #heapq is a mini-python implementation of the heap structur which is extremely efficient to
 #estabilish the order in the Dijekstra's algorithm.
 
 #It uses internally the tabular structure, where children of node tab[i] are tab[2*i+1] and
 #tab[2*i+2]
 
-def best_path(graph, start, end, cost_func, maximize=False):
+def best_path(graph, start, end, cost_func, maximize=False, bidirectional=False, stats=None):
+    # cost_func is either a Python callback cost_func(u, v, tmin, tmax) or a
+    # declarative metric (see resolve_metric): 'tmin', 'tmax', 'marge' or a pair
+    # (a, b) for a*tmin + b*tmax. cost_min / cost_max / cost_marge are recognised
+    # as declarative, so the search never calls them per edge.
+    # bidirectional=True runs the point-to-point bidirectional search instead
+    # (minimisation only). If a dict is given as stats, stats['settled'] receives
+    # the number of nodes pulled out of the heap(s).
+
+    # A start or end that is not in the graph simply has no path: every engine
+    # returns (None, inf), or (None, -inf) when maximising, like the ALT,
+    # contraction and overlay queries. (shortest_path_tree and distance_matrix
+    # return whole arrays and raise ValueError instead.)
+
     # The specification:
     # requires { start, end are in graph }
     # ensures  { forall v: vertex. distances[v] <> inf ->
@@ -19,19 +33,45 @@ def best_path(graph, start, end, cost_func, maximize=False):
     # In a graph with positive weighted edges
     # It may not halt if a negative cycle is contained in the graph
 
+    coeffs = resolve_metric(cost_func)
+    if bidirectional and maximize:
+        raise ValueError('bidirectional search only supports minimisation')
+    if not graph.has_node(start) or not graph.has_node(end):
+        if stats is not None:
+            stats['settled'] = 0
+        return None, float('inf') if not maximize else float('-inf')
+    if bidirectional:
+        return _best_path_bidirectional(graph, start, end, cost_func, coeffs, stats)
+    # On a DAG a single sweep in topological order is exact for any metric,
+    # including the worst (longest) path, and needs no heap at all.
+    order = _dag_order(graph)
+    if order is not None:
+        return _best_path_dag(graph, order, start, end, cost_func, coeffs, maximize, stats)
+    if isinstance(graph, FrozenGraph):
+        return _best_path_frozen(graph, start, end, cost_func, coeffs, maximize, stats)
+    if coeffs is not None:
+        weigh = linear_cost(*coeffs)
+
+    # The search runs on the graph's internal integer ids: distances, precedent
+    # and visited are flat arrays indexed by id, labels are only translated for
+    # cost_func and for the returned path.
+    labels, out = graph._labels, graph._out
+    s, t = graph.node_id(start), graph.node_id(end)
+    n = len(labels)
+
     if maximize:
         # For maximization, negate costs to use min-heap
-        distances = {node: float('-inf') for node in graph.nodes()}
-        distances[start] = 0
+        distances = [float('-inf')] * n
+        distances[s] = 0
 
         # In the heap we are storing (negative_distance, node).
         # It is the induced graph structure for shortest path search.
-        heap = [(0, start)]          
+        heap = [(0, s)]
         multiplier = -1
     else:
-        distances = {node: float('inf') for node in graph.nodes()}
-        distances[start] = 0
-        heap = [(0, start)]  # (distance, node)
+        distances = [float('inf')] * n
+        distances[s] = 0
+        heap = [(0, s)]  # (distance, node)
         multiplier = 1
     
     # distances is a function that maps each node to R, it will be used to store the best 
@@ -39,8 +79,9 @@ def best_path(graph, start, end, cost_func, maximize=False):
 
     # precedents will represent at the end the following, 
     # precedents[v] is the preious node of v in the best path from start to end 
-    precedent = {node: None for node in graph.nodes()}
-    visited = set()
+    precedent = [-1] * n
+    visited = bytearray(n)
+    settled = 0
     
     while heap:
         # Invariants and variants
@@ -67,10 +108,11 @@ def best_path(graph, start, end, cost_func, maximize=False):
         current_dist, u = heapq.heappop(heap)
         current_dist *= multiplier  # Convert back to actual distance
         
-        if u in visited:
+        if visited[u]:
             continue
         
-        visited.add(u)
+        visited[u] = 1
+        settled += 1
         
 
         # The intuition behind Dijkstra: imagine releasing tourists at a specific point on
@@ -79,7 +121,7 @@ def best_path(graph, start, end, cost_func, maximize=False):
         # Walked more than the shortest distance fomr the source to that node, therefore
         # the distance at that node is actually minimal. This explains why we can stop the moment
         # we pull out the destination node, at that moment we've already found the shortest path to it.
-        if u == end:
+        if u == t:
             break
         
         # Skip if we found a better path already
@@ -89,10 +131,10 @@ def best_path(graph, start, end, cost_func, maximize=False):
             continue
         
         # We take out the shortest path we have at this moment in the heap, then, we expand it 
-        for v, (tmin, tmax) in graph.neighbors(u).items():
+        for v, (tmin, tmax) in out[u].items():
             # Invariants and variants
             #   invariant()
-            cost = cost_func(u, v, tmin, tmax)
+            cost = cost_func(labels[u], labels[v], tmin, tmax) if coeffs is None else weigh(tmin, tmax)
             new_distance = distances[u] + cost
             
             if maximize:
@@ -108,17 +150,364 @@ def best_path(graph, start, end, cost_func, maximize=False):
                     precedent[v] = u
                     heapq.heappush(heap, (new_distance, v))
     
+    if stats is not None:
+        stats['settled'] = settled
+
     #path construction
     path = []
-    current = end
-    while current is not None:
-        path.insert(0, current)
+    current = t
+    while current != -1:
+        path.append(labels[current])
         current = precedent[current]
+    path.reverse()
     
-    if not path or path[0] != start:
+    if path[0] != start:
         return None, float('inf') if not maximize else float('-inf')
     
-    return path, distances[end]
+    return path, distances[t]
+
+
+def _best_path_frozen(graph, start, end, cost_func, coeffs, maximize=False, stats=None):
+    # Same search as best_path, on the CSR structure of a FrozenGraph:
+    # nodes are integer ids, distances/precedent are flat lists indexed by id
+    # and the arcs of u are the positions indptr[u]..indptr[u+1] of the graph's
+    # cached Python lists (indexing lists beats slicing NumPy arrays per node).
+    # Maximisation negates the costs so that one min-heap loop serves both: the
+    # heap then holds the same (-distance, node) pairs as best_path, distances
+    # are stored negated and restored at the end.
+    no_path = (None, float('inf') if not maximize else float('-inf'))
+    labels = graph.labels
+    indptr, indices = graph.csr_lists()
+    multiplier = -1 if maximize else 1
+    if coeffs is not None:
+        a, b = coeffs
+        weights = graph.weight_list(multiplier * a, multiplier * b)
+    else:
+        tmin_list, tmax_list = graph.weight_list(1, 0), graph.weight_list(0, 1)
+    s, t = graph.index[start], graph.index[end]
+
+    n = len(labels)
+    distances = [float('inf')] * n
+    distances[s] = 0
+    precedent = [-1] * n
+    visited = bytearray(n)
+    settled = 0
+    heap = [(0, s)]
+    push, pop = heapq.heappush, heapq.heappop
+
+    while heap:
+        d, u = pop(heap)
+        if visited[u]:
+            continue
+        visited[u] = 1
+        settled += 1
+        if u == t:
+            break
+        if coeffs is not None:
+            for pos in range(indptr[u], indptr[u + 1]):
+                v = indices[pos]
+                new_distance = d + weights[pos]
+                if new_distance < distances[v]:
+                    distances[v] = new_distance
+                    precedent[v] = u
+                    push(heap, (new_distance, v))
+        else:
+            label_u = labels[u]
+            for pos in range(indptr[u], indptr[u + 1]):
+                v = indices[pos]
+                new_distance = d + multiplier * cost_func(label_u, labels[v], tmin_list[pos], tmax_list[pos])
+                if new_distance < distances[v]:
+                    distances[v] = new_distance
+                    precedent[v] = u
+                    push(heap, (new_distance, v))
+
+    if stats is not None:
+        stats['settled'] = settled
+
+    path = []
+    current = t
+    while current != -1:
+        path.append(labels[current])
+        current = precedent[current]
+    path.reverse()
+
+    if path[0] != start:
+        return no_path
+    return path, multiplier * distances[t]
+
+
+def _dag_order(graph):
+    # Topological order of the internal ids cached by the graph, or None when
+    # the graph is undirected or has a cycle.
+    if not graph.directed:
+        return None
+    return graph.topological_ids()
+
+
+def _best_path_dag(graph, order, start, end, cost_func, coeffs, maximize=False, stats=None):
+    # Linear sweep over a topological order: when u comes up, every edge into u
+    # has already been relaxed, so distances[u] is final. No heap and no
+    # non-negativity assumption, so maximisation is exact (longest path).
+    # Only the nodes between start and end in the order can lie on a path.
+    # Costs are negated for maximisation, so the sweep always minimises.
+    no_path = (None, float('inf') if not maximize else float('-inf'))
+    multiplier = -1 if maximize else 1
+    if coeffs is not None:
+        a, b = coeffs
+        weigh = linear_cost(a, b)
+    settled = 0
+
+    if isinstance(graph, FrozenGraph):
+        labels = graph.labels
+        s, t = graph.index[start], graph.index[end]
+        first = int(np.flatnonzero(order == s)[0])
+        last = int(np.flatnonzero(order == t)[0])
+        indptr, indices = graph.csr_lists()
+        if coeffs is not None:
+            weights = graph.weight_list(multiplier * a, multiplier * b)
+        else:
+            tmin_list, tmax_list = graph.weight_list(1, 0), graph.weight_list(0, 1)
+        distances = {s: 0}
+        precedent = {s: -1}
+        for u in order[first:last].tolist():
+            d = distances.get(u)
+            if d is None:
+                continue
+            settled += 1
+            label_u = labels[u]
+            for pos in range(indptr[u], indptr[u + 1]):
+                v = indices[pos]
+                if coeffs is not None:
+                    new_distance = d + weights[pos]
+                else:
+                    new_distance = d + multiplier * cost_func(label_u, labels[v], tmin_list[pos], tmax_list[pos])
+                if new_distance < distances.get(v, float('inf')):
+                    distances[v] = new_distance
+                    precedent[v] = u
+    else:
+        labels, out = graph._labels, graph._out
+        s, t = graph.node_id(start), graph.node_id(end)
+        first, last = order.index(s), order.index(t)
+        distances = {s: 0}
+        precedent = {s: -1}
+        for u in order[first:last]:
+            d = distances.get(u)
+            if d is None:
+                continue
+            settled += 1
+            for v, (tmin, tmax) in out[u].items():
+                cost = cost_func(labels[u], labels[v], tmin, tmax) if coeffs is None else weigh(tmin, tmax)
+                new_distance = d + multiplier * cost
+                if new_distance < distances.get(v, float('inf')):
+                    distances[v] = new_distance
+                    precedent[v] = u
+
+    if t in distances:
+        settled += 1
+    if stats is not None:
+        stats['settled'] = settled
+    if t not in distances:
+        return no_path
+
+    path = []
+    current = t
+    while current != -1:
+        path.append(labels[current])
+        current = precedent[current]
+    path.reverse()
+    return path, multiplier * distances[t]
+
+
+def _expanders(graph, cost_func, coeffs):
+    # Forward and backward neighbor functions for the bidirectional search:
+    # forward(u) lists (v, cost(u->v)), backward(v) lists (u, cost(u->v)).
+    # Nodes are integer ids (CSR ids or the SimpleGraph's internal ids).
+    if isinstance(graph, FrozenGraph):
+        indptr, indices = graph.csr_lists()
+        rindptr, rsources = graph.csr_lists(reverse=True)
+        weights = _edge_weights(graph, cost_func, coeffs)
+        rweights = weights[graph.reverse_csr()[2]].tolist()
+        weights = weights.tolist()
+
+        def forward(u):
+            lo, hi = indptr[u], indptr[u + 1]
+            return zip(indices[lo:hi], weights[lo:hi])
+
+        def backward(v):
+            lo, hi = rindptr[v], rindptr[v + 1]
+            return zip(rsources[lo:hi], rweights[lo:hi])
+
+        return forward, backward
+
+    labels, out, pred = graph._labels, graph._out, graph._in
+    if coeffs is not None:
+        weigh = linear_cost(*coeffs)
+
+        def forward(u):
+            return [(v, weigh(tmin, tmax)) for v, (tmin, tmax) in out[u].items()]
+
+        def backward(v):
+            return [(u, weigh(tmin, tmax)) for u, (tmin, tmax) in pred[v].items()]
+    else:
+        def forward(u):
+            return [(v, cost_func(labels[u], labels[v], tmin, tmax)) for v, (tmin, tmax) in out[u].items()]
+
+        def backward(v):
+            return [(u, cost_func(labels[u], labels[v], tmin, tmax)) for u, (tmin, tmax) in pred[v].items()]
+
+    return forward, backward
+
+
+def _best_path_bidirectional(graph, start, end, cost_func, coeffs, stats=None):
+    # Two Dijkstra balls, one from start over the edges and one from end over
+    # the reversed edges, always expanding the side whose heap top is smaller.
+    # best is the length of the best start->end path seen so far through an
+    # edge joining the two balls. Stopping rule: once top_f + top_b >= best, any
+    # path not yet seen has length >= top_f + top_b, so best is optimal.
+    forward, backward = _expanders(graph, cost_func, coeffs)
+    if isinstance(graph, FrozenGraph):
+        s, t = graph.index[start], graph.index[end]
+        labels = graph.labels
+    else:
+        s, t = graph.node_id(start), graph.node_id(end)
+        labels = graph._labels
+
+    dist = ({s: 0}, {t: 0})
+    precedent = ({s: None}, {t: None})
+    settled = (set(), set())
+    heaps = ([(0, s)], [(0, t)])
+    expand = (forward, backward)
+    best, meet = (0, s) if s == t else (float('inf'), None)
+
+    while True:
+        # Drop stale heap tops so that top_f + top_b is as tight as possible
+        for side in (0, 1):
+            heap = heaps[side]
+            while heap and (heap[0][1] in settled[side] or heap[0][0] > dist[side][heap[0][1]]):
+                heapq.heappop(heap)
+        if not heaps[0] or not heaps[1] or heaps[0][0][0] + heaps[1][0][0] >= best:
+            break
+        side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+        d, u = heapq.heappop(heaps[side])
+        settled[side].add(u)
+        mine, other = dist[side], dist[1 - side]
+        for v, cost in expand[side](u):
+            new_distance = d + cost
+            if new_distance < mine.get(v, float('inf')):
+                mine[v] = new_distance
+                precedent[side][v] = u
+                heapq.heappush(heaps[side], (new_distance, v))
+            # v may be unreached on this side (infinite cost)
+            if v in other and v in mine and mine[v] + other[v] < best:
+                best, meet = mine[v] + other[v], v
+
+    if stats is not None:
+        stats['settled'] = len(settled[0]) + len(settled[1])
+    if meet is None:
+        return None, float('inf')
+
+    # start ... meet from the forward tree, then meet ... end from the backward tree
+    path = []
+    current = meet
+    while current is not None:
+        path.append(current)
+        current = precedent[0][current]
+    path.reverse()
+    current = precedent[1][meet]
+    while current is not None:
+        path.append(current)
+        current = precedent[1][current]
+    return [labels[v] for v in path], best
+
+def _edge_weights(graph, cost_func, coeffs):
+    # Cost of every edge of a FrozenGraph, in CSR order: the cached array for a
+    # declarative metric, one cost_func call per edge otherwise.
+    if coeffs is not None:
+        return graph.weights(*coeffs)
+    labels = graph.labels
+    sources = graph.edge_sources()
+    weights = [cost_func(labels[u], labels[v], tmin, tmax) for u, v, tmin, tmax in
+               zip(sources.tolist(), graph.indices.tolist(), graph.tmin.tolist(), graph.tmax.tolist())]
+    return np.array(weights)
+
+
+def _tree_search(graph, weights, source, reverse=False, targets=None):
+    # Full Dijkstra from the id `source` on a FrozenGraph with the given weight
+    # array (CSR order). With reverse=True it follows incoming edges, so dist[v]
+    # is then the distance from v to source. Returns (dist, precedent) arrays,
+    # dist = inf for unreachable nodes and precedent = -1 where undefined.
+    # If targets (ids) is given, the search stops once all of them are settled:
+    # only their distances are then guaranteed final.
+    n = graph.num_nodes()
+    wanted = None
+    if targets is not None:
+        wanted = bytearray(n)
+        for v in targets:
+            wanted[v] = 1
+        remaining = sum(wanted)
+    # Structure from the graph's cached lists, weights converted once per search
+    indptr, neighbors = graph.csr_lists(reverse)
+    weights = (weights[graph.reverse_csr()[2]] if reverse else np.asarray(weights)).tolist()
+    distances = [float('inf')] * n
+    precedent = [-1] * n
+    visited = bytearray(n)
+    distances[source] = 0
+    heap = [(0, source)]
+
+    while heap:
+        d, u = heapq.heappop(heap)
+        if visited[u]:
+            continue
+        visited[u] = 1
+        if wanted is not None and wanted[u]:
+            remaining -= 1
+            if remaining == 0:
+                break
+        for pos in range(indptr[u], indptr[u + 1]):
+            v = neighbors[pos]
+            new_distance = d + weights[pos]
+            if new_distance < distances[v]:
+                distances[v] = new_distance
+                precedent[v] = u
+                heapq.heappush(heap, (new_distance, v))
+
+    return np.array(distances, dtype=float), np.array(precedent, dtype=np.int64)
+
+
+def shortest_path_tree(graph, source, metric='tmin'):
+    """Arbre des plus courts chemins depuis source, en une seule recherche.
+
+    Renvoie (dist, pred), deux tableaux NumPy indexés comme graph.nodes() :
+    dist[i] est le coût du meilleur chemin source -> nodes()[i] (inf si
+    injoignable) et pred[i] l'indice du sommet précédent (-1 pour la source et
+    les sommets injoignables). metric : comme cost_func dans best_path.
+    """
+    frozen = graph if isinstance(graph, FrozenGraph) else graph.freeze()
+    if source not in frozen.index:
+        raise ValueError(f'source {source!r} is not in the graph')
+    weights = _edge_weights(frozen, metric, resolve_metric(metric))
+    return _tree_search(frozen, weights, frozen.index[source])
+
+
+def distance_matrix(graph, sources, targets=None, metric='tmin'):
+    """Matrice des coûts minimaux entre sources et targets (tous les sommets par défaut).
+
+    Une recherche par source, arrêtée dès que toutes les destinations sont
+    fixées : M[i, j] = coût de sources[i] -> targets[j], inf si injoignable.
+    """
+    frozen = graph if isinstance(graph, FrozenGraph) else graph.freeze()
+    sources = list(sources)
+    targets = frozen.labels if targets is None else list(targets)
+    for node in sources + targets:
+        if node not in frozen.index:
+            raise ValueError(f'node {node!r} is not in the graph')
+    weights = _edge_weights(frozen, metric, resolve_metric(metric))
+    target_ids = np.array([frozen.index[v] for v in targets], dtype=np.int64)
+    matrix = np.empty((len(sources), len(target_ids)))
+    for row, source in enumerate(sources):
+        dist, _ = _tree_search(frozen, weights, frozen.index[source], targets=target_ids.tolist())
+        matrix[row] = dist[target_ids]
+    return matrix
 
 #measures
 def cost_min(u, v, tmin, tmax):
@@ -131,6 +520,34 @@ def cost_marge(u, v, tmin, tmax):
     return tmax - tmin
 
 
+# Declarative metrics: cost = a*tmin + b*tmax, given by the pair (a, b).
+METRICS = {
+    'tmin': (1, 0),
+    'tmax': (0, 1),
+    'marge': (-1, 1),
+}
+_METRIC_FUNCS = {cost_min: 'tmin', cost_max: 'tmax', cost_marge: 'marge'}
+
+
+def resolve_metric(metric):
+    """Coefficients (a, b) of a declarative metric, or None for an arbitrary callable.
+
+    Accepts a metric name from METRICS, a pair (a, b), or one of cost_min /
+    cost_max / cost_marge. Any other callable is left to the per-edge fallback.
+    """
+    if isinstance(metric, str):
+        if metric not in METRICS:
+            raise ValueError(f'Unknown metric {metric!r}, expected one of {sorted(METRICS)} or a pair (a, b)')
+        return METRICS[metric]
+    if isinstance(metric, (tuple, list)) and len(metric) == 2:
+        return metric[0], metric[1]
+    if metric in _METRIC_FUNCS:
+        return METRICS[_METRIC_FUNCS[metric]]
+    if callable(metric):
+        return None
+    raise TypeError('metric must be a metric name, a pair (a, b) or a callable cost_func(u, v, tmin, tmax)')
+
+
 #=================================== tests =====================================
 def test_dense_graph():
     """Test 10: Graphe dense avec plusieurs alternatives"""
@@ -149,6 +566,87 @@ def test_dense_graph():
     path, dist = best_path(g, 'A', 'E', cost_min)
     assert path == ['A', 'B', 'C', 'D', 'E'], f"Got {path}"
     assert dist == 5, f"Expected 5 (1+2+1+1), got {dist}"
+    assert best_path(g.freeze(), 'A', 'E', cost_min) == (path, dist), "Frozen graph disagrees"
+    assert best_path(g, 'A', 'E', (1, 0)) == (path, dist), "Declarative metric disagrees"
+
+    # Le graphe ci-dessus est acyclique (balayage topologique) : un arc E -> A
+    # crée un cycle et fait passer les mêmes requêtes par les deux Dijkstra,
+    # puis chaque variante par la recherche bidirectionnelle
+    acyclic = (g, g.freeze())
+    g_cyclic = SimpleGraph(directed=True)
+    for u, v, tmin, tmax in g.edges():
+        g_cyclic.add_edge(u, v, tmin, tmax)
+    g_cyclic.add_edge('E', 'A', 1, 1)
+    assert g_cyclic.topological_ids() is None
+    for graph in acyclic + (g_cyclic, g_cyclic.freeze()):
+        assert best_path(graph, 'A', 'E', cost_min) == (path, dist), f"{type(graph).__name__} disagrees"
+        assert best_path(graph, 'A', 'E', 'tmin', bidirectional=True) == (path, dist), "Bidirectional disagrees"
+        assert best_path(graph, 'A', 'E', lambda u, v, tmin, tmax: tmin) == (path, dist), "Callable disagrees"
+        # Sommet absent : pas de chemin, quel que soit le moteur
+        for start, end in (('A', 'Z'), ('Z', 'A')):
+            assert best_path(graph, start, end, cost_min) == (None, float('inf'))
+            assert best_path(graph, start, end, cost_min, maximize=True) == (None, float('-inf'))
+            assert best_path(graph, start, end, 'tmin', bidirectional=True) == (None, float('inf'))
     print("✓ Test 10 passed: Dense graph")
 
+def test_infinite_tmax():
+    """Test 11: tmax infini (accepté par add_edge) ignoré par les métriques sur tmin"""
+    inf = float('inf')
+    for directed, cyclic in ((True, False), (True, True), (False, False)):
+        g = SimpleGraph(directed=directed)
+        g.add_edge('A', 'B', 1, inf)
+        g.add_edge('B', 'C', 2, 4)
+        g.add_edge('A', 'C', 5, 6)
+        if cyclic:
+            g.add_edge('C', 'A', 1, inf)
+        for graph in (g, g.freeze()):
+            for metric in ('tmin', cost_min, (1, 0), (2, 0)):
+                expected = 3 if metric != (2, 0) else 6
+                assert best_path(graph, 'A', 'C', metric) == (['A', 'B', 'C'], expected), \
+                    f"{type(graph).__name__} directed={directed} cyclic={cyclic} {metric}"
+                assert best_path(graph, 'A', 'C', metric, bidirectional=True) == (['A', 'B', 'C'], expected)
+            assert best_path(graph, 'A', 'C', 'tmax') == (['A', 'C'], 6)
+            if directed and not cyclic:
+                assert best_path(graph, 'A', 'C', 'tmin', maximize=True) == (['A', 'C'], 5)
+    print("✓ Test 11 passed: Infinite tmax")
+
+def test_bidirectional_random():
+    """Test 12: recherche bidirectionnelle contre best_path sur des graphes aléatoires avec cycles"""
+    import random
+    rng = random.Random(8)
+    blocked = set()
+
+    def cost_blocked(u, v, tmin, tmax):
+        # Coût infini : l'arc est interdit
+        return float('inf') if (u, v) in blocked else tmin
+
+    for trial in range(60):
+        g = SimpleGraph(directed=trial % 2 == 0)
+        n = rng.randint(2, 12)
+        for v in range(n):
+            g.add_node(v)
+        for _ in range(rng.randint(n, 4 * n)):
+            u, v = rng.randrange(n), rng.randrange(n)
+            if u != v:
+                tmin = rng.randint(1, 9)
+                g.add_edge(u, v, tmin, tmin + rng.randint(0, 5))
+        blocked.clear()
+        blocked.update((u, v) for u, v, _, _ in g.edges() if rng.random() < 0.3)
+        if not g.directed:
+            blocked.update((v, u) for u, v in list(blocked))
+        for graph in (g, g.freeze()):
+            for metric in ('tmin', 'tmax', cost_blocked):
+                s, t = rng.randrange(n), rng.randrange(n)
+                expected = best_path(graph, s, t, metric)
+                path, value = best_path(graph, s, t, metric, bidirectional=True)
+                assert value == expected[1], f"trial {trial} {metric}: {value} != {expected}"
+                if path is not None:
+                    edges = list(zip(path, path[1:]))
+                    cost = metric if callable(metric) else (cost_min if metric == 'tmin' else cost_max)
+                    assert path[0] == s and path[-1] == t
+                    assert sum(cost(u, v, *g.adj[u][v]) for u, v in edges) == value, f"trial {trial}: {path}"
+    print("✓ Test 12 passed: Bidirectional search matches best_path")
+
 test_dense_graph()
+test_infinite_tmax()
+test_bidirectional_random()
@@ -0,0 +1,56 @@
+from collections import OrderedDict
+from Abstract import best_path, resolve_metric
+
+# Cache LRU des résultats de best_path.
+# La clé contient le graphe lui-même (comparé par identité) et sa version :
+# toute modification du graphe (add_edge, remove_node, ...) change la version,
+# donc une ancienne entrée ne peut plus être retrouvée et finit évincée.
+
+
+class PathCache:
+    """
+    Cache borné (LRU) devant best_path, à activer explicitement.
+
+    cache.best_path(graph, start, end, cost_func, maximize=False) a le même
+    contrat que best_path. Compteurs : hits, misses, evictions (voir info()).
+    Les graphes des entrées en cache restent référencés jusqu'à leur éviction.
+    """
+    def __init__(self, maxsize=1024):
+        if maxsize < 1:
+            raise ValueError('maxsize must be at least 1')
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def best_path(self, graph, start, end, cost_func, maximize=False, bidirectional=False):
+        coeffs = resolve_metric(cost_func)
+        # Une métrique déclarative est identifiée par ses coefficients, un callable par lui-même
+        metric = (float(coeffs[0]), float(coeffs[1])) if coeffs is not None else cost_func
+        key = (graph, graph.version, start, end, metric, maximize, bidirectional)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+        else:
+            self.misses += 1
+            entry = best_path(graph, start, end, cost_func, maximize=maximize, bidirectional=bidirectional)
+            self._entries[key] = entry
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        path, value = entry
+        # Copie du chemin : l'appelant peut le modifier sans toucher au cache
+        return (list(path) if path is not None else None), value
+
+    def info(self):
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                'size': len(self._entries), 'maxsize': self.maxsize}
+
+    def clear(self):
+        """Vide le cache (les compteurs sont conservés)."""
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
@@ -2,6 +2,7 @@ import dash
 from dash import html, dcc, Input, Output, State
 import dash_cytoscape as cyto
 from Abstract import best_path, cost_min, cost_max, cost_marge
+from Pareto import pareto_paths
 
 def show_colorful(g):
     """Affichage coloré et lisible dans la console."""
@@ -16,7 +17,8 @@ def show_colorful(g):
     print(f"│ {title:<57} │")
     print("├" + "─" * 60 + "┤")
 
-    for u, nbrs in g.adj.items():
+    for u in g.nodes():
+        nbrs = g.neighbors(u)
         if not nbrs:
             print(f"│ {YELLOW}{u:<15}{RESET} │ (aucun voisin)")
             continue
@@ -29,14 +31,17 @@ def show_colorful(g):
         print(", ".join(rels))
     print("╰" + "─" * 60 + "╯")
 
-    print(f"{GREEN}Sommets:{RESET} {len(g.nodes())} | {GREEN}Arêtes:{RESET} {len(g.edges())}\n")
+    print(f"{GREEN}Sommets:{RESET} {g.num_nodes()} | {GREEN}Arêtes:{RESET} {g.num_edges()}\n")
 
 
-def create_interactive_dashboard(graph, start, end, port=8050):
+def create_interactive_dashboard(graph, start, end, port=8050, cache=None, pareto=True):
     """
     Dashboard interactif avec boutons pour toutes les heuristiques.
     Plus besoin de Ctrl+C et relancer !
+    cache : PathCache optionnel, partagé entre dashboards sur le même graphe.
+    pareto : ajoute un bouton par route du front (tmin, tmax), entre optimiste et prudent.
     """
+    search = cache.best_path if cache is not None else best_path
     
     app = dash.Dash(__name__)
     
@@ -44,7 +49,7 @@ def create_interactive_dashboard(graph, start, end, port=8050):
     heuristics = {}
     
     try:
-        path, val = best_path(graph, start, end, cost_min, maximize=False)
+        path, val = search(graph, start, end, cost_min, maximize=False)
         heuristics['Optimistic'] = {
             'name': '🌟 Optimiste (temps min)',
             'path': path,
@@ -55,7 +60,7 @@ def create_interactive_dashboard(graph, start, end, port=8050):
         heuristics['optimistic'] = None
     
     try:
-        path, val = best_path(graph, start, end, cost_max, maximize=False)
+        path, val = search(graph, start, end, cost_max, maximize=False)
         heuristics['prudent'] = {
             'name': '🛡️ Prudent (temps max)',
             'path': path,
@@ -66,7 +71,7 @@ def create_interactive_dashboard(graph, start, end, port=8050):
         heuristics['prudent'] = None
     
     try:
-        path, val = best_path(graph, start, end, cost_marge, maximize=False)
+        path, val = search(graph, start, end, cost_marge, maximize=False)
         heuristics['stable'] = {
             'name': '⚖️ Stable (marge min)',
             'path': path,
@@ -77,7 +82,7 @@ def create_interactive_dashboard(graph, start, end, port=8050):
         heuristics['stable'] = None
     
     try:
-        path, val = best_path(graph, start, end, cost_marge, maximize=True)
+        path, val = search(graph, start, end, cost_marge, maximize=True)
         heuristics['Least stable'] = {
             'name': '⚖️ Least Stable (marge max)',
             'path': path,
@@ -88,7 +93,7 @@ def create_interactive_dashboard(graph, start, end, port=8050):
         heuristics['Least stable'] = None
     
     try:
-        path, val = best_path(graph, start, end, cost_max, maximize=True)
+        path, val = search(graph, start, end, cost_max, maximize=True)
         heuristics['worst'] = {
             'name': '💀 Pire cas (max-max)',
             'path': path,
@@ -98,11 +103,25 @@ def create_interactive_dashboard(graph, start, end, port=8050):
     except:
         heuristics['worst'] = None
     
+    # Front de Pareto : compromis entre la route optimiste et la route prudente
+    if pareto:
+        try:
+            for i, (path, total_min, total_max) in enumerate(pareto_paths(graph, start, end)):
+                heuristics[f'pareto-{i}'] = {
+                    'name': f'🔀 Pareto {i + 1} ({total_min:g} / {total_max:g})',
+                    'path': path,
+                    'value': (total_min, total_max),
+                    'description': f'Temps min total: {total_min:.2f} min, temps max total: {total_max:.2f} min'
+                }
+        except (TypeError, ValueError):
+            # Intervalles invalides (non numériques) : pas de boutons Pareto
+            heuristics['pareto'] = None
+    
     # Graphe moyen si disponible
     g_mean = None
     try:
         g_mean = graph.make_converge(n_samples=1000)
-        path, val = best_path(g_mean, start, end, cost_min, maximize=False)
+        path, val = search(g_mean, start, end, cost_min, maximize=False)
         heuristics['gaussian'] = {
             'name': '📊 Gaussian Distribution',
             'path': path,
@@ -115,7 +134,7 @@ def create_interactive_dashboard(graph, start, end, port=8050):
         
     try:
         g_mean = graph.make_converge(beta = True, n_samples=1000)
-        path, val = best_path(g_mean, start, end, cost_min, maximize=False)
+        path, val = search(g_mean, start, end, cost_min, maximize=False)
         heuristics['beta'] = {
             'name': '📊 Beta Distribution',
             'path': path,
@@ -138,7 +157,7 @@ def create_interactive_dashboard(graph, start, end, port=8050):
         if selected_heuristic == 'beta' and heuristics.get('beta'):
             current_graph = heuristics['beta'].get('graph', graph)
         # Nodes
-        for node in current_graph.adj:
+        for node in current_graph.nodes():
             elements.append({"data": {"id": str(node), "label": str(node)}})
         
         # Path info
@@ -156,30 +175,25 @@ def create_interactive_dashboard(graph, start, end, port=8050):
                     path_edges.add((str(path[i+1]), str(path[i])))
         
         # Edges (utiliser current_graph pour les labels)
-        for u, nbrs in current_graph.adj.items():
-            for v, (tmin, tmax) in nbrs.items():
-                if not current_graph.directed and any(e for e in elements if 
-                    e.get("data", {}).get("source") == str(v) and 
-                    e.get("data", {}).get("target") == str(u)):
-                    continue
-                
-                # Pour Gaussian, afficher la moyenne estimée
-                # Graphes convergés ont tmin ≈ tmax
-                is_converged = selected_heuristic in ['gaussian', 'beta']
+        # edges() ne renvoie qu'une fois chaque arête d'un graphe non orienté
+        for u, v, tmin, tmax in current_graph.edges():
+            # Pour Gaussian, afficher la moyenne estimée
+            # Graphes convergés ont tmin ≈ tmax
+            is_converged = selected_heuristic in ['gaussian', 'beta']
 
-                if is_converged and abs(tmin - tmax) < 0.01:
-                    label = f"{tmin:.2f}"
-                else:
-                    label = f"{tmin}-{tmax}"
-                
-                edge_data = {
-                    "data": {
-                        "source": str(u), 
-                        "target": str(v), 
-                        "label": label
-                    }
+            if is_converged and abs(tmin - tmax) < 0.01:
+                label = f"{tmin:.2f}"
+            else:
+                label = f"{tmin}-{tmax}"
+            
+            edge_data = {
+                "data": {
+                    "source": str(u), 
+                    "target": str(v), 
+                    "label": label
                 }
-                elements.append(edge_data)
+            }
+            elements.append(edge_data)
         # Stylesheet
         stylesheet = [
             {'selector': 'node',
@@ -357,9 +371,9 @@ def create_interactive_dashboard(graph, start, end, port=8050):
 
 
 # Fonction simplifiée pour le main.py
-def show_all_heuristics(graph, start, end, port=8050):
+def show_all_heuristics(graph, start, end, port=8050, cache=None, pareto=True):
     """
     Fonction ultra-simple à appeler depuis main.py
     Usage: show_all_heuristics(g, 1, 11)
     """
-    create_interactive_dashboard(graph, start, end, port)
+    create_interactive_dashboard(graph, start, end, port, cache, pareto)
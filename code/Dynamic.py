@@ -0,0 +1,258 @@
+import heapq
+from GraphStruct import linear_cost
+from Abstract import resolve_metric
+
+# Plus courts chemins dynamiques (à la Ramalingam-Reps).
+# Pour chaque source suivie on garde l'arbre des plus courts chemins (dist,
+# parent, enfants). Quand quelques arcs changent :
+#   1. les sous-arbres pendus sous un arc d'arbre modifié ou supprimé sont
+#      invalidés (ensemble A) ;
+#   2. chaque sommet de A repart de son meilleur prédécesseur hors de A, et la
+#      cible d'un arc non-arbre devenu plus court repart de cet arc ;
+#   3. un Dijkstra depuis ces seuls sommets répare l'arbre.
+# Le travail est proportionnel à la zone touchée, pas à la taille du graphe.
+
+
+class DynamicRoutes:
+    """
+    Routes suivies sur un SimpleGraph qui évolue (trafic en direct).
+
+    track(start, end) enregistre une route ; update(...), add_edge(...) et
+    remove_edge(...) modifient le graphe, réparent les arbres des sources
+    suivies et renvoient {(start, end): (chemin, valeur)} pour les routes qui
+    ont changé. Minimisation, coûts positifs, comme best_path.
+    Si le graphe est modifié sans passer par cet objet, tout est recalculé.
+    """
+    def __init__(self, graph, cost_func='tmin'):
+        self.graph = graph
+        self.cost_func = cost_func
+        self.coeffs = resolve_metric(cost_func)
+        self._weigh = None if self.coeffs is None else linear_cost(*self.coeffs)
+        self._trees = {}    # source -> (dist, parent, children)
+        self.routes = {}    # (start, end) -> (chemin, valeur)
+        self.version = graph.version
+        self.last_touched = 0
+
+    def _cost(self, u, v):
+        tmin, tmax = self.graph.adj[u][v]
+        if self.coeffs is None:
+            return self.cost_func(u, v, tmin, tmax)
+        return self._weigh(tmin, tmax)
+
+    def _build(self, source):
+        dist, parent, children = {source: 0}, {source: None}, {source: set()}
+        self._trees[source] = (dist, parent, children)
+        self._propagate(source, [(0, source)], set())
+
+    def _propagate(self, source, heap, touched):
+        # Dijkstra à partir des sommets déjà dans le tas (étiquettes provisoires)
+        dist, parent, children = self._trees[source]
+        heapq.heapify(heap)
+        while heap:
+            d, u = heapq.heappop(heap)
+            if d > dist.get(u, float('inf')):
+                continue
+            for v in self.graph.adj[u]:
+                new_distance = d + self._cost(u, v)
+                if new_distance < dist.get(v, float('inf')):
+                    self._set_parent(parent, children, v, u)
+                    dist[v] = new_distance
+                    touched.add(v)
+                    heapq.heappush(heap, (new_distance, v))
+
+    @staticmethod
+    def _set_parent(parent, children, v, u):
+        old = parent.get(v)
+        if old is not None and old in children:
+            children[old].discard(v)
+        parent[v] = u
+        children.setdefault(u, set()).add(v)
+        children.setdefault(v, set())
+
+    def _path(self, source, end):
+        dist, parent, _ = self._trees[source]
+        if end not in dist:
+            return None, float('inf')
+        path = [end]
+        while parent[path[-1]] is not None:
+            path.append(parent[path[-1]])
+        path.reverse()
+        return path, dist[end]
+
+    def track(self, start, end):
+        """Suit la route start -> end et renvoie son (chemin, valeur) actuel."""
+        if not self.graph.has_node(start):
+            raise ValueError(f'source {start!r} is not in the graph')
+        self._check_version()
+        if start not in self._trees:
+            self._build(start)
+        self.routes[(start, end)] = self._path(start, end)
+        return self.routes[(start, end)]
+
+    def untrack(self, start, end):
+        self.routes.pop((start, end), None)
+        if not any(s == start for s, _ in self.routes):
+            self._trees.pop(start, None)
+
+    def _check_version(self):
+        # Modification extérieure : on ne sait pas quels arcs ont changé
+        if self.graph.version != self.version:
+            for source in list(self._trees):
+                if self.graph.has_node(source):
+                    self._build(source)
+                else:
+                    del self._trees[source]
+            self.version = self.graph.version
+            return True
+        return False
+
+    def add_edge(self, u, v, tmin, tmax):
+        """Ajoute ou met à jour l'arc u -> v ; renvoie les routes modifiées."""
+        return self.update([(u, v, tmin, tmax)])
+
+    def remove_edge(self, u, v):
+        """Supprime l'arc u -> v ; renvoie les routes modifiées."""
+        return self.update([(u, v)])
+
+    def update(self, changes):
+        """
+        Applique un lot de modifications puis répare une seule fois.
+
+        changes : (u, v, tmin, tmax) pour ajouter ou modifier un arc, (u, v) pour
+        le supprimer. Renvoie {(start, end): (chemin, valeur)} des routes changées.
+        """
+        rebuilt = self._check_version()
+        arcs = []
+        for change in changes:
+            u, v = change[0], change[1]
+            if len(change) == 2:
+                self.graph.remove_edge(u, v)
+            else:
+                self.graph.add_edge(u, v, change[2], change[3])
+            arcs.append((u, v))
+            if not self.graph.directed:
+                arcs.append((v, u))
+        self.version = self.graph.version
+
+        touched_by_source = {}
+        for source in self._trees:
+            touched_by_source[source] = self._repair(source, arcs)
+        self.last_touched = sum(len(t) for t in touched_by_source.values())
+
+        changed = {}
+        for (start, end), old in self.routes.items():
+            touched = touched_by_source.get(start, ())
+            old_path = old[0] or ()
+            if rebuilt or end in touched or any(x in touched for x in old_path):
+                new = self._path(start, end)
+                if new != old:
+                    changed[(start, end)] = new
+        self.routes.update(changed)
+        return changed
+
+    def _repair(self, source, arcs):
+        dist, parent, children = self._trees[source]
+        graph = self.graph
+
+        # 1. Sous-arbres sous un arc d'arbre modifié ou supprimé
+        affected = set()
+        stack = [v for u, v in arcs if parent.get(v) == u and v != source]
+        while stack:
+            x = stack.pop()
+            if x in affected:
+                continue
+            affected.add(x)
+            stack.extend(children.get(x, ()))
+        for x in affected:
+            del dist[x]
+            old = parent.pop(x)
+            if old in children:
+                children[old].discard(x)
+        # Les sous-arbres invalidés n'ont plus d'enfants
+        for x in affected:
+            children[x] = set()
+
+        # 2. Étiquettes de départ
+        heap = []
+        for x in affected:
+            if not graph.has_node(x):
+                continue
+            best, via = float('inf'), None
+            for p in graph.predecessors(x):
+                if p in dist:
+                    candidate = dist[p] + self._cost(p, x)
+                    if candidate < best:
+                        best, via = candidate, p
+            if via is not None:
+                self._set_parent(parent, children, x, via)
+                dist[x] = best
+                heap.append((best, x))
+        for u, v in arcs:
+            if u in dist and graph.has_edge(u, v):
+                candidate = dist[u] + self._cost(u, v)
+                if candidate < dist.get(v, float('inf')):
+                    self._set_parent(parent, children, v, u)
+                    dist[v] = candidate
+                    affected.add(v)
+                    heap.append((candidate, v))
+
+        # 3. Dijkstra limité à la zone touchée
+        self._propagate(source, heap, affected)
+        # Sommets restés injoignables : on oublie leurs listes d'enfants
+        for x in [x for x in affected if x not in dist]:
+            children.pop(x, None)
+        return affected
+
+
+def test_random_updates():
+    """Lots de modifications aléatoires : arbres réparés contre un recalcul complet"""
+    import random
+    from GraphStruct import SimpleGraph
+    from Abstract import shortest_path_tree, METRICS
+    rng = random.Random(5)
+    for trial in range(4):
+        g = SimpleGraph(directed=trial % 2 == 0)
+        n = 25
+        for v in range(n):
+            g.add_node(v)
+        for _ in range(3 * n):
+            u, v = rng.randrange(n), rng.randrange(n)
+            if u != v:
+                tmin = rng.randint(1, 5)
+                g.add_edge(u, v, tmin, tmin + rng.randint(0, 4))
+        metric = list(METRICS)[trial % len(METRICS)]
+        a, b = METRICS[metric]
+        routes = DynamicRoutes(g, metric)
+        pairs = [(rng.randrange(n), rng.randrange(n)) for _ in range(8)]
+        for s, t in pairs:
+            routes.track(s, t)
+        for _ in range(30):
+            # Hausses, baisses, nouveaux arcs et suppressions dans le même lot
+            changes, removed = [], set()
+            edges = g.edges()
+            for _ in range(rng.randint(1, 5)):
+                if edges and rng.random() < 0.3:
+                    u, v, _, _ = edges.pop(rng.randrange(len(edges)))
+                    changes.append((u, v))
+                    removed.update([(u, v), (v, u)])
+                else:
+                    u, v = rng.randrange(n), rng.randrange(n)
+                    if u != v and (u, v) not in removed:
+                        tmin = rng.randint(1, 5)
+                        changes.append((u, v, tmin, tmin + rng.randint(0, 4)))
+            before = dict(routes.routes)
+            changed = routes.update(changes)
+            nodes = g.nodes()
+            for s in {s for s, _ in pairs}:
+                dist, _ = shortest_path_tree(g, s, metric)
+                tree = routes._trees[s][0]
+                for i, v in enumerate(nodes):
+                    assert tree.get(v, float('inf')) == dist[i], f"{s}->{v}: got {tree.get(v)}, expected {dist[i]}"
+            for (s, t), (path, value) in routes.routes.items():
+                if path is not None:
+                    cost = sum(a * g.adj[u][v][0] + b * g.adj[u][v][1] for u, v in zip(path, path[1:]))
+                    assert cost == value, f"{s}->{t}: path {path} costs {cost}, not {value}"
+                assert ((s, t) in changed) == (before[(s, t)] != (path, value)), f"{s}->{t}: change not reported"
+    print("✓ Test passed: dynamic repairs match recomputation")
+
+test_random_updates()
@@ -0,0 +1,249 @@
+import numpy as np
+from GraphStruct import SimpleGraph, FrozenGraph
+
+# Générateurs de réseaux synthétiques pour tester les algorithmes à grande échelle.
+# Chaque générateur tire toutes les arêtes d'un coup en colonnes NumPy (u, v,
+# tmin, tmax), sans boucle Python par arête, puis construit le graphe en une
+# passe : FrozenGraph.from_arrays par défaut, SimpleGraph.add_edges_from_arrays
+# avec frozen=False. Les sommets sont les entiers 0..n-1.
+# Les intervalles [tmin, tmax] partent d'un temps de base (longueur de la rue,
+# vitesse) : tmax = tmin * (1 + r) avec r la largeur relative, tirée selon
+# `width` (voir interval_weights). rng : graine ou numpy.random.Generator, le
+# même rng donne toujours le même graphe.
+
+# Nombre de sommets traités ensemble par random_geometric (mémoire bornée)
+BLOCK_POINTS = 1 << 18
+
+
+def interval_weights(base, width='uniform', spread=0.5, rng=None, decimals=2):
+    """
+    Intervalles [tmin, tmax] autour des temps de base `base` (tableau de E valeurs > 0).
+
+    La largeur relative r = (tmax - tmin) / tmin suit la loi `width`, de moyenne spread :
+      'constant'    : r = spread partout
+      'uniform'     : r ~ U(0, 2 * spread)
+      'exponential' : r ~ Exp(spread), beaucoup d'intervalles étroits et quelques très larges
+      'lognormal'   : r log-normale (sigma = 1), queue plus lourde encore
+    ou une fonction width(rng, size) qui renvoie les largeurs relatives.
+    Les temps sont arrondis à `decimals` décimales (None : pas d'arrondi), tmin > 0.
+    """
+    rng = np.random.default_rng(rng)
+    base = np.asarray(base, dtype=float)
+    size = len(base)
+    if callable(width):
+        r = np.asarray(width(rng, size), dtype=float)
+    elif width == 'constant':
+        r = np.full(size, float(spread))
+    elif width == 'uniform':
+        r = rng.uniform(0, 2 * spread, size)
+    elif width == 'exponential':
+        r = rng.exponential(spread, size) if spread > 0 else np.zeros(size)
+    elif width == 'lognormal':
+        r = rng.lognormal(np.log(spread) - 0.5, 1.0, size) if spread > 0 else np.zeros(size)
+    else:
+        raise ValueError(f"unknown width distribution {width!r} (expected 'constant', 'uniform', "
+                         f"'exponential', 'lognormal' or a function)")
+    if np.any(r < 0):
+        raise ValueError('relative widths must be non-negative')
+    tmin = base
+    tmax = base * (1 + r)
+    if decimals is not None:
+        # Pas de temps nul après arrondi, et l'arrondi garde tmin <= tmax
+        tmin = np.maximum(np.round(tmin, decimals), 10.0 ** -decimals)
+        tmax = np.maximum(np.round(tmax, decimals), tmin)
+    return tmin, tmax
+
+
+def _build(n, u, v, base, directed, width, spread, rng, frozen):
+    # Graphe sur les sommets 0..n-1 (isolés compris) à partir des colonnes d'arêtes
+    tmin, tmax = interval_weights(base, width, spread, rng)
+    if frozen:
+        return FrozenGraph.from_arrays(u, v, tmin, tmax, labels=np.arange(n), directed=directed)
+    g = SimpleGraph(directed=directed)
+    for x in range(n):
+        g.add_node(x)
+    g.add_edges_from_arrays(u, v, tmin, tmax)
+    return g
+
+
+def grid_city(rows, cols, directed=False, arterial_every=8, arterial_speedup=2.0, removal=0.0,
+              one_way=0.0, width='uniform', spread=0.5, rng=None, frozen=True):
+    """
+    Ville en damier de rows x cols carrefours : le sommet r * cols + c est relié à ses
+    voisins de droite et du bas, environ 2 * rows * cols rues.
+
+    Temps de base d'une rue : longueur de bloc tirée dans [0.8, 1.2], divisée par
+    arterial_speedup sur les grands axes (une ligne et une colonne sur arterial_every).
+    removal : proportion de rues supprimées au hasard (travaux, impasses).
+    Orienté : chaque rue donne deux arcs aux intervalles indépendants, sauf une
+    proportion one_way de sens uniques (sens tiré au hasard).
+    """
+    rng = np.random.default_rng(rng)
+    ids = np.arange(rows * cols, dtype=np.int64).reshape(rows, cols)
+    # Rues horizontales puis verticales ; axe = indice de la ligne ou de la colonne de la rue
+    u = np.concatenate([ids[:, :-1].reshape(-1), ids[:-1, :].reshape(-1)])
+    v = np.concatenate([ids[:, 1:].reshape(-1), ids[1:, :].reshape(-1)])
+    axis = np.concatenate([np.repeat(np.arange(rows), max(cols - 1, 0)),
+                           np.tile(np.arange(cols), max(rows - 1, 0))])
+    length = rng.uniform(0.8, 1.2, len(u))
+    arterial = axis % arterial_every == 0 if arterial_every else np.zeros(len(u), dtype=bool)
+    base = np.where(arterial, length / arterial_speedup, length)
+    if removal > 0:
+        keep = rng.random(len(u)) >= removal
+        u, v, base = u[keep], v[keep], base[keep]
+    if directed:
+        # Rues à double sens : les deux arcs ; sens unique : un seul, dans un sens tiré au hasard
+        single = rng.random(len(u)) < one_way
+        flip = single & (rng.random(len(u)) < 0.5)
+        u, v = np.where(flip, v, u), np.where(flip, u, v)
+        both = ~single
+        u, v = np.concatenate([u, v[both]]), np.concatenate([v, u[both]])
+        base = np.concatenate([base, base[both]])
+    return _build(rows * cols, u, v, base, directed, width, spread, rng, frozen)
+
+
+def random_geometric(n, degree=6.0, directed=False, detour=0.3, width='uniform', spread=0.5,
+                     rng=None, frozen=True):
+    """
+    Réseau routier géométrique aléatoire : n carrefours uniformes dans un carré de côté
+    sqrt(n) (un carrefour par unité de surface), reliés quand leur distance est au plus
+    le rayon qui donne `degree` voisins en moyenne, soit environ n * degree / 2 routes.
+
+    Temps de base : distance euclidienne multipliée par un facteur de détour tiré dans
+    [1, 1 + detour] (les routes ne sont pas droites). Les paires proches sont trouvées
+    par une grille de cases de la taille du rayon, en O(n * degree).
+    Orienté : chaque route donne deux arcs aux intervalles indépendants.
+    """
+    rng = np.random.default_rng(rng)
+    side = np.sqrt(n)
+    points = rng.uniform(0, side, (n, 2))
+    radius = np.sqrt(degree / np.pi)
+    k = max(1, int(side // radius))
+    cell = side / k
+    cx, cy = np.minimum((points / cell).astype(np.int64), k - 1).T
+    # Sommets numérotés case par case : des numéros proches sont des carrefours proches,
+    # ce qui rend les accès mémoire locaux ici et dans les parcours du graphe obtenu
+    order = np.argsort(cx * k + cy, kind='stable')
+    points, cx, cy = points[order], cx[order], cy[order]
+    counts = np.bincount(cx * k + cy, minlength=k * k)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+
+    sources, targets = [], []
+    # Case du sommet et la moitié des cases voisines : chaque paire est vue une fois
+    for dx, dy in ((0, 0), (1, -1), (1, 0), (1, 1), (0, 1)):
+        for lo in range(0, n, BLOCK_POINTS):
+            p = np.arange(lo, min(n, lo + BLOCK_POINTS))
+            nx, ny = cx[p] + dx, cy[p] + dy
+            inside = (nx < k) & (ny >= 0) & (ny < k)
+            p, c = p[inside], nx[inside] * k + ny[inside]
+            size = counts[c]
+            u = np.repeat(p, size)
+            w = np.arange(len(u)) + np.repeat(starts[c] - (np.cumsum(size) - size), size)
+            close = np.sum((points[u] - points[w]) ** 2, axis=1) <= radius ** 2
+            if dx == dy == 0:
+                close &= w > u
+            sources.append(u[close])
+            targets.append(w[close])
+    u, v = np.concatenate(sources), np.concatenate(targets)
+    base = np.sqrt(np.sum((points[u] - points[v]) ** 2, axis=1)) * rng.uniform(1, 1 + detour, len(u))
+    if directed:
+        u, v, base = np.concatenate([u, v]), np.concatenate([v, u]), np.concatenate([base, base])
+    return _build(n, u, v, base, directed, width, spread, rng, frozen)
+
+
+def layered_dag(layers, width_per_layer, degree=3, window=None, width='uniform', spread=0.5,
+                rng=None, frozen=True):
+    """
+    Graphe orienté acyclique en couches : layers couches de width_per_layer sommets
+    (le sommet i de la couche l est l * width_per_layer + i). Chaque sommet a `degree`
+    arcs vers la couche suivante, vers des positions à au plus `window` de la sienne
+    (None : n'importe où dans la couche). Les tirages en double sont fusionnés.
+
+    Temps de base log-normaux autour de 1. C'est la forme des réseaux orientés dans
+    le temps (étapes successives) : best_path y prend le balayage topologique.
+    """
+    rng = np.random.default_rng(rng)
+    n = layers * width_per_layer
+    u = np.repeat(np.arange(max(0, n - width_per_layer), dtype=np.int64), degree)
+    position = u % width_per_layer
+    if window is None:
+        target = rng.integers(0, width_per_layer, len(u))
+    else:
+        target = np.clip(position + rng.integers(-window, window + 1, len(u)), 0, width_per_layer - 1)
+    v = u - position + width_per_layer + target
+    base = rng.lognormal(0.0, 0.3, len(u))
+    return _build(n, u, v, base, True, width, spread, rng, frozen)
+
+
+def scale_free(n, degree=4.0, exponent=2.5, directed=False, width='uniform', spread=0.5,
+               rng=None, frozen=True):
+    """
+    Graphe sans échelle (modèle de Chung-Lu) : le sommet i a un degré attendu
+    proportionnel à (i + 1) ** (-1 / (exponent - 1)), soit une loi de puissance
+    d'exposant `exponent` (> 2), de moyenne `degree`. Les deux extrémités de chaque
+    arête sont tirées selon ces poids, ce qui vectorise tout le tirage ; les poids sont
+    plafonnés à la coupure naturelle sqrt(somme des poids). Boucles supprimées,
+    doublons fusionnés : le nombre d'arêtes est un peu inférieur à n * degree / 2
+    (n * degree arcs si orienté). Les numéros des sommets sont mélangés.
+    Les sommets les plus connectés ont de l'ordre de sqrt(n * degree) voisins.
+    """
+    if exponent <= 2:
+        raise ValueError('exponent must be > 2')
+    rng = np.random.default_rng(rng)
+    weights = (np.arange(n) + 1.0) ** (-1 / (exponent - 1))
+    weights *= degree * n / weights.sum()
+    weights = np.minimum(weights, np.sqrt(weights.sum()))
+    m = int(round(n * degree if directed else n * degree / 2))
+    # 2m extrémités tirées selon les poids : le nombre de tirages de chaque sommet
+    # (multinomiale) puis un ordre aléatoire, même loi que 2m tirages indépendants
+    counts = rng.multinomial(2 * m, weights / weights.sum())
+    ends = rng.permutation(np.repeat(np.arange(n), counts))
+    ends = rng.permutation(n)[ends]
+    u, v = ends[0::2], ends[1::2]
+    keep = u != v
+    u, v = u[keep], v[keep]
+    base = rng.lognormal(0.0, 0.3, len(u))
+    return _build(n, u, v, base, directed, width, spread, rng, frozen)
+
+
+def test_generators():
+    """Graine fixe, nombre d'arêtes annoncé, tmin <= tmax et frozen=False identique à frozen=True"""
+    cases = [
+        (grid_city, (12, 15), {}, 12 * 14 + 15 * 11),
+        (grid_city, (12, 15), {'directed': True, 'one_way': 0.3, 'removal': 0.1}, None),
+        (random_geometric, (3000,), {'degree': 6.0}, 3000 * 6.0 / 2),
+        (random_geometric, (3000,), {'degree': 4.0, 'directed': True, 'width': 'lognormal'}, 3000 * 4.0),
+        (layered_dag, (20, 50), {'degree': 3, 'window': 5}, 19 * 50 * 3),
+        (layered_dag, (20, 50), {'width': 'exponential'}, 19 * 50 * 3),
+        (scale_free, (3000,), {'degree': 4.0}, 3000 * 4.0 / 2),
+        (scale_free, (3000,), {'degree': 4.0, 'directed': True, 'width': 'constant'}, 3000 * 4.0),
+    ]
+    for generate, args, options, expected in cases:
+        name = f"{generate.__name__}{args} {options}"
+        g = generate(*args, rng=7, **options)
+        again = generate(*args, rng=np.random.default_rng(7), **options)
+        for key in ('indptr', 'indices', 'tmin', 'tmax', 'labels'):
+            assert np.array_equal(getattr(g, key), getattr(again, key)), f"{name}: {key} differs with the same rng"
+        assert (g.tmin > 0).all() and (g.tmin <= g.tmax).all(), name
+        m = g.num_edges()
+        if generate is grid_city and not options:
+            assert m == expected, f"{name}: {m} edges, expected {expected}"
+        elif generate is grid_city:
+            # Rues supprimées (10 %) puis une sur trois en sens unique
+            streets = 12 * 14 + 15 * 11
+            assert 0.8 * 1.7 * streets <= m <= 2 * streets, f"{name}: {m} arcs"
+        elif generate is random_geometric:
+            # Effets de bord : un peu moins de voisins près des côtés du carré
+            assert 0.85 * expected <= m <= 1.05 * expected, f"{name}: {m} edges, expected about {expected}"
+        else:
+            # Tirages en double fusionnés (et boucles retirées pour scale_free)
+            assert 0.75 * expected <= m <= expected, f"{name}: {m} edges, expected a bit less than {expected}"
+        if generate is layered_dag:
+            assert g.topological_ids() is not None, f"{name}: not acyclic"
+        simple = generate(*args, rng=7, frozen=False, **options)
+        assert isinstance(simple, SimpleGraph) and simple.nodes() == list(g.labels), name
+        assert simple.num_edges() == m and set(simple.edges()) == set(g.thaw().edges()), \
+            f"{name}: frozen=False differs from frozen=True"
+    print("✓ Test passed: generators are reproducible and match their documented sizes")
+
+test_generators()
@@ -1,17 +1,58 @@
+import json
+from itertools import islice
 import numpy as np
+from collections.abc import ItemsView, Mapping
+from types import MappingProxyType
+from Sampling import converge_edge_means, converge_edge_stats
+from Loaders import CHUNK_ROWS, LabelTable, column_array, csv_chunks, edgelist_chunks, interleave, json_chunks
 
 class SimpleGraph:
     """
     Graphe orienté ou non, avec arêtes contenant deux poids : temps_min et temps_max.
     Représentation : adj[u][v] = (temps_min, temps_max)
+
+    En interne, chaque étiquette reçoit un identifiant entier dense (dans l'ordre
+    d'ajout des sommets) et les arcs sont rangés par identifiants : _out[i] = {j: poids}.
+    adj et predecessors() en sont des vues en lecture seule, par étiquettes ; les
+    algorithmes (best_path, ...) travaillent directement sur les identifiants.
     """
     def __init__(self, directed=False):
         self.directed = directed
-        self.adj = {}
+        # Table étiquette <-> identifiant. Un identifiant libéré par remove_node
+        # reste un trou (_HOLE) jusqu'au prochain tassement (_compact) : les
+        # identifiants suivent toujours l'ordre d'ajout des sommets.
+        self._ids = {}
+        self._labels = []
+        self._holes = 0
+        # Arcs sortants _out[i] = {j: (temps_min, temps_max)} et index inverse
+        # _in[j] = {i: (temps_min, temps_max)}. Pour un graphe non orienté, _in est _out.
+        self._out = []
+        self._in = [] if directed else self._out
+        self._n_edges = 0
+        # Compteur de modifications, pour invalider les précalculs (ALT, ...)
+        self._version = 0
+        # (version, ordre topologique en identifiants ou None si le graphe a un cycle)
+        self._topo = None
+
+    @property
+    def adj(self):
+        """Vue en lecture seule {u: {v: (temps_min, temps_max)}}, par étiquettes."""
+        return _LabelView(self)
+
+    def _intern(self, v):
+        """Identifiant de v, ajouté au graphe s'il n'y est pas."""
+        i = self._ids.get(v)
+        if i is None:
+            i = self._ids[v] = len(self._labels)
+            self._labels.append(v)
+            self._out.append({})
+            if self.directed:
+                self._in.append({})
+            self._version += 1
+        return i
 
     def add_node(self, v):
-        if v not in self.adj:
-            self.adj[v] = {}
+        self._intern(v)
 
     def add_edge(self, u, v, temps_min, temps_max):
         """Ajoute une arête u->v avec deux poids (temps_min, temps_max)."""
@@ -28,49 +69,205 @@ class SimpleGraph:
         except TypeError:
             raise TypeError('temps_min and temps_max must be comparable numeric values')
 
-        self.add_node(u)
-        self.add_node(v)
-        self.adj[u][v] = (temps_min, temps_max)
+        self._insert_edge(u, v, temps_min, temps_max)
+
+    def _insert_edge(self, u, v, temps_min, temps_max):
+        """Insertion sans validation (poids déjà ordonnés), maintient l'index inverse et le compteur."""
+        i = self._intern(u)
+        j = self._intern(v)
+        out = self._out[i]
+        if j not in out:
+            self._n_edges += 1
+        out[j] = self._in[j][i] = (temps_min, temps_max)
+        self._version += 1
+
+    def add_edges_from_arrays(self, u, v, tmin, tmax):
+        """
+        Ajoute les arêtes u[i] -> v[i] de poids (tmin[i], tmax[i]) en une fois.
+
+        Même résultat que add_edge ligne par ligne (ordre des sommets et des
+        voisins, dernière valeur gardée pour une arête répétée), mais la
+        validation est vectorisée : un seul avertissement pour toutes les lignes
+        où temps_min > temps_max, et les dictionnaires sont remplis par blocs.
+        Les colonnes peuvent être des listes ou des tableaux NumPy.
+        """
+        labels = interleave(u, v)
+        if not len(labels):
+            return
+        lo, hi = _ordered_weights(column_array(tmin), column_array(tmax), 'add_edges_from_arrays')
+        if len(lo) * 2 != len(labels):
+            raise ValueError('u, v, tmin and tmax must have the same length')
+        # Étiquettes du lot numérotées en masse, puis traduites en identifiants du graphe
+        table = LabelTable()
+        ids = table.ids(labels)
+        nodes = np.array([self._intern(x) for x in table.labels], dtype=np.int64)
+        ids = nodes[ids]
+
+        out = self._out
+        weights = np.fromiter(zip(lo.tolist(), hi.tolist()), dtype=object, count=len(lo))
+        sources, targets = ids[0::2], ids[1::2]
         if not self.directed:
-            self.adj[v][u] = (temps_min, temps_max)
+            # Les deux sens de chaque ligne, dans l'ordre des lignes (_in est _out)
+            sources, targets = ids, ids.reshape(-1, 2)[:, ::-1].reshape(-1)
+            weights = np.repeat(weights, 2)
+        nodes = nodes.tolist()
+        degree_before = sum(len(out[i]) for i in nodes)
+        loops_before = 0 if self.directed else sum(i in out[i] for i in nodes)
+
+        _update_by_key(out, sources, targets, weights)
+        if self.directed:
+            _update_by_key(self._in, targets, sources, weights)
+
+        degree = sum(len(out[i]) for i in nodes) - degree_before
+        if self.directed:
+            self._n_edges += degree
+        else:
+            # Une arête non orientée compte deux fois dans les degrés, une boucle une fois
+            self._n_edges += (degree + sum(i in out[i] for i in nodes) - loops_before) // 2
+        self._version += 1
 
     def remove_edge(self, u, v):
-        if u in self.adj and v in self.adj[u]:
-            del self.adj[u][v]
-        if not self.directed and v in self.adj and u in self.adj[v]:
-            del self.adj[v][u]
+        if not self.has_edge(u, v):
+            return
+        i, j = self._ids[u], self._ids[v]
+        del self._out[i][j]
+        # Non orienté : _in est _out, on retire donc aussi v->u (déjà fait pour une boucle)
+        self._in[j].pop(i, None)
+        self._n_edges -= 1
+        self._version += 1
 
     def remove_node(self, v):
-        if v not in self.adj:
+        """Supprime v et ses arêtes en O(degré entrant + degré sortant)."""
+        i = self._ids.pop(v, None)
+        if i is None:
             return
-        for nbrs in self.adj.values():
-            nbrs.pop(v, None)
-        del self.adj[v]
+        out_nbrs = self._out[i]
+        in_nbrs = self._in[i]
+        for u in in_nbrs:
+            if u != i:
+                del self._out[u][i]
+        if self.directed:
+            for w in out_nbrs:
+                if w != i:
+                    del self._in[w][i]
+            self._n_edges -= len(in_nbrs) + len(out_nbrs) - (i in out_nbrs)
+            self._in[i] = None
+        else:
+            self._n_edges -= len(out_nbrs)
+        self._out[i] = None
+        self._labels[i] = _HOLE
+        self._holes += 1
+        self._version += 1
+        if self._holes > 64 and 2 * self._holes > len(self._labels):
+            self._compact()
+
+    def _compact(self):
+        """Renumérote les sommets 0..n-1 sans trous, en gardant leur ordre."""
+        keep = list(self._ids.values())
+        new_id = dict(zip(keep, range(len(keep))))
+        self._labels = [self._labels[i] for i in keep]
+        self._ids = dict(zip(self._labels, range(len(keep))))
+        self._out = [{new_id[j]: w for j, w in self._out[i].items()} for i in keep]
+        self._in = [{new_id[j]: w for j, w in self._in[i].items()} for i in keep] if self.directed else self._out
+        self._holes = 0
+
+    @property
+    def version(self):
+        """Numéro de version, incrémenté par add_node, add_edge, remove_edge et remove_node."""
+        return self._version
+
+    def node_id(self, v):
+        """Identifiant interne de v (KeyError s'il n'est pas dans le graphe)."""
+        return self._ids[v]
 
     def neighbors(self, v):
-        return dict(self.adj.get(v, {}))
+        i = self._ids.get(v)
+        if i is None:
+            return {}
+        labels = self._labels
+        return {labels[j]: w for j, w in self._out[i].items()}
+
+    def predecessors(self, v):
+        """Vue en lecture seule des prédécesseurs de v : {u: (temps_min, temps_max)}."""
+        i = self._ids.get(v)
+        if i is None:
+            return MappingProxyType({})
+        return _NeighborView(self, self._in[i])
 
     def nodes(self):
-        return list(self.adj.keys())
+        return list(self._ids)
+
+    def num_nodes(self):
+        return len(self._ids)
+
+    def num_edges(self):
+        return self._n_edges
 
     def edges(self):
         edges = []
-        seen = set()
-        for u, nbrs in self.adj.items():
-            for v, (tmin, tmax) in nbrs.items():
-                if self.directed or (v, u) not in seen:
-                    edges.append((u, v, tmin, tmax))
-                    seen.add((u, v))
+        labels = self._labels
+        for i in self._ids.values():
+            u = labels[i]
+            for j, (tmin, tmax) in self._out[i].items():
+                # Non orienté : chaque arête une fois, depuis l'extrémité ajoutée en premier
+                if self.directed or j >= i:
+                    edges.append((u, labels[j], tmin, tmax))
         return edges
 
     def has_node(self, v):
-        return v in self.adj
+        return v in self._ids
 
     def has_edge(self, u, v):
-        return u in self.adj and v in self.adj[u]
+        i, j = self._ids.get(u), self._ids.get(v)
+        return i is not None and j is not None and j in self._out[i]
 
     def degree(self, v):
-        return len(self.adj.get(v, {}))
+        i = self._ids.get(v)
+        return 0 if i is None else len(self._out[i])
+
+    def topological_ids(self):
+        """Ordre topologique en identifiants internes (voir topological_order)."""
+        if self._topo is None or self._topo[0] != self._version:
+            if not self.directed and self._n_edges:
+                order = None
+            else:
+                in_degree = [0 if preds is None else len(preds) for preds in self._in]
+                order = [i for i in self._ids.values() if in_degree[i] == 0]
+                for u in order:  # la liste s'allonge pendant le parcours
+                    for v in self._out[u]:
+                        in_degree[v] -= 1
+                        if in_degree[v] == 0:
+                            order.append(v)
+                if len(order) != len(self._ids):
+                    order = None
+            self._topo = (self._version, order)
+        return self._topo[1]
+
+    def topological_order(self):
+        """Ordre topologique des sommets (Kahn, itératif), ou None si le graphe a un cycle.
+
+        Calculé une fois par version du graphe. Un graphe non orienté avec au
+        moins une arête n'est jamais acyclique au sens orienté.
+        """
+        order = self.topological_ids()
+        return None if order is None else [self._labels[i] for i in order]
+
+    def save_binary(self, path):
+        """Enregistre le graphe au format binaire de FrozenGraph.save_binary."""
+        self.freeze().save_binary(path)
+
+    @staticmethod
+    def load_binary(path, mmap=True):
+        """Ouvre un fichier de save_binary : renvoie un FrozenGraph (thaw() pour le modifier)."""
+        return FrozenGraph.load_binary(path, mmap)
+
+    def freeze(self):
+        """Renvoie une copie figée du graphe au format CSR (voir FrozenGraph).
+
+        Le graphe mutable reste utilisable pour la construction ; la copie figée
+        sert aux parcours (best_path, count_routes, affichage).
+        """
+        return FrozenGraph.from_simple_graph(self)
 
     def noisy_edge_mean_gauss(self, tmin, tmax, noise_scale=1.0, n_samples=1000):
         """
@@ -162,24 +359,37 @@ class SimpleGraph:
         
         return np.mean(valid_times)
 
-    def make_converge(self, beta = False, n_samples=1000):
+    def make_converge(self, beta = False, n_samples=1000, rng=None, workers=1,
+                      rtol=None, batch_size=50, return_stats=False):
         """
         Pour chaque arête, crée une gaussienne bruitée ou une distribution beta
         et estime la moyenne empirique, ces lois simule la circulation des vehiécules 
         en temps réel.
         On renvoies un nouveau graphe avec ces valeurs.
+
+        Toutes les arêtes sont échantillonnées à la fois (voir Sampling.converge_edge_means).
+        rng : graine, SeedSequence ou numpy.random.Generator. Sans rng, la graine est
+            tirée de l'état global np.random : np.random.seed(...) avant l'appel rend
+            le résultat reproductible.
+        workers : nombre de processus ; le résultat ne dépend pas de cette valeur.
+        rtol : si donné, chaque arête est échantillonnée par lots de `batch_size` et
+            s'arrête dès que l'erreur type de sa moyenne passe sous rtol * (tmax - tmin) ;
+            n_samples devient alors un plafond (voir Sampling.adaptive_edge_means).
+        return_stats : renvoie (graphe, stats) où stats contient 'edges', et pour chaque
+            arête le nombre de tirages 'n_samples' et l'erreur type 'stderr'.
         """
         g = SimpleGraph(directed=self.directed)
-        noise_scale = np.random.uniform(0, 0.5)
-
-        for u, v, tmin, tmax in self.edges():
-            if beta:
-                mean_estimee = self.noisy_edge_mean_beta(tmin, tmax, n_samples)
-            else:
-                mean_estimee = self.noisy_edge_mean_gauss(tmin, tmax, noise_scale, n_samples)
-            g.add_node(u)
-            g.add_node(v)
-            g.add_edge(u, v, round(mean_estimee,2), round(mean_estimee,2))
+        edges = self.edges()
+        tmin = np.array([e[2] for e in edges], dtype=float)
+        tmax = np.array([e[3] for e in edges], dtype=float)
+        means, stats = _converge(tmin, tmax, beta, n_samples, rng, workers, rtol, batch_size, return_stats)
+
+        # tmin = tmax = moyenne arrondie : pas besoin de la validation de add_edge
+        for (u, v, _, _), mean_estimee in zip(edges, np.round(means, 2).tolist()):
+            g._insert_edge(u, v, mean_estimee, mean_estimee)
+        if return_stats:
+            stats['edges'] = [(u, v) for u, v, _, _ in edges]
+            return g, stats
         return g
 
     # ------------------------------------------------------------------
@@ -194,7 +404,7 @@ class SimpleGraph:
           - (u, v, w)  -> tmin = tmax = w
           - (u, v)     -> tmin, tmax = default_weight
         """
-        g = cls(directed=directed)
+        us, vs, lo, hi = [], [], [], []
         for e in edges:
             if len(e) >= 4:
                 u, v, tmin, tmax = e[0], e[1], e[2], e[3]
@@ -207,7 +417,9 @@ class SimpleGraph:
             else:
                 # skip malformed entries
                 continue
-            g.add_edge(u, v, tmin, tmax)
+            us.append(u); vs.append(v); lo.append(tmin); hi.append(tmax)
+        g = cls(directed=directed)
+        g.add_edges_from_arrays(us, vs, lo, hi)
         return g
 
     @classmethod
@@ -218,14 +430,16 @@ class SimpleGraph:
         On s'attend à ce que adj_dict[u][v] soit soit un tuple (tmin, tmax),
         soit une seule valeur (dans ce cas tmin = tmax).
         """
-        g = cls(directed=directed)
+        us, vs, lo, hi = [], [], [], []
         for u, nbrs in adj_dict.items():
             for v, w in nbrs.items():
                 if isinstance(w, (tuple, list)) and len(w) >= 2:
                     tmin, tmax = w[0], w[1]
                 else:
                     tmin = tmax = w
-                g.add_edge(u, v, tmin, tmax)
+                us.append(u); vs.append(v); lo.append(tmin); hi.append(tmax)
+        g = cls(directed=directed)
+        g.add_edges_from_arrays(us, vs, lo, hi)
         return g
 
     @classmethod
@@ -244,23 +458,18 @@ class SimpleGraph:
         if not set([u_col, v_col]).issubset(df.columns):
             raise ValueError(f'DataFrame must contain columns {u_col} and {v_col}')
 
-        g = cls(directed=directed)
-        for _, row in df.iterrows():
-            u = row[u_col]
-            v = row[v_col]
-            if tmin_col in df.columns:
-                tmin = row[tmin_col]
-            elif 'weight' in df.columns:
-                tmin = row['weight']
-            else:
-                raise ValueError('No weight column found (expected tmin or weight)')
-
-            if tmax_col in df.columns:
-                tmax = row[tmax_col]
-            else:
-                tmax = tmin
+        if tmin_col in df.columns:
+            tmin = df[tmin_col].to_numpy()
+        elif 'weight' in df.columns:
+            tmin = df['weight'].to_numpy()
+        else:
+            raise ValueError('No weight column found (expected tmin or weight)')
+        tmax = df[tmax_col].to_numpy() if tmax_col in df.columns else tmin
 
-            g.add_edge(u, v, tmin, tmax)
+        # Colonne par colonne : chaque étiquette garde le type de sa colonne (iterrows
+        # convertit une ligne entière vers un type commun)
+        g = cls(directed=directed)
+        g.add_edges_from_arrays(df[u_col].to_numpy(), df[v_col].to_numpy(), tmin, tmax)
         return g
 
     def relabel_to_ints(self, start=1):
@@ -333,7 +542,6 @@ class SimpleGraph:
         Accepte soit un dictionnaire d'adjacence (u -> {v: poids ou [tmin,tmax]})
         soit une liste d'arêtes ([u,v] ou [u,v,w] ou [u,v,tmin,tmax]).
         """
-        import json
         with open(file_path) as fh:
             obj = json.load(fh)
 
@@ -395,7 +603,567 @@ class SimpleGraph:
             except Exception:
                 raise ValueError(f'Impossible de parser la valeur numérique : {val}')
 
-            
+
+# Format binaire de save_binary / load_binary
+BINARY_MAGIC = b'PIOTGRPH'
+BINARY_FORMAT = 1
+
+
+def _align(offset, alignment=64):
+    return -(-offset // alignment) * alignment
+
+
+def _encode_label(label):
+    # JSON ne connaît pas les tuples (étiquettes de grille par exemple)
+    if isinstance(label, np.generic):
+        label = label.item()
+    if isinstance(label, tuple):
+        return {'tuple': [_encode_label(v) for v in label]}
+    if label is None or isinstance(label, (str, int, float, bool)):
+        return label
+    raise TypeError(f'save_binary: label {label!r} of type {type(label).__name__} cannot be stored')
+
+
+def _decode_label(value):
+    if isinstance(value, dict):
+        return tuple(_decode_label(v) for v in value['tuple'])
+    return value
+
+
+# Place d'un sommet supprimé dans SimpleGraph._labels, jusqu'au prochain tassement
+_HOLE = object()
+
+
+class _LabelView(Mapping):
+    # adj de SimpleGraph : {u: {v: poids}} par étiquettes, lu dans les tableaux par identifiants
+    __slots__ = ('_graph',)
+
+    def __init__(self, graph):
+        self._graph = graph
+
+    def __getitem__(self, u):
+        graph = self._graph
+        return _NeighborView(graph, graph._out[graph._ids[u]])
+
+    def __contains__(self, u):
+        return u in self._graph._ids
+
+    def __iter__(self):
+        return iter(self._graph._ids)
+
+    def __len__(self):
+        return len(self._graph._ids)
+
+    def __repr__(self):
+        return repr({u: dict(nbrs) for u, nbrs in self.items()})
+
+
+class _NeighborView(Mapping):
+    # {v: poids} par étiquettes autour d'un dictionnaire {identifiant: poids}.
+    # Suit les ajouts et retraits d'arêtes ; à reprendre après un remove_node.
+    __slots__ = ('_graph', '_nbrs')
+
+    def __init__(self, graph, nbrs):
+        self._graph = graph
+        self._nbrs = nbrs
+
+    def __getitem__(self, v):
+        j = self._graph._ids.get(v)
+        if j is None or j not in self._nbrs:
+            raise KeyError(v)
+        return self._nbrs[j]
+
+    def __contains__(self, v):
+        return self._graph._ids.get(v) in self._nbrs
+
+    def __iter__(self):
+        return map(self._graph._labels.__getitem__, self._nbrs)
+
+    def __len__(self):
+        return len(self._nbrs)
+
+    def items(self):
+        return _NeighborItems(self)
+
+    def values(self):
+        return self._nbrs.values()
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+
+class _NeighborItems(ItemsView):
+    __slots__ = ()
+
+    def __iter__(self):
+        labels = self._mapping._graph._labels
+        return ((labels[j], w) for j, w in self._mapping._nbrs.items())
+
+
+def _update_by_key(adjacency, keys, values, weights):
+    # adjacency[keys[i]][values[i]] = weights[i], dans l'ordre des lignes.
+    # Tri stable par clé : chaque dictionnaire est rempli d'un seul update, qui garde
+    # la position de la première occurrence et la valeur de la dernière.
+    order = np.argsort(keys, kind='stable')
+    keys = keys[order]
+    starts = np.flatnonzero(np.diff(keys, prepend=-1))
+    sizes = np.diff(np.append(starts, len(keys)))
+    pairs = zip(values[order].tolist(), weights[order].tolist())
+    for key, size in zip(keys[starts].tolist(), sizes.tolist()):
+        adjacency[key].update(islice(pairs, size))
+
+
+def _ordered_weights(tmin, tmax, caller):
+    # Validation de add_edge, vectorisée : temps_min <= temps_max après échange,
+    # avec un seul avertissement pour toutes les arêtes échangées
+    if len(tmin) != len(tmax):
+        raise ValueError('temps_min and temps_max must have the same length')
+    try:
+        swapped = np.greater(tmin, tmax).astype(bool)
+    except TypeError:
+        raise TypeError('temps_min and temps_max must be comparable numeric values')
+    if swapped.any():
+        import warnings
+        warnings.warn(f'{caller}: temps_min > temps_max for {int(swapped.sum())} edges - swapping the values',
+                      UserWarning)
+        tmin, tmax = np.where(swapped, tmax, tmin), np.where(swapped, tmin, tmax)
+    return tmin, tmax
+
+
+def linear_cost(a, b):
+    """
+    Fonction (tmin, tmax) -> a*tmin + b*tmax, pour des nombres comme pour des tableaux.
+
+    Un terme de coefficient nul n'est pas calculé : add_edge accepte tmax = inf,
+    et 0 * inf vaudrait nan au lieu d'ignorer tmax.
+    """
+    if b == 0:
+        return (lambda tmin, tmax: tmin) if a == 1 else (lambda tmin, tmax: a * tmin)
+    if a == 0:
+        return (lambda tmin, tmax: tmax) if b == 1 else (lambda tmin, tmax: b * tmax)
+    if (a, b) == (-1, 1):
+        return lambda tmin, tmax: tmax - tmin
+    return lambda tmin, tmax: a * tmin + b * tmax
+
+
+def _converge(tmin, tmax, beta, n_samples, rng, workers, rtol, batch_size, return_stats):
+    """Moyennes de make_converge, et les statistiques par arête si demandées (sinon None)."""
+    if rtol is None and not return_stats:
+        return converge_edge_means(tmin, tmax, beta, n_samples, rng, workers), None
+    # Sans tolérance, mêmes tirages que converge_edge_means : les statistiques ne changent pas les moyennes
+    means, counts, stderr = converge_edge_stats(tmin, tmax, beta, n_samples, rng, workers, rtol, batch_size)
+    return means, {'n_samples': counts, 'stderr': stderr}
+
+
+class FrozenGraph:
+    """
+    Version figée (lecture seule) d'un SimpleGraph, stockée en tableaux CSR NumPy.
+
+    Les sommets sont numérotés 0..n-1 dans l'ordre de graph.nodes() ; labels[i]
+    est l'étiquette d'origine du sommet i et index[label] son identifiant.
+    Les arcs sortants de i sont indices[indptr[i]:indptr[i+1]], avec les poids
+    correspondants dans tmin et tmax. Un graphe non orienté stocke les deux sens.
+    """
+    def __init__(self, indptr, indices, tmin, tmax, labels, directed=False):
+        self.directed = directed
+        self.indptr = indptr
+        self.indices = indices
+        self.tmin = tmin
+        self.tmax = tmax
+        # Étiquettes, index et nombre d'arêtes sont calculés au premier usage : un
+        # graphe ouvert par load_binary n'a rien à parcourir avant sa première requête.
+        # Des étiquettes entières peuvent rester un tableau NumPy jusque-là.
+        self._labels = labels if isinstance(labels, np.ndarray) else list(labels)
+        self._index = None
+        self._n_edges = None
+        self._weights = {}
+        # Copies en listes Python de la structure et des poids, pour les parcours
+        self._lists = {}
+        self._reverse = None
+        self._topo = None
+
+    @property
+    def labels(self):
+        if isinstance(self._labels, np.ndarray):
+            self._labels = self._labels.tolist()
+        return self._labels
+
+    @property
+    def index(self):
+        if self._index is None:
+            self._index = {label: i for i, label in enumerate(self.labels)}
+        return self._index
+
+    @classmethod
+    def from_simple_graph(cls, graph):
+        # Les identifiants internes de graph suivent déjà l'ordre de nodes() :
+        # seuls les trous laissés par remove_node sont à retirer
+        keep = list(graph._ids.values())
+        labels = list(graph._ids)
+        n = len(labels)
+        rows = [graph._out[i] for i in keep]
+        degrees = np.fromiter(map(len, rows), dtype=np.int64, count=n)
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(degrees, out=indptr[1:])
+        m = int(indptr[-1])
+        id_type = np.int32 if n < 2**31 else np.int64
+        indices = np.fromiter((j for nbrs in rows for j in nbrs), dtype=id_type, count=m)
+        if graph._holes:
+            new_id = np.full(len(graph._labels), -1, dtype=id_type)
+            new_id[keep] = np.arange(n, dtype=id_type)
+            indices = new_id[indices]
+        weights = [w for nbrs in rows for w in nbrs.values()]
+        # np.array garde des entiers si tous les poids sont entiers, sinon des flottants
+        tmin = np.array([w[0] for w in weights]) if m else np.zeros(0)
+        tmax = np.array([w[1] for w in weights]) if m else np.zeros(0)
+        return cls(indptr, indices, tmin, tmax, labels, directed=graph.directed)
+
+    @classmethod
+    def from_arrays(cls, sources, targets, tmin, tmax, labels=None, directed=False):
+        """
+        Construit le CSR en une passe à partir de colonnes d'arêtes.
+
+        Sans labels, sources et targets sont des étiquettes, numérotées dans leur
+        ordre de première apparition (u puis v, ligne par ligne) ; sinon ce sont des
+        identifiants dans labels. Même résultat que add_edge ligne par ligne puis
+        freeze() : poids échangés si temps_min > temps_max (un seul avertissement),
+        la dernière occurrence d'une arête fixe ses poids, la première sa place.
+        """
+        if labels is None:
+            table = LabelTable()
+            ids = table.ids(interleave(sources, targets))
+            sources, targets, labels = ids[0::2], ids[1::2], table.labels
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        tmin, tmax = _ordered_weights(np.asarray(tmin), np.asarray(tmax), 'from_arrays')
+        n, m = len(labels), len(sources)
+
+        # Une arête par clé (u, v), ou {u, v} sans orientation
+        if directed:
+            keys = sources * n + targets
+        else:
+            keys = np.minimum(sources, targets) * n + np.maximum(sources, targets)
+        # Groupes de lignes de même clé : première et dernière ligne de chaque groupe
+        order = np.argsort(keys)
+        starts = np.flatnonzero(np.diff(keys[order], prepend=-1))
+        if m:
+            first, last = np.minimum.reduceat(order, starts), np.maximum.reduceat(order, starts)
+        else:
+            first = last = order
+        rank = np.argsort(first)
+        first, last = first[rank], last[rank]
+        u, v, lo, hi = sources[first], targets[first], tmin[last], tmax[last]
+        if not directed:
+            # Les deux sens de chaque arête, côte à côte ; une boucle n'est stockée qu'une fois
+            keep = np.ones(2 * len(u), dtype=bool)
+            keep[1::2] = u != v
+            u, v = np.column_stack([u, v]).reshape(-1)[keep], np.column_stack([v, u]).reshape(-1)[keep]
+            lo, hi = np.repeat(lo, 2)[keep], np.repeat(hi, 2)[keep]
+
+        arcs = np.argsort(u, kind='stable')
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(u, minlength=n), out=indptr[1:])
+        id_type = np.int32 if n < 2**31 else np.int64
+        if not len(arcs):
+            lo = hi = np.zeros(0)
+        return cls(indptr, v[arcs].astype(id_type), lo[arcs], hi[arcs], labels, directed=directed)
+
+    @classmethod
+    def _from_chunks(cls, chunks, directed):
+        # Étiquettes converties bloc par bloc : seuls des tableaux typés sont conservés
+        table = LabelTable()
+        ids, tmin, tmax = [], [], []
+        for u, v, lo, hi in chunks:
+            ids.append(table.ids(interleave(u, v)))
+            tmin.append(lo)
+            tmax.append(hi)
+        if not ids:
+            return cls.from_arrays([], [], np.zeros(0), np.zeros(0), labels=[], directed=directed)
+        ids = np.concatenate(ids)
+        return cls.from_arrays(ids[0::2], ids[1::2], np.concatenate(tmin), np.concatenate(tmax),
+                               labels=table.labels, directed=directed)
+
+    @classmethod
+    def from_csv(cls, file_path, directed=False, u_col='u', v_col='v', tmin_col='tmin', tmax_col='tmax',
+                 has_header=True, default_weight=(1, 1), chunk_rows=CHUNK_ROWS):
+        """Comme SimpleGraph.from_csv, lu par blocs de chunk_rows lignes (voir Loaders)."""
+        return cls._from_chunks(csv_chunks(file_path, u_col, v_col, tmin_col, tmax_col, has_header,
+                                           default_weight, chunk_rows), directed)
+
+    @classmethod
+    def from_edgelist_file(cls, file_path, directed=False, sep=None, default_weight=(1, 1), chunk_rows=CHUNK_ROWS):
+        """Comme SimpleGraph.from_edgelist_file, lu par blocs de chunk_rows lignes."""
+        return cls._from_chunks(edgelist_chunks(file_path, sep, default_weight, chunk_rows), directed)
+
+    @classmethod
+    def from_json(cls, file_path, directed=False, chunk_rows=CHUNK_ROWS):
+        """Comme SimpleGraph.from_json, décodé en flux élément par élément."""
+        return cls._from_chunks(json_chunks(file_path, chunk_rows), directed)
+
+    def thaw(self):
+        """Reconstruit un SimpleGraph mutable équivalent."""
+        g = SimpleGraph(directed=self.directed)
+        for v in self.labels:
+            g.add_node(v)
+        for u, v, tmin, tmax in self.edges():
+            g.add_edge(u, v, tmin, tmax)
+        return g
+
+    def make_converge(self, beta=False, n_samples=1000, rng=None, workers=1,
+                      rtol=None, batch_size=50, return_stats=False):
+        """Voir SimpleGraph.make_converge ; renvoie un graphe figé de même structure."""
+        canonical, position = self._canonical_edges()
+        means, stats = _converge(self.tmin[canonical], self.tmax[canonical], beta, n_samples, rng,
+                                 workers, rtol, batch_size, return_stats)
+        means = np.round(means, 2)[position]
+        g = FrozenGraph(self.indptr, self.indices, means, means.copy(), self.labels, directed=self.directed)
+        if return_stats:
+            stats['edges'] = [(u, v) for u, v, _, _ in self.edges()]
+            return g, stats
+        return g
+
+    def _canonical_edges(self):
+        """Positions des arêtes dans l'ordre de edges(), et pour chaque entrée CSR
+        la position de son arête (les deux sens d'une arête non orientée partagent la même)."""
+        m = len(self.indices)
+        if self.directed:
+            return np.arange(m), np.arange(m)
+        n = self.num_nodes()
+        sources = self.edge_sources().astype(np.int64)
+        targets = self.indices.astype(np.int64)
+        canonical = np.flatnonzero(targets >= sources)
+        keys = np.minimum(sources, targets) * n + np.maximum(sources, targets)
+        order = np.argsort(keys[canonical], kind='stable')
+        position = order[np.searchsorted(keys[canonical][order], keys)]
+        return canonical, position
+
+    def weights(self, a, b):
+        """Poids a*tmin + b*tmax de chaque arc (ordre CSR), mis en cache : le graphe est figé."""
+        key = (a, b)
+        w = self._weights.get(key)
+        if w is None:
+            w = self._weights[key] = linear_cost(a, b)(self.tmin, self.tmax)
+        return w
+
+    def weight_list(self, a, b):
+        """weights(a, b) en liste Python, mise en cache (voir csr_lists)."""
+        key = (a, b)
+        w = self._lists.get(key)
+        if w is None:
+            w = self._lists[key] = self.weights(a, b).tolist()
+        return w
+
+    def csr_lists(self, reverse=False):
+        """(indptr, voisins) en listes Python, calculés une fois.
+
+        Les parcours arc par arc (best_path, _tree_search) indexent une liste bien
+        plus vite qu'ils ne découpent puis convertissent des tranches NumPy.
+        reverse=True : arcs entrants, les voisins sont les sources de reverse_csr.
+        """
+        key = 'reverse' if reverse else 'forward'
+        lists = self._lists.get(key)
+        if lists is None:
+            indptr, neighbors = self.reverse_csr()[:2] if reverse else (self.indptr, self.indices)
+            lists = self._lists[key] = (indptr.tolist(), neighbors.tolist())
+        return lists
+
+    def edge_sources(self):
+        """Sommet source de chaque arc, dans l'ordre CSR."""
+        return np.repeat(np.arange(self.num_nodes(), dtype=self.indices.dtype), np.diff(self.indptr))
+
+    def reverse_csr(self):
+        """CSR des arcs entrants, calculé une fois : (indptr, sources, positions).
+
+        Les arcs entrants de j sont sources[indptr[j]:indptr[j+1]] ; positions donne
+        pour chacun sa place dans l'ordre CSR direct (pour lire tmin, tmax, weights).
+        """
+        if self._reverse is None:
+            n = self.num_nodes()
+            positions = np.argsort(self.indices, kind='stable')
+            counts = np.bincount(self.indices, minlength=n)
+            indptr = np.zeros(n + 1, dtype=np.int64)
+            np.cumsum(counts, out=indptr[1:])
+            self._reverse = (indptr, self.edge_sources()[positions], positions)
+        return self._reverse
+
+    @property
+    def version(self):
+        """Un graphe figé ne change jamais : sa version est toujours 0."""
+        return 0
+
+    def topological_ids(self):
+        """Ordre topologique des identifiants (tableau NumPy), ou None si le graphe a un cycle.
+
+        Le graphe étant figé, l'ordre (ou l'absence d'ordre) est calculé une seule fois.
+        """
+        if self._topo is None:
+            n = self.num_nodes()
+            order = None
+            if self.directed or not len(self.indices):
+                indptr, indices = self.indptr, self.indices
+                in_degree = np.bincount(indices, minlength=n).tolist()
+                order = [v for v in range(n) if in_degree[v] == 0]
+                for u in order:
+                    for v in indices[indptr[u]:indptr[u + 1]].tolist():
+                        in_degree[v] -= 1
+                        if in_degree[v] == 0:
+                            order.append(v)
+                order = np.array(order, dtype=np.int64) if len(order) == n else None
+            self._topo = (order,)
+        return self._topo[0]
+
+    def topological_order(self):
+        """Ordre topologique des étiquettes, ou None si le graphe a un cycle."""
+        ids = self.topological_ids()
+        return None if ids is None else [self.labels[i] for i in ids.tolist()]
+
+    def predecessors(self, v):
+        i = self.index.get(v)
+        if i is None:
+            return {}
+        indptr, sources, positions = self.reverse_csr()
+        lo, hi = indptr[i], indptr[i + 1]
+        labels = self.labels
+        return {labels[u]: (a, b) for u, a, b in zip(sources[lo:hi].tolist(),
+                                                      self.tmin[positions[lo:hi]].tolist(),
+                                                      self.tmax[positions[lo:hi]].tolist())}
+
+    def node_id(self, v):
+        return self.index[v]
+
+    def out_edges(self, i):
+        """Arcs sortants du sommet d'identifiant i : (cibles, tmin, tmax) en vues NumPy."""
+        s, e = self.indptr[i], self.indptr[i + 1]
+        return self.indices[s:e], self.tmin[s:e], self.tmax[s:e]
+
+    def neighbors(self, v):
+        i = self.index.get(v)
+        if i is None:
+            return {}
+        targets, tmin, tmax = self.out_edges(i)
+        labels = self.labels
+        return {labels[j]: (a, b) for j, a, b in zip(targets.tolist(), tmin.tolist(), tmax.tolist())}
+
+    def nodes(self):
+        return list(self.labels)
+
+    def edges(self):
+        edges = []
+        labels = self.labels
+        for i, u in enumerate(labels):
+            targets, tmin, tmax = self.out_edges(i)
+            for j, a, b in zip(targets.tolist(), tmin.tolist(), tmax.tolist()):
+                # Même dédoublonnage que SimpleGraph.edges pour le cas non orienté
+                if self.directed or j >= i:
+                    edges.append((u, labels[j], a, b))
+        return edges
+
+    def has_node(self, v):
+        return v in self.index
+
+    def has_edge(self, u, v):
+        i, j = self.index.get(u), self.index.get(v)
+        if i is None or j is None:
+            return False
+        return bool(np.any(self.out_edges(i)[0] == j))
+
+    def degree(self, v):
+        i = self.index.get(v)
+        if i is None:
+            return 0
+        return int(self.indptr[i + 1] - self.indptr[i])
+
+    def num_nodes(self):
+        return len(self.indptr) - 1
+
+    def num_edges(self):
+        if self._n_edges is None:
+            # Un arc non orienté (u, v) est stocké deux fois, une boucle (u, u) une seule
+            m = len(self.indices)
+            loops = 0 if self.directed else int(np.count_nonzero(self.edge_sources() == self.indices))
+            self._n_edges = m if self.directed else (m + loops) // 2
+        return self._n_edges
+
+    def save_binary(self, path):
+        """
+        Enregistre le graphe dans un fichier binaire versionné (voir load_binary).
+
+        Disposition : BINARY_MAGIC, longueur de l'en-tête (uint64), en-tête JSON
+        (format, orientation, type, taille et position de chaque tableau), puis à
+        partir de l'octet aligné suivant les tableaux indptr, indices, tmin, tmax
+        et étiquettes, bruts et alignés sur 64 octets. Les étiquettes sont un tableau int64 si elles sont toutes
+        entières, du JSON sinon (chaînes, nombres, tuples).
+        """
+        labels = self._labels
+        if isinstance(labels, np.ndarray) and labels.dtype.kind in 'iu' and np.can_cast(labels.dtype, np.int64):
+            labels, label_kind = labels.astype(np.int64), 'int'
+        else:
+            # Scalaires NumPy en types Python ; un entier hors de int64 passe par le JSON
+            labels = [v.item() if isinstance(v, np.generic) else v for v in labels]
+            if all(type(v) is int and -2**63 <= v < 2**63 for v in labels):
+                labels, label_kind = np.array(labels, dtype=np.int64), 'int'
+            else:
+                encoded = json.dumps([_encode_label(v) for v in labels], separators=(',', ':'))
+                labels, label_kind = np.frombuffer(encoded.encode('utf-8'), dtype=np.uint8), 'json'
+        arrays = {'indptr': self.indptr, 'indices': self.indices, 'tmin': self.tmin,
+                  'tmax': self.tmax, 'labels': labels}
+        arrays = {name: np.ascontiguousarray(a) for name, a in arrays.items()}
+
+        # Positions relatives au début des données, qui suit l'en-tête (aligné)
+        layout, offset = {}, 0
+        for name, a in arrays.items():
+            layout[name] = [a.dtype.str, len(a), offset]
+            offset = _align(offset + a.nbytes)
+        header = json.dumps({'format': BINARY_FORMAT, 'directed': bool(self.directed),
+                             'labels': label_kind, 'arrays': layout}).encode('utf-8')
+        start = _align(len(BINARY_MAGIC) + 8 + len(header))
+
+        with open(path, 'wb') as f:
+            f.write(BINARY_MAGIC)
+            f.write(np.uint64(len(header)).tobytes())
+            f.write(header)
+            for name, a in arrays.items():
+                f.write(b'\0' * (start + layout[name][2] - f.tell()))
+                f.write(a.tobytes())
+
+    @classmethod
+    def load_binary(cls, path, mmap=True):
+        """
+        Ouvre un fichier écrit par save_binary.
+
+        Avec mmap=True les tableaux sont projetés en mémoire en lecture seule :
+        l'ouverture ne lit que l'en-tête, les pages sont chargées à la demande et
+        partagées entre processus. Sinon les tableaux sont lus en mémoire.
+        """
+        with open(path, 'rb') as f:
+            if f.read(len(BINARY_MAGIC)) != BINARY_MAGIC:
+                raise ValueError(f'{path}: not a graph binary file')
+            size = int(np.frombuffer(f.read(8), dtype=np.uint64)[0])
+            header = json.loads(f.read(size).decode('utf-8'))
+        start = _align(len(BINARY_MAGIC) + 8 + size)
+        if header.get('format') != BINARY_FORMAT:
+            raise ValueError(f"{path}: unsupported graph binary format {header.get('format')!r} "
+                             f'(expected {BINARY_FORMAT})')
+
+        arrays = {}
+        for name, (dtype, count, offset) in header['arrays'].items():
+            if count == 0:
+                arrays[name] = np.zeros(0, dtype=dtype)
+            elif mmap:
+                arrays[name] = np.memmap(path, dtype=dtype, mode='r', offset=start + offset, shape=(count,))
+            else:
+                arrays[name] = np.fromfile(path, dtype=dtype, count=count, offset=start + offset)
+        labels = arrays['labels']
+        if header['labels'] == 'json':
+            labels = [_decode_label(v) for v in json.loads(bytes(labels).decode('utf-8'))]
+        return cls(arrays['indptr'], arrays['indices'], arrays['tmin'], arrays['tmax'], labels,
+                   directed=header['directed'])
+
+    @property
+    def nbytes(self):
+        """Taille mémoire des tableaux CSR (hors table des étiquettes)."""
+        return self.indptr.nbytes + self.indices.nbytes + self.tmin.nbytes + self.tmax.nbytes
+
 
 def create_example_graph():
     g = SimpleGraph(directed=True)
@@ -424,16 +1192,221 @@ def create_example_graph():
 
 
 #################Partie 1 - Question 1######################
-def count_routes(graph, start, end):
-    """Compte le nombre de routes de start à end, seulement sur les graphs acycliques."""
-    def dfs(node, stops):
-        if node == end and stops > 0:
-            return 1
-        count = 0
-        for neighbor in graph.neighbors(node):
-            count += dfs(neighbor, stops + 1)
-        return count
-    return dfs(start, 0)
+def count_routes(graph, start, end, by_hops=False):
+    """
+    Compte le nombre de routes de start à end, seulement sur les graphs acycliques.
+
+    Programmation dynamique sur un ordre topologique du sous-graphe utile (sommets
+    atteignables depuis start et qui atteignent end) : linéaire en sa taille, en
+    entiers Python sans limite. Avec by_hops=True, renvoie {nombre d'arcs: routes}.
+    Lève ValueError si ce sous-graphe contient un cycle (nombre de routes infini).
+    """
+    if start == end or not graph.has_node(start) or not graph.has_node(end):
+        return {} if by_hops else 0
+
+    def reach(source, step, stop):
+        seen = {source}
+        stack = [source]
+        while stack:
+            u = stack.pop()
+            if u == stop:
+                continue
+            for w in step(u):
+                if w not in seen:
+                    seen.add(w)
+                    stack.append(w)
+        return seen
+
+    # Une route s'arrête à end : ce qui n'est atteint qu'en repassant par end ne compte pas
+    useful = reach(start, graph.neighbors, end) & reach(end, graph.predecessors, None)
+    if not useful:
+        return {} if by_hops else 0
+    succ = {u: [v for v in graph.neighbors(u) if v in useful] if u != end else [] for u in useful}
+
+    # Ordre de Kahn restreint au sous-graphe utile
+    in_degree = dict.fromkeys(useful, 0)
+    for u in useful:
+        for v in succ[u]:
+            in_degree[v] += 1
+    order = [v for v, d in in_degree.items() if d == 0]
+    for u in order:
+        for v in succ[u]:
+            in_degree[v] -= 1
+            if in_degree[v] == 0:
+                order.append(v)
+    if len(order) != len(useful):
+        on_cycle = next(v for v, d in in_degree.items() if d > 0)
+        raise ValueError(f'count_routes: the routes from {start!r} to {end!r} go through a cycle '
+                         f'(at {on_cycle!r}), their number is infinite')
+
+    # counts[v] = nombre de routes start -> v (ou {h: routes de h arcs} avec by_hops)
+    counts = {start: {0: 1} if by_hops else 1}
+    for u in order:
+        here = counts.get(u)
+        if here is None or u == end:
+            continue
+        for v in succ[u]:
+            if not by_hops:
+                counts[v] = counts.get(v, 0) + here
+                continue
+            there = counts.setdefault(v, {})
+            for h, c in here.items():
+                there[h + 1] = there.get(h + 1, 0) + c
+    if by_hops:
+        return dict(sorted(counts.get(end, {}).items()))
+    return counts.get(end, 0)
+
+
+def test_count_routes():
+    """count_routes contre l'énumération des routes en profondeur (sans arcs après end)"""
+    import random
+    g = SimpleGraph(directed=True)
+    g.add_edge('A', 'B', 1, 1)
+    g.add_edge('B', 'C', 1, 1)
+    g.add_edge('C', 'B', 1, 1)
+    assert count_routes(g, 'A', 'B') == 1 and count_routes(g, 'A', 'B', by_hops=True) == {1: 1}
+    assert count_routes(g, 'A', 'C', by_hops=True) == {2: 1}
+    g.add_edge('C', 'D', 1, 1)
+    try:
+        count_routes(g, 'A', 'D')
+        raise AssertionError('cycle B <-> C not detected')
+    except ValueError:
+        pass
+
+    rng = random.Random(14)
+    for trial in range(80):
+        n = rng.randint(2, 7)
+        g = SimpleGraph(directed=True)
+        for v in range(n):
+            g.add_node(v)
+        for _ in range(rng.randint(1, 2 * n)):
+            u, v = rng.randrange(n), rng.randrange(n)
+            if u != v:
+                g.add_edge(u, v, 1, 1)
+        start, end = rng.sample(range(n), 2)
+        # Sommets qui atteignent end : un cycle hors de ces sommets ne porte aucune route
+        alive, stack = {end}, [end]
+        while stack:
+            for p in g.predecessors(stack.pop()):
+                if p not in alive:
+                    alive.add(p)
+                    stack.append(p)
+
+        def routes(node, hops):
+            # Routes énumérées une à une ; au-delà de n arcs, un cycle est atteint
+            if node == end:
+                return {hops: 1}
+            if hops > n:
+                raise ValueError
+            found = {}
+            for w in g.neighbors(node):
+                if w not in alive:
+                    continue
+                for h, c in routes(w, hops + 1).items():
+                    found[h] = found.get(h, 0) + c
+            return found
+
+        try:
+            expected = dict(sorted(routes(start, 0).items()))
+        except ValueError:
+            expected = ValueError
+        for by_hops in (False, True):
+            try:
+                got = count_routes(g, start, end, by_hops=by_hops)
+            except ValueError:
+                got = ValueError
+            want = expected if by_hops or expected is ValueError else sum(expected.values())
+            assert got == want, f"trial {trial}: {start} -> {end} by_hops={by_hops}: {got} != {want}"
+    print("✓ Test passed: count_routes matches route enumeration")
+
+test_count_routes()
+
+
+def test_add_edges_from_arrays():
+    """add_edges_from_arrays contre add_edge ligne par ligne, sur des lots aléatoires"""
+    import random
+    import warnings
+    rng = random.Random(23)
+
+    def state(g):
+        # Tout ce que l'ordre d'ajout fixe : sommets, voisins et prédécesseurs dans l'ordre
+        return (g.nodes(), [(u, list(g.adj[u].items()), list(g.predecessors(u))) for u in g.nodes()],
+                g.num_edges(), g.topological_ids() is None)
+
+    for trial in range(60):
+        directed = trial % 2 == 0
+        n = rng.randint(1, 8)
+        rows = [(rng.randrange(n), rng.randrange(n), rng.randint(0, 9), rng.randint(0, 9))
+                for _ in range(rng.randint(0, 25))]
+        by_row, at_once = SimpleGraph(directed=directed), SimpleGraph(directed=directed)
+        # Graphe déjà rempli (arêtes et sommet supprimé) avant le lot
+        for g in (by_row, at_once):
+            for u in range(0, n, 2):
+                g.add_edge(u, (u + 1) % n, 1, 2)
+            if n > 3 and trial % 3 == 0:
+                g.remove_node(1)
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            for u, v, tmin, tmax in rows:
+                by_row.add_edge(u, v, tmin, tmax)
+            swapped = sum(tmin > tmax for _, _, tmin, tmax in rows)
+            assert len(caught) == swapped
+            del caught[:]
+            columns = [list(c) for c in zip(*rows)] if rows else [[], [], [], []]
+            if trial % 4 == 1:
+                columns = [np.array(c) for c in columns]
+            at_once.add_edges_from_arrays(*columns)
+            assert len(caught) == (1 if swapped else 0), f"trial {trial}: {len(caught)} warnings"
+        assert state(at_once) == state(by_row), f"trial {trial} (directed={directed}): {rows}"
+    print("✓ Test passed: add_edges_from_arrays matches add_edge row by row")
+
+test_add_edges_from_arrays()
+
+
+def test_binary_roundtrip():
+    """save_binary puis load_binary redonne le même graphe, quel que soit le type des étiquettes"""
+    import os
+    import tempfile
+    cases = {
+        'int': [(0, 1), (1, 2), (2, 0)],
+        'str': [('A', 'B'), ('B', 'C'), ('é', 'A')],
+        'tuple': [((0, 0), (0, 1)), ((0, 1), (1, 1)), ((1, 1), ('x', (2, 3)))],
+        'mixed': [(1, 'A'), ('A', (1, 2)), ((1, 2), 2.5), (2.5, None), (None, True)],
+        'numpy': [(np.int64(3), np.int64(4)), (np.int64(4), 5)],
+        'numpy float': [(np.float64(0.5), np.int32(1))],
+        'big int': [(2**63, 1), (1, -2**63 - 1), (-2**63, 2**63 - 1)],
+        'empty': [],
+    }
+    fd, path = tempfile.mkstemp(suffix='.bin')
+    os.close(fd)
+    try:
+        for name, edges in cases.items():
+            for directed in (False, True):
+                g = SimpleGraph(directed=directed)
+                for i, (u, v) in enumerate(edges):
+                    g.add_edge(u, v, i, i + 0.5)
+                g.add_node('isolé' if name != 'int' else 99)
+                frozen = g.freeze()
+                for graph in (g, frozen):
+                    graph.save_binary(path)
+                    for mmap in (True, False):
+                        loaded = SimpleGraph.load_binary(path, mmap=mmap)
+                        assert loaded.directed == directed
+                        assert list(loaded.labels) == list(frozen.labels), f"{name}: {list(loaded.labels)}"
+                        assert [type(v) for v in loaded.labels] == [type(v.item() if isinstance(v, np.generic) else v)
+                                                                  for v in frozen.labels], name
+                        assert set(loaded.thaw().edges()) == set(g.edges()), name
+                        del loaded
+        # Étiquettes déjà en tableau NumPy (from_arrays), y compris uint64 hors de int64
+        for labels in (np.arange(3), np.array([0, 1, 2**64 - 1], dtype=np.uint64)):
+            frozen = FrozenGraph.from_arrays([0, 1], [1, 2], [1, 2], [3, 4], labels=labels, directed=True)
+            frozen.save_binary(path)
+            assert [int(v) for v in SimpleGraph.load_binary(path, mmap=False).labels] == labels.tolist()
+    finally:
+        os.remove(path)
+    print("✓ Test passed: binary graph files round-trip")
+
+test_binary_roundtrip()
 
 """
 Unused Codes
@@ -0,0 +1,222 @@
+import heapq
+import time
+import numpy as np
+from GraphStruct import FrozenGraph
+from Abstract import resolve_metric, _tree_search
+
+# ALT : A* + Landmarks + inégalité Triangulaire.
+# Pour un repère L, l'inégalité triangulaire donne deux minorants de d(v, t) :
+#     d(v, L) - d(t, L)   et   d(L, t) - d(L, v)
+# Le maximum sur les repères est un potentiel cohérent pour A*, qui oriente la
+# recherche vers la destination sans perdre l'optimalité.
+
+
+class LandmarkIndex:
+    """
+    Précalcul ALT réutilisable pour de nombreuses requêtes sur le même graphe.
+
+    k repères sont choisis ('farthest' ou 'avoid'), puis pour chaque métrique
+    de `metrics` on stocke les distances depuis et vers chaque repère. L'index
+    retient la version du graphe : si le graphe est modifié, il est reconstruit
+    automatiquement à la requête suivante.
+
+    Après construction : landmarks (étiquettes), preprocessing_time (secondes).
+    """
+    def __init__(self, graph, k=8, strategy='farthest', metrics=('tmin', 'tmax', 'marge'), seed=None):
+        if strategy not in ('farthest', 'avoid'):
+            raise ValueError("strategy must be 'farthest' or 'avoid'")
+        self.graph = graph
+        self.k = k
+        self.strategy = strategy
+        self.metrics = {resolve_metric(m): m for m in metrics}
+        if None in self.metrics:
+            raise ValueError('ALT needs declarative metrics (name or pair (a, b)), not callables')
+        self.seed = seed
+        self.build()
+
+    def build(self):
+        """(Re)calcule repères et tables de distances."""
+        started = time.perf_counter()
+        graph = self.graph
+        self.version = graph.version
+        self.frozen = graph if isinstance(graph, FrozenGraph) else graph.freeze()
+        rng = np.random.default_rng(self.seed)
+
+        n = self.frozen.num_nodes()
+        k = min(self.k, n)
+        if self.strategy == 'farthest':
+            ids = self._select_farthest(k, rng)
+        else:
+            ids = self._select_avoid(k, rng)
+        self._ids = ids
+        self.landmarks = [self.frozen.labels[i] for i in ids]
+
+        # _from[coeffs][v, l] = d(L_l, v) et _to[coeffs][v, l] = d(v, L_l), rangés
+        # par sommet pour lire les k valeurs d'un sommet d'un seul bloc.
+        self._from, self._to = {}, {}
+        for coeffs in self.metrics:
+            weights = self.frozen.weights(*coeffs)
+            dist_from = np.empty((n, len(ids)))
+            dist_to = np.empty((n, len(ids)))
+            for col, landmark in enumerate(ids):
+                dist_from[:, col] = _tree_search(self.frozen, weights, landmark)[0]
+                if self.frozen.directed:
+                    dist_to[:, col] = _tree_search(self.frozen, weights, landmark, reverse=True)[0]
+                else:
+                    dist_to[:, col] = dist_from[:, col]
+            self._from[coeffs], self._to[coeffs] = dist_from, dist_to
+        self.preprocessing_time = time.perf_counter() - started
+
+    def is_valid(self):
+        return self.graph.version == self.version
+
+    def _select_farthest(self, k, rng):
+        # Chaque nouveau repère maximise sa distance (tmin) au plus proche des repères
+        # déjà choisis ; un sommet injoignable compte comme infiniment loin.
+        n = self.frozen.num_nodes()
+        if k == 0:
+            return []
+        weights = self.frozen.weights(1, 0)
+        start = int(rng.integers(n))
+        closest = _tree_search(self.frozen, weights, start)[0]
+        ids = []
+        for _ in range(k):
+            candidates = np.where(np.isinf(closest), np.inf, closest)
+            candidates[ids] = -1
+            landmark = int(np.argmax(candidates))
+            ids.append(landmark)
+            closest = np.minimum(closest, _tree_search(self.frozen, weights, landmark)[0])
+        return ids
+
+    def _select_avoid(self, k, rng):
+        # Stratégie "avoid" (Goldberg et Werneck) : depuis une racine r, on pondère
+        # chaque sommet par l'écart d(r, v) - minorant(r, v) donné par les repères
+        # actuels, on cumule ces poids dans l'arbre des plus courts chemins en
+        # ignorant les sous-arbres qui contiennent déjà un repère, puis on descend
+        # vers le sous-arbre le plus lourd jusqu'à une feuille.
+        n = self.frozen.num_nodes()
+        if k == 0:
+            return []
+        weights = self.frozen.weights(1, 0)
+        ids = self._select_farthest(1, rng)
+        dist_from = [_tree_search(self.frozen, weights, ids[0])[0]]
+        dist_to = [_tree_search(self.frozen, weights, ids[0], reverse=True)[0]]
+
+        while len(ids) < k:
+            root = int(rng.integers(n))
+            dist, precedent = _tree_search(self.frozen, weights, root)
+            reached = np.flatnonzero(np.isfinite(dist))
+            bound = np.zeros(n)
+            for d_from, d_to in zip(dist_from, dist_to):
+                with np.errstate(invalid='ignore'):
+                    lower = np.maximum(d_to[root] - d_to, d_from - d_from[root])
+                bound = np.maximum(bound, np.nan_to_num(lower, nan=0.0, posinf=0.0, neginf=0.0))
+            size = np.where(np.isfinite(dist), dist - bound, 0.0)
+            has_landmark = np.zeros(n, dtype=bool)
+            has_landmark[ids] = True
+
+            # Cumul des poids des feuilles vers la racine
+            for v in reached[np.argsort(-dist[reached], kind='stable')]:
+                parent = precedent[v]
+                if has_landmark[v]:
+                    size[v] = 0.0
+                if parent >= 0:
+                    size[parent] += size[v]
+                    has_landmark[parent] |= has_landmark[v]
+            size[has_landmark] = 0.0
+
+            children = {}
+            for v in reached:
+                if precedent[v] >= 0:
+                    children.setdefault(int(precedent[v]), []).append(int(v))
+            current = root
+            while children.get(current):
+                best = max(children[current], key=lambda c: size[c])
+                if size[best] <= 0:
+                    break
+                current = best
+            if current in ids:
+                # Arbre sans poids utile (ou graphe trop petit) : repli sur le plus éloigné
+                remaining = [v for v in range(n) if v not in ids]
+                if not remaining:
+                    break
+                current = remaining[int(np.argmax(np.minimum.reduce(dist_from)[remaining]))]
+            ids.append(current)
+            dist_from.append(_tree_search(self.frozen, weights, current)[0])
+            dist_to.append(_tree_search(self.frozen, weights, current, reverse=True)[0])
+        return ids
+
+    def query(self, start, end, cost_func='tmin', stats=None):
+        """
+        Meilleur chemin de start à end par A* avec les bornes des repères.
+
+        Même contrat que best_path (minimisation) : renvoie (chemin, valeur), ou
+        (None, inf) s'il n'y a pas de chemin. stats['settled'] reçoit le nombre
+        de sommets fixés, à comparer avec best_path(..., stats=...).
+        """
+        if not self.is_valid():
+            self.build()
+        coeffs = resolve_metric(cost_func)
+        if coeffs not in self._from:
+            raise ValueError(f'metric {cost_func!r} was not preprocessed (available: {list(self.metrics.values())})')
+        graph = self.frozen
+        if start not in graph.index or end not in graph.index:
+            return None, float('inf')
+        s, t = graph.index[start], graph.index[end]
+        weights = graph.weights(*coeffs)
+        indptr, indices = graph.indptr, graph.indices
+
+        # Seuls les repères qui joignent t (ou que t joint) donnent une borne finie
+        dist_from, dist_to = self._from[coeffs], self._to[coeffs]
+        to_t = dist_to[t]
+        from_t = dist_from[t]
+        use_to = np.isfinite(to_t)
+        use_from = np.isfinite(from_t)
+        to_t, from_t = to_t[use_to], from_t[use_from]
+        potentials = {}
+
+        def potential(v):
+            p = potentials.get(v)
+            if p is None:
+                p = 0.0
+                if to_t.size:
+                    p = max(p, float(np.max(dist_to[v][use_to] - to_t)))
+                if from_t.size:
+                    p = max(p, float(np.max(from_t - dist_from[v][use_from])))
+                potentials[v] = p
+            return p
+
+        distances = {s: 0}
+        precedent = {s: -1}
+        settled = set()
+        heap = [(potential(s), s)]
+        while heap:
+            _, u = heapq.heappop(heap)
+            if u in settled:
+                continue
+            settled.add(u)
+            if u == t:
+                break
+            d = distances[u]
+            lo, hi = indptr[u], indptr[u + 1]
+            for v, cost in zip(indices[lo:hi].tolist(), weights[lo:hi].tolist()):
+                new_distance = d + cost
+                if new_distance < distances.get(v, float('inf')):
+                    p = potential(v)
+                    if p == float('inf'):
+                        continue  # v ne peut pas atteindre t
+                    distances[v] = new_distance
+                    precedent[v] = u
+                    heapq.heappush(heap, (new_distance + p, v))
+
+        if stats is not None:
+            stats['settled'] = len(settled)
+        if t not in settled:
+            return None, float('inf')
+        path = []
+        current = t
+        while current != -1:
+            path.append(graph.labels[current])
+            current = precedent[current]
+        path.reverse()
+        return path, distances[t]
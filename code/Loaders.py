@@ -0,0 +1,513 @@
+import csv
+import io
+import json
+from itertools import islice, repeat
+import numpy as np
+
+try:
+    import pandas as _pd  # optional dependency
+except Exception:
+    _pd = None
+
+# Lecture rapide des fichiers d'arêtes (CSV, liste d'arêtes, JSON) pour FrozenGraph.
+# Les fichiers sont lus par blocs de CHUNK_ROWS lignes : chaque bloc devient des
+# colonnes NumPy (étiquettes, tmin, tmax), les étiquettes sont converties en
+# identifiants entiers bloc par bloc (LabelTable), et seuls ces tableaux typés
+# restent en mémoire jusqu'à la construction du CSR (FrozenGraph.from_arrays).
+# Les lignes mal formées sont traitées comme par les chargeurs de SimpleGraph.
+
+CHUNK_ROWS = 1 << 20
+
+
+class LabelTable:
+    """Table étiquette <-> identifiant, dans l'ordre de première apparition."""
+    def __init__(self):
+        self.index = {}
+        self.labels = []
+
+    def ids(self, values):
+        """Identifiants d'un tableau d'étiquettes ; les nouvelles sont ajoutées à la table."""
+        values = np.asarray(values)
+        if not len(values):
+            return np.zeros(0, dtype=np.int64)
+        if _pd is not None:
+            # Hachage en C ; les étiquettes distinctes sortent dans leur ordre d'apparition
+            codes, uniques = _pd.factorize(values, use_na_sentinel=False)
+            # factorize confond None et NaN : ces étiquettes passent par le chemin NumPy
+            if not _pd.isna(uniques).any():
+                return self._map(uniques.tolist())[codes]
+        try:
+            uniques, first, inverse = np.unique(values, return_index=True, return_inverse=True)
+        except TypeError:
+            # Étiquettes de types mélangés (JSON) : pas d'ordre total
+            uniques = list(dict.fromkeys(values.tolist()))
+            lookup = dict(zip(uniques, self._map(uniques).tolist()))
+            return np.array(list(map(lookup.__getitem__, values.tolist())), dtype=np.int64)
+        order = np.argsort(first, kind='stable')
+        mapped = np.empty(len(uniques), dtype=np.int64)
+        mapped[order] = self._map(uniques[order].tolist())
+        return mapped[inverse.reshape(-1)]
+
+    def _map(self, uniques):
+        # Étiquettes distinctes, dans leur ordre d'apparition : seules les nouvelles
+        # passent par une boucle Python
+        index, labels = self.index, self.labels
+        ids = np.array(list(map(index.get, uniques, repeat(-1, len(uniques)))), dtype=np.int64)
+        new = np.flatnonzero(ids < 0)
+        if len(new):
+            ids[new] = np.arange(len(labels), len(labels) + len(new))
+            added = [uniques[k] for k in new.tolist()]
+            index.update(zip(added, ids[new].tolist()))
+            labels.extend(added)
+        return ids
+
+
+def column_array(values):
+    """Colonne en tableau 1-D : tel quel si c'est déjà un tableau NumPy, sinon un
+    tableau d'objets (les tuples restent des éléments, les types Python sont gardés)."""
+    if isinstance(values, np.ndarray) and values.ndim == 1:
+        return values
+    values = list(values)
+    return np.fromiter(values, dtype=object, count=len(values))
+
+
+def interleave(sources, targets):
+    """Étiquettes u0, v0, u1, v1, ... : l'ordre dans lequel add_edge découvre les sommets."""
+    sources, targets = column_array(sources), column_array(targets)
+    if len(sources) != len(targets):
+        raise ValueError('u and v must have the same length')
+    dtype = sources.dtype if sources.dtype == targets.dtype else object
+    out = np.empty(2 * len(sources), dtype=dtype)
+    out[0::2], out[1::2] = sources, targets
+    return out
+
+
+def parse_numbers(tokens):
+    """
+    Convertit un tableau de chaînes en nombres, comme SimpleGraph._safe_number.
+
+    Entiers si aucune valeur n'a de point ni d'exposant, flottants sinon. Une
+    valeur vide ou manquante (None) lève TypeError (add_edge refuse None), une
+    valeur illisible ValueError.
+    """
+    tokens = np.asarray(tokens)
+    if tokens.dtype == object and np.equal(tokens, None).any():
+        raise TypeError('temps_min and temps_max must be comparable numeric values')
+    tokens = np.char.strip(tokens.astype(str))
+    if not len(tokens):
+        return np.zeros(0, dtype=np.int64)
+    if (tokens == '').any():
+        raise TypeError('temps_min and temps_max must be comparable numeric values')
+    try:
+        values = tokens.astype(np.float64)
+    except ValueError:
+        for token in tokens.tolist():
+            try:
+                float(token)
+            except ValueError:
+                raise ValueError(f'Impossible de parser la valeur numérique : {token}') from None
+        raise
+    text = ''.join(tokens.tolist())
+    if '.' not in text and 'e' not in text and 'E' not in text and np.isfinite(values).all():
+        return tokens.astype(np.int64)
+    return values
+
+
+def _numeric_column(values):
+    # Poids JSON : déjà des nombres, on refuse ce que add_edge refuserait
+    for w in values:
+        if w is None or isinstance(w, bool) or not isinstance(w, (int, float)):
+            raise TypeError('temps_min and temps_max must be comparable numeric values')
+    return np.array(values) if values else np.zeros(0, dtype=np.int64)
+
+
+def _assign(base, select, read):
+    # Copie de base avec, aux lignes select, les nombres read(select)
+    if not select.any():
+        return base
+    values = read(select)
+    out = base.astype(np.result_type(base.dtype, values.dtype))
+    out[select] = values
+    return out
+
+
+def _text_column(text):
+    # Colonne de texte : (présence, lecture) ; les valeurs ne sont lues que là où elles servent.
+    # Seule une cellule vide est absente : None (ligne trop courte) est lu, donc refusé
+    text = np.asarray(text, dtype=object)
+    return np.not_equal(text, ''), lambda select: parse_numbers(text[select])
+
+
+def _frame_column(frame, name):
+    # Colonne d'un DataFrame lue par pandas : nombres déjà typés, ou texte si une valeur est illisible
+    if name not in frame.columns:
+        return np.zeros(len(frame), dtype=bool), None
+    values = frame[name].to_numpy()
+    if values.dtype.kind in 'iuf':
+        return ~np.isnan(values) if values.dtype.kind == 'f' else np.ones(len(values), dtype=bool), \
+            lambda select: values[select]
+    return _text_column(np.where(frame[name].isna().to_numpy(), '', values))
+
+
+def _weights(n, tmin, weight, tmax, default_weight):
+    # tmin : colonne tmin, sinon weight, sinon default_weight ; tmax : colonne tmax, sinon tmin
+    has_tmin, read_tmin = tmin
+    values = _assign(np.full(n, default_weight[0]), has_tmin, read_tmin)
+    values = _assign(values, ~has_tmin & weight[0], weight[1])
+    return values, _assign(values, tmax[0], tmax[1])
+
+
+def rows_to_columns(rows, default_weight):
+    """
+    Colonnes (u, v, tmin, tmax) d'un bloc de lignes découpées en champs.
+
+    Comme from_csv sans en-tête et from_edgelist_file : 4 champs ou plus =
+    u v tmin tmax, 3 = u v w, 2 = u v avec default_weight, sinon ignorée.
+    """
+    us, vs, lo, hi = [], [], [], []
+    for row in rows:
+        n = len(row)
+        if n >= 4:
+            us.append(row[0]); vs.append(row[1]); lo.append(row[2]); hi.append(row[3])
+        elif n == 3:
+            us.append(row[0]); vs.append(row[1]); lo.append(row[2]); hi.append(row[2])
+        elif n == 2:
+            us.append(row[0]); vs.append(row[1]); lo.append(None); hi.append(None)
+    lo, hi = np.array(lo, dtype=object), np.array(hi, dtype=object)
+    # Un champ présent mais vide est lu (et refusé comme par add_edge), un champ absent prend le défaut
+    weighted = np.not_equal(lo, None)
+    tmin = _assign(np.full(len(us), default_weight[0]), weighted, lambda select: parse_numbers(lo[select]))
+    tmax = _assign(np.full(len(us), default_weight[1]), weighted, lambda select: parse_numbers(hi[select]))
+    return np.array(us, dtype=object), np.array(vs, dtype=object), tmin, tmax
+
+
+def csv_chunks(file_path, u_col='u', v_col='v', tmin_col='tmin', tmax_col='tmax', has_header=True,
+               default_weight=(1, 1), chunk_rows=CHUNK_ROWS):
+    """Blocs (u, v, tmin, tmax) d'un CSV, avec la même sémantique que SimpleGraph.from_csv."""
+    if has_header and _pd is not None:
+        yield from _csv_chunks_pandas(file_path, u_col, v_col, tmin_col, tmax_col, default_weight, chunk_rows)
+        return
+    with open(file_path, newline='') as fh:
+        if not has_header:
+            # Sans en-tête, un champ vide ("a,b,") n'est pas un champ absent : lecture par le module csv
+            reader = csv.reader(fh)
+            while True:
+                rows = list(islice(reader, chunk_rows))
+                if not rows:
+                    return
+                yield rows_to_columns(rows, default_weight)
+        reader = csv.DictReader(fh)
+        fields = reader.fieldnames or []
+        if not {u_col, v_col}.issubset(fields):
+            raise ValueError(f'CSV doit contenir les colonnes {u_col} et {v_col}')
+        while True:
+            rows = list(islice(reader, chunk_rows))
+            if not rows:
+                return
+            yield _dict_columns(rows, fields, u_col, v_col, tmin_col, tmax_col, default_weight)
+
+
+def _dict_columns(rows, fields, u_col, v_col, tmin_col, tmax_col, default_weight):
+    # Colonnes d'un bloc de lignes de csv.DictReader : les champs manquants d'une ligne
+    # trop courte valent None et sont refusés s'ils sont lus, les champs en trop ignorés
+    def column(name):
+        if name not in fields:
+            return np.zeros(len(rows), dtype=bool), None
+        return _text_column([row[name] for row in rows])
+
+    return (np.array([row[u_col] for row in rows], dtype=object),
+            np.array([row[v_col] for row in rows], dtype=object)) + \
+        _weights(len(rows), column(tmin_col), column('weight'), column(tmax_col), default_weight)
+
+
+def _csv_chunks_pandas(file_path, u_col, v_col, tmin_col, tmax_col, default_weight, chunk_rows):
+    # Analyse en C par pandas : étiquettes en texte, poids directement en nombres.
+    # pandas complète une ligne trop courte par des cellules vides ou NaN : un bloc où
+    # une cellule utile est vide ou manquante est donc relu par csv.DictReader, qui
+    # distingue les deux
+    with open(file_path, newline='') as fh:
+        fields = next(csv.reader(fh), [])
+        if not {u_col, v_col}.issubset(fields):
+            raise ValueError(f'CSV doit contenir les colonnes {u_col} et {v_col}')
+        # Position de chaque colonne utile (la dernière en cas de doublon, comme DictReader)
+        names = {len(fields) - 1 - fields[::-1].index(name): name
+                 for name in (u_col, v_col, tmin_col, 'weight', tmax_col) if name in fields}
+        while True:
+            text = ''.join(islice(fh, chunk_rows))
+            # Ne pas couper un champ entre guillemets qui contient un saut de ligne
+            while text.count('"') % 2:
+                line = fh.readline()
+                if not line:
+                    break
+                text += line
+            if not text:
+                return
+            # index_col=False : les champs en trop sont ignorés au lieu de décaler les colonnes
+            try:
+                frame = _pd.read_csv(io.StringIO(text), header=None, names=range(len(fields)), usecols=list(names),
+                                     index_col=False, na_filter=False, skip_blank_lines=False,
+                                     dtype={k: object for k, name in names.items() if name in (u_col, v_col)})
+                frame.columns = [names[k] for k in frame.columns]
+            except _pd.errors.ParserError:
+                # Aucune ligne du bloc n'a tous les champs de l'en-tête
+                frame = None
+            if frame is None or frame.isna().to_numpy().any() or \
+                    any(frame[name].dtype.kind not in 'iuf' and (frame[name].to_numpy(dtype=object) == '').any()
+                        for name in frame.columns):
+                rows = list(csv.DictReader(io.StringIO(text), fieldnames=fields))
+                yield _dict_columns(rows, fields, u_col, v_col, tmin_col, tmax_col, default_weight)
+                continue
+            yield (frame[u_col].to_numpy(dtype=object), frame[v_col].to_numpy(dtype=object)) + \
+                _weights(len(frame), _frame_column(frame, tmin_col), _frame_column(frame, 'weight'),
+                         _frame_column(frame, tmax_col), default_weight)
+
+
+def edgelist_chunks(file_path, sep=None, default_weight=(1, 1), chunk_rows=CHUNK_ROWS):
+    """Blocs (u, v, tmin, tmax) d'un fichier d'arêtes, comme SimpleGraph.from_edgelist_file."""
+    if sep is None and _pd is not None:
+        yield from _edgelist_chunks_pandas(file_path, default_weight, chunk_rows)
+        return
+    with open(file_path) as fh:
+        while True:
+            lines = list(islice(fh, chunk_rows))
+            if not lines:
+                return
+            rows = []
+            for line in lines:
+                line = line.strip()
+                # Ignorer commentaires et lignes vides
+                if not line or line.startswith('#'):
+                    continue
+                rows.append(line.split() if sep is None else line.split(sep))
+            yield rows_to_columns(rows, default_weight)
+
+
+def _edgelist_chunks_pandas(file_path, default_weight, chunk_rows):
+    # Séparateur blanc : pas de champ vide possible, un champ manquant est donc absent.
+    # Une ligne de commentaire est une ligne dont le premier champ commence par '#'.
+    with open(file_path) as fh:
+        while True:
+            text = ''.join(islice(fh, chunk_rows))
+            if not text:
+                return
+            frame = _read_fields(text)
+            if frame is None:
+                continue
+            us, vs = frame['u'].to_numpy(dtype=object), frame['v'].to_numpy(dtype=object)
+            keep = ~np.char.startswith(us.astype(str), '#') & frame['v'].notna().to_numpy() & \
+                np.not_equal(vs, '')
+            if not keep.all():
+                frame, us, vs = frame[keep], us[keep], vs[keep]
+            # 3 champs : tmin = tmax = w ; 2 champs : default_weight
+            has_tmin, read_tmin = _frame_column(frame, 'tmin')
+            has_tmax, read_tmax = _frame_column(frame, 'tmax')
+            tmin = _assign(np.full(len(frame), default_weight[0]), has_tmin, read_tmin)
+            tmax = _assign(np.full(len(frame), default_weight[1]), has_tmin, read_tmin)
+            yield us, vs, tmin, _assign(tmax, has_tmax, read_tmax)
+
+
+def _read_fields(text):
+    # Les 4 premiers champs de chaque ligne (None si le bloc est vide) ; usecols
+    # ignore les champs en trop mais refuse un bloc dont aucune ligne n'en a 4
+    # (na_filter=False : un champ absent reste '' et une colonne d'entiers ne devient pas
+    # flottante ; QUOTE_NONE : un guillemet fait partie de l'étiquette, comme pour split)
+    names = ['u', 'v', 'tmin', 'tmax']
+    options = dict(header=None, sep=r'\s+', names=names, dtype={'u': object, 'v': object}, na_filter=False,
+                   quoting=csv.QUOTE_NONE)
+    try:
+        try:
+            return _pd.read_csv(io.StringIO(text), usecols=names, **options)
+        except _pd.errors.ParserError:
+            return _pd.read_csv(io.StringIO(text), **options)
+    except _pd.errors.EmptyDataError:
+        return None
+
+
+def json_chunks(file_path, chunk_rows=CHUNK_ROWS, block_size=1 << 20):
+    """
+    Blocs (u, v, tmin, tmax) d'un fichier JSON, lu en flux.
+
+    Comme SimpleGraph.from_json : liste d'arêtes ([u, v], [u, v, w] ou
+    [u, v, tmin, tmax]) ou dictionnaire d'adjacence (u -> {v: w ou [tmin, tmax]}).
+    Chaque élément de premier niveau est décodé seul (JSONDecoder.raw_decode),
+    sans jamais charger tout le document.
+    """
+    us, vs, lo, hi = [], [], [], []
+
+    def flush():
+        chunk = (np.array(us, dtype=object), np.array(vs, dtype=object), _numeric_column(lo), _numeric_column(hi))
+        us.clear(); vs.clear(); lo.clear(); hi.clear()
+        return chunk
+
+    elements = _json_elements(file_path, block_size)
+    kind = next(elements)
+    for element in elements:
+        if kind == 'list':
+            if not isinstance(element, (list, tuple)):
+                continue
+            if len(element) >= 4:
+                u, v, tmin, tmax = element[:4]
+            elif len(element) == 3:
+                u, v, tmin = element
+                tmax = tmin
+            elif len(element) == 2:
+                u, v = element
+                tmin, tmax = 1, 1
+            else:
+                continue
+            us.append(u); vs.append(v); lo.append(tmin); hi.append(tmax)
+        else:
+            u, nbrs = element
+            for v, w in nbrs.items():
+                if isinstance(w, (tuple, list)) and len(w) >= 2:
+                    tmin, tmax = w[0], w[1]
+                else:
+                    tmin = tmax = w
+                us.append(u); vs.append(v); lo.append(tmin); hi.append(tmax)
+        if len(us) >= chunk_rows:
+            yield flush()
+    if us:
+        yield flush()
+
+
+def _json_elements(file_path, block_size):
+    # Premier élément produit : 'list' ou 'dict' ; ensuite les éléments de la
+    # liste, ou les paires (clé, valeur) du dictionnaire, un par un.
+    decoder = json.JSONDecoder()
+    with open(file_path) as fh:
+        buffer, pos = fh.read(block_size), 0
+
+        def skip(chars):
+            # Avance après les blancs et les séparateurs `chars`, en relisant si besoin
+            nonlocal buffer, pos
+            while True:
+                while pos < len(buffer) and (buffer[pos].isspace() or buffer[pos] in chars):
+                    pos += 1
+                if pos < len(buffer):
+                    return buffer[pos]
+                more = fh.read(block_size)
+                if not more:
+                    return ''
+                buffer, pos = more, 0
+
+        def value():
+            # Décode une valeur complète, en lisant des blocs tant qu'elle est coupée
+            nonlocal buffer, pos
+            skip('')
+            while True:
+                try:
+                    obj, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    more = fh.read(block_size)
+                    if not more:
+                        raise
+                    buffer, pos = buffer[pos:] + more, 0
+                    continue
+                if end == len(buffer):
+                    # Un nombre en fin de bloc peut être tronqué : on relit pour être sûr
+                    more = fh.read(block_size)
+                    if more:
+                        buffer, pos = buffer[pos:] + more, 0
+                        continue
+                pos = end
+                return obj
+
+        first = skip('')
+        if first == '[':
+            pos += 1
+            yield 'list'
+            while skip(',') not in (']', ''):
+                yield value()
+        elif first == '{':
+            pos += 1
+            yield 'dict'
+            while skip(',') not in ('}', ''):
+                key = value()
+                if skip('') != ':':
+                    raise json.JSONDecodeError("Expecting ':' delimiter", buffer, pos)
+                pos += 1
+                yield key, value()
+        else:
+            raise ValueError('Format JSON non supporté : attendu dict ou list')
+
+
+def test_malformed_files():
+    """Chargeurs par blocs contre ceux de SimpleGraph sur des fichiers mal formés, avec et sans pandas"""
+    import os
+    import tempfile
+    import Loaders
+    from GraphStruct import SimpleGraph, FrozenGraph
+    csv_files = [
+        'u,v,tmin,tmax\na,b,1,2,9\nc,d,3,4\n',            # champ en trop sur la première ligne
+        'u,v,tmin,tmax\nc,d,3,4\na,b,1,2,9\ne,f,5,6,7,8\n',
+        'u,v,tmin,tmax\na,b,1,2\nc,d,1\n',                # ligne trop courte : tmax manquant
+        'u,v,tmin,tmax\na,b,1,2\nc\n',
+        'u,v,weight\na,b,4\nc,d\n',
+        'u,v,tmin,weight\na,b,1\nc,d,,7\n',               # champ manquant jamais lu
+        'u,v,tmin,tmax\na,b,,\nc,d,1,\ne,f,2,3\n',        # cellules vides : poids par défaut
+        'u,v,tmin,tmax,name\na,b,1,2\nc,d,3,4,x\n',
+        'u,v,tmin,tmax\na,b,1,2\n\n\r\nc,d,3,4\n',        # lignes vides ignorées
+        'u,v,tmin,tmax\na,b,1,2\n \nc,d,3,4\n',           # ligne blanche : trop courte
+        'u,v,tmin,tmax\n"a\nb",c,1,2\nd,e,3.5,4\nf,g,1,x\n',
+        'u,v,tmin,tmin,tmax\na,b,9,1,2\n',                # colonne en double : la dernière compte
+        'tmin,tmax,u,v\n1,2,a,b\n3,4,c\n',
+    ]
+    edgelist_files = [
+        'a b 1 2\nc d\n',                                 # 2 champs : poids entiers par défaut
+        'a b 1\nc d\ne f 2 3\n',
+        'a "b 1 2\nc d 3\n"e f"\n',                        # guillemets dans les étiquettes
+        '# commentaire "\na b 1 2 9 9\n\n   \nc\nd e 15 25\n',
+        'a b 1.5 2.5\nc d 0.5 3.25\n',
+        'a\tb\t4\t5\n  c   d  6  \n',
+        'a b x\n',
+        'c\nd\n',                                         # aucune ligne utilisable
+    ]
+    json_files = [
+        '[["a", "b"], ["b", "c", 2], ["c", "d", 1, 3, 9], ["e"], "f", [1, [2, 3], 4]]',
+        '{"a": {"b": 1, "c": [2, 3]}, "b": {"c": [4, 5, 6], "d": 7}}',
+        '{"a": {"b": 1.5, "c": [0.5, 3.0]}}',
+        '[["a", "b", null]]',
+        '[["a", "b", "x", 2]]',
+        '{"a": {"b": [1, null]}}',
+        '[]',
+    ]
+
+    # Un FrozenGraph range tmin et tmax dans deux tableaux numériques : les fichiers
+    # ci-dessus ne mélangent pas entiers et flottants dans une colonne (1 deviendrait
+    # 1.0), et des poids JSON booléens ou en chaînes, que add_edge compare sans
+    # erreur, y sont refusés
+
+    def load(loader, path, **options):
+        try:
+            g = loader(path, **options)
+        except (TypeError, ValueError):
+            # Fichier refusé (valeur vide ou illisible : l'ordre des deux erreurs peut différer)
+            return 'refusé'
+        g = g if isinstance(g, SimpleGraph) else g.thaw()
+        return sorted(map(repr, g.edges()))
+
+    pandas = Loaders._pd
+    fd, path = tempfile.mkstemp()
+    os.close(fd)
+    try:
+        for texts, reference, loader, options in (
+                (csv_files, SimpleGraph.from_csv, FrozenGraph.from_csv, {}),
+                (edgelist_files, SimpleGraph.from_edgelist_file, FrozenGraph.from_edgelist_file, {}),
+                (edgelist_files, SimpleGraph.from_edgelist_file, FrozenGraph.from_edgelist_file, {'sep': ' '}),
+                (json_files, SimpleGraph.from_json, FrozenGraph.from_json, {})):
+            for text in texts:
+                with open(path, 'w', newline='') as fh:
+                    fh.write(text)
+                expected = load(reference, path, **options)
+                for Loaders._pd in (pandas, None):
+                    for chunk_rows in (1, 2, CHUNK_ROWS):
+                        got = load(loader, path, chunk_rows=chunk_rows, **options)
+                        assert got == expected, \
+                            f"{text!r} (pandas={Loaders._pd is not None}, chunk_rows={chunk_rows}): {got} != {expected}"
+    finally:
+        Loaders._pd = pandas
+        os.remove(path)
+    print("✓ Test passed: chunked loaders match SimpleGraph's on malformed files")
+
+if __name__ == '__main__':
+    test_malformed_files()
@@ -0,0 +1,533 @@
+import heapq
+import time
+import numpy as np
+from GraphStruct import FrozenGraph, linear_cost
+from Abstract import resolve_metric
+
+# Planification personnalisable (CRP) : partition multiniveau + surcouche.
+#
+# 1. Partition (topologie seule, une fois) : bissections récursives qui coupent
+#    chaque partie là où le moins d'arcs la traversent. Les cellules du niveau l
+#    sont les plus grandes parties de l'arbre de bissection d'au plus
+#    cell_sizes[l] sommets : elles s'emboîtent d'un niveau à l'autre. Un arc entre
+#    deux cellules d'un niveau est un arc de coupe de ce niveau.
+# 2. Personnalisation (à chaque métrique ou mise à jour des poids) : pour chaque
+#    cellule, matrice dense des distances de ses entrées vers ses sorties en
+#    restant dans la cellule (une "clique" de bord). On remonte l'arbre de
+#    bissection : Floyd-Warshall sur les feuilles, puis chaque partie combine les
+#    matrices de bord de ses deux moitiés avec les arcs qui les relient.
+# 3. Requête : Dijkstra qui utilise les arcs réels dans les cellules de niveau 0
+#    de la source et de la destination, et ailleurs les cliques du plus haut
+#    niveau qui ne contient ni la source ni la destination (une ligne de matrice
+#    relâchée d'un coup).
+
+# Écart toléré à l'équilibre d'une bissection (fraction de la taille visée)
+IMBALANCE = 0.1
+
+
+def _gather(indptr, rows):
+    # Positions CSR de tous les arcs des sommets rows, ligne après ligne
+    starts = indptr[rows]
+    counts = indptr[rows + 1] - starts
+    offsets = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+    return np.arange(offsets.size, dtype=np.int64) + offsets, counts
+
+
+def _bfs(indptr, neighbors, source):
+    # Distances en nombre d'arcs depuis source (parcours par fronts). Les sommets
+    # non atteints sont repris ensemble un cran plus loin, ce qui sépare les composantes.
+    k = len(indptr) - 1
+    dist = np.full(k, -1, dtype=np.int64)
+    last = np.empty(k, dtype=np.int64)
+    frontier = np.array([source], dtype=np.int64)
+    depth, reached = 0, 0
+    while True:
+        dist[frontier] = depth
+        reached += frontier.size
+        positions, _ = _gather(indptr, frontier)
+        frontier = neighbors[positions]
+        frontier = frontier[dist[frontier] < 0]
+        # Sans doublons : on garde la dernière occurrence de chaque sommet
+        steps = np.arange(frontier.size)
+        last[frontier] = steps
+        frontier = frontier[last[frontier] == steps]
+        depth += 1
+        if not frontier.size:
+            if reached == k:
+                return dist
+            frontier = np.flatnonzero(dist < 0)
+            depth += 1
+
+
+class Overlay:
+    """
+    Partition multiniveau d'un graphe, indépendante des poids.
+
+    cell_sizes donne le nombre maximal de sommets d'une cellule à chaque niveau
+    (croissant). customize(...) produit ensuite une OverlayMetric interrogeable,
+    autant de fois que nécessaire sans refaire la partition.
+    """
+    def __init__(self, graph, cell_sizes=(64, 1024)):
+        started = time.perf_counter()
+        self.graph = graph
+        self.frozen = graph if isinstance(graph, FrozenGraph) else graph.freeze()
+        self.cell_sizes = tuple(cell_sizes)
+        if not self.cell_sizes or any(a >= b for a, b in zip(self.cell_sizes, self.cell_sizes[1:])) \
+                or self.cell_sizes[0] < 1:
+            raise ValueError('cell_sizes must be positive and strictly increasing')
+        frozen = self.frozen
+        n = frozen.num_nodes()
+        self._sources = frozen.edge_sources()
+        targets = frozen.indices
+
+        # Voisinage non orienté, sans boucles ni doublons (pour couper et trouver les bords)
+        loop = self._sources == targets
+        u, v = self._sources[~loop].astype(np.int64), targets[~loop].astype(np.int64)
+        width = max(n, 1)
+        pairs = np.unique(np.concatenate([u * width + v, v * width + u]))
+        self._adj_ptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(pairs // width, minlength=n), out=self._adj_ptr[1:])
+        self._adj = pairs % width
+
+        self._partition(n)
+
+        # cells[l][v] : cellule de v au niveau l ; _cell_nodes[l][c] : partie de l'arbre
+        self.cells = []
+        self._cell_nodes = []
+        for size in self.cell_sizes:
+            cell = np.empty(n, dtype=np.int64)
+            nodes = [p for p, (lo, hi) in enumerate(self._ranges)
+                     if hi - lo <= size and (self._parent[p] < 0 or self._size(self._parent[p]) > size)]
+            for c, p in enumerate(nodes):
+                lo, hi = self._ranges[p]
+                cell[self._order[lo:hi]] = c
+            self.cells.append(cell)
+            self._cell_nodes.append(nodes)
+        self._cell_lists = [cell.tolist() for cell in self.cells]
+
+        # Arcs de coupe par niveau : cut_out[l][u] = [(v, position CSR), ...] pour les
+        # arcs qui quittent la cellule de u au niveau l ; entrées et sorties (triées) de
+        # chaque cellule, et rows[l][v] = ligne de v dans la clique de sa cellule (-1 sinon).
+        self.cut_out = []
+        self.entries = []
+        self.exits = []
+        self._rows = []
+        for cell in self.cells:
+            cut = np.flatnonzero(cell[self._sources] != cell[targets])
+            cut_out = {}
+            for pos, u, v in zip(cut.tolist(), self._sources[cut].tolist(), targets[cut].tolist()):
+                cut_out.setdefault(u, []).append((v, pos))
+            self.cut_out.append(cut_out)
+            n_cells = int(cell.max()) + 1 if n else 0
+            entries = self._by_cell(np.unique(targets[cut]), cell, n_cells)
+            self.entries.append(entries)
+            self.exits.append(self._by_cell(np.unique(self._sources[cut]), cell, n_cells))
+            rows = np.full(n, -1, dtype=np.int64)
+            for group in entries:
+                rows[group] = np.arange(group.size)
+            self._rows.append(rows.tolist())
+
+        self._prepare_customization()
+        self.partition_time = time.perf_counter() - started
+
+    @staticmethod
+    def _by_cell(vertices, cell, n_cells):
+        # Découpe des sommets triés en un tableau (trié) par cellule
+        owner = cell[vertices]
+        order = np.argsort(owner, kind='stable')
+        bounds = np.searchsorted(owner[order], np.arange(n_cells + 1))
+        return [vertices[order[bounds[c]:bounds[c + 1]]] for c in range(n_cells)]
+
+    def _size(self, p):
+        lo, hi = self._ranges[p]
+        return hi - lo
+
+    def _partition(self, n):
+        # Arbre de bissection : la partie p regroupe les sommets _order[lo:hi] pour
+        # (lo, hi) = _ranges[p] ; ses deux moitiés sont _children[p] (None pour une feuille).
+        # Les parties sont créées parents d'abord.
+        self._order = np.arange(n, dtype=np.int64)
+        self._ranges = [(0, n)]
+        self._parent = [-1]
+        self._children = [None]
+        slot = np.full(n, -1, dtype=np.int64)
+        stack = [0]
+        while stack:
+            p = stack.pop()
+            lo, hi = self._ranges[p]
+            k = hi - lo
+            if k <= self.cell_sizes[0]:
+                continue
+            # Les deux moitiés doivent tenir dans des cellules du niveau en dessous
+            below = max(size for size in self.cell_sizes if size < k)
+            first, second = self._bisect(self._order[lo:hi], slot, below)
+            self._order[lo:hi] = np.concatenate([first, second])
+            mid = lo + first.size
+            self._children[p] = (len(self._ranges), len(self._ranges) + 1)
+            for child in ((lo, mid), (mid, hi)):
+                self._ranges.append(child)
+                self._parent.append(p)
+                self._children.append(None)
+                stack.append(len(self._ranges) - 1)
+        self._rank = np.empty(n, dtype=np.int64)
+        self._rank[self._order] = np.arange(n)
+
+    def _bisect(self, part, slot, below):
+        """
+        Coupe part en deux : les sommets sont ordonnés selon les écarts de distance
+        (en nombre d'arcs) à trois sommets éloignés, et on garde l'ordre et le point
+        de coupe équilibré que traversent le moins d'arêtes.
+        """
+        k = part.size
+        slot[part] = np.arange(k)
+        positions, counts = _gather(self._adj_ptr, part)
+        neighbors = slot[self._adj[positions]]
+        slot[part] = -1
+        sources = np.repeat(np.arange(k), counts)
+        inside = neighbors >= 0
+        sources, neighbors = sources[inside], neighbors[inside]
+        indptr = np.zeros(k + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=k), out=indptr[1:])
+
+        # Trois repères éloignés ; sur une grille, coins opposés puis un troisième coin
+        d_a = _bfs(indptr, neighbors, int(np.argmax(_bfs(indptr, neighbors, 0))))
+        d_b = _bfs(indptr, neighbors, int(np.argmax(d_a)))
+        d_c = _bfs(indptr, neighbors, int(np.argmax(np.minimum(d_a, d_b))))
+        keys = ((d_a - d_b, d_c - d_a), (d_a - d_c, d_b - d_c), (d_b - d_c, d_a - d_c))
+
+        # Taille de la première moitié : proche de l'équilibre, et chaque moitié
+        # remplit au mieux des cellules de `below` sommets
+        m = -(-k // below)
+        m1 = m // 2
+        target = k * m1 / m
+        lo = max(1, k - (m - m1) * below, int(np.floor(target * (1 - IMBALANCE))))
+        hi = max(lo, min(k - 1, m1 * below, int(np.ceil(target * (1 + IMBALANCE)))))
+        sizes = np.arange(lo, hi + 1)
+
+        best = None
+        rank = np.empty(k, dtype=np.int64)
+        for primary, secondary in keys:
+            order = np.lexsort((secondary, primary))
+            rank[order] = np.arange(k)
+            # Arêtes coupées par chaque point de coupe j (les j premiers d'un côté)
+            first = np.minimum(rank[sources], rank[neighbors]) + 1
+            last = np.maximum(rank[sources], rank[neighbors]) + 1
+            cut = np.cumsum(np.bincount(first, minlength=k + 2) - np.bincount(last, minlength=k + 2))
+            # À coupe égale, le point le plus équilibré
+            score = cut[sizes] + np.abs(sizes - target) / (k + 1)
+            j = int(np.argmin(score))
+            if best is None or score[j] < best[0]:
+                best = (score[j], order[:sizes[j]].copy())
+        mask = np.zeros(k, dtype=bool)
+        mask[best[1]] = True
+        return part[mask], part[~mask]
+
+    def _prepare_customization(self):
+        # Pour chaque partie de l'arbre jusqu'aux cellules du plus haut niveau : ses
+        # sommets de bord (reliés à l'extérieur), triés, et de quoi calculer la matrice
+        # des distances entre eux sans relire la topologie.
+        #   feuille : ('leaf', taille, arcs internes (source, cible, position), bords)
+        #   sinon   : ('merge', taille du bord de la 1re moitié, taille totale,
+        #              arcs entre moitiés (source, cible, position), séparateur, bords)
+        # les indices locaux sont des rangs dans la partie (feuille) ou dans la
+        # concaténation des bords des deux moitiés.
+        frozen = self.frozen
+        n = frozen.num_nodes()
+        rank = self._rank
+        adj_rank = rank[self._adj] if self._adj.size else self._adj
+        low = np.full(n, n, dtype=np.int64)
+        high = np.full(n, -1, dtype=np.int64)
+        has_neighbors = np.diff(self._adj_ptr) > 0
+        if self._adj.size:
+            low[has_neighbors] = np.minimum.reduceat(adj_rank, self._adj_ptr[:-1][has_neighbors])
+            high[has_neighbors] = np.maximum.reduceat(adj_rank, self._adj_ptr[:-1][has_neighbors])
+
+        top = self.cell_sizes[-1]
+        self._boundary = {}
+        self._specs = {}
+        slot = np.full(n, -1, dtype=np.int64)
+        for p in reversed(range(len(self._ranges))):
+            lo, hi = self._ranges[p]
+            if hi - lo > top:
+                continue
+            vertices = self._order[lo:hi]
+            boundary = np.sort(vertices[(low[vertices] < lo) | (high[vertices] >= hi)])
+            self._boundary[p] = boundary
+            if self._children[p] is None:
+                positions, counts = _gather(frozen.indptr, vertices)
+                heads = rank[frozen.indices[positions]]
+                inside = (heads >= lo) & (heads < hi)
+                tails = np.repeat(np.arange(hi - lo), counts)[inside]
+                self._specs[p] = ('leaf', hi - lo, tails, heads[inside] - lo, positions[inside],
+                                  rank[boundary] - lo)
+                continue
+            first, second = self._children[p]
+            mid = self._ranges[second][0]
+            union = np.concatenate([self._boundary[first], self._boundary[second]])
+            slot[union] = np.arange(union.size)
+            positions, counts = _gather(frozen.indptr, union)
+            heads = frozen.indices[positions]
+            tails = np.repeat(union, counts)
+            crossing = (slot[heads] >= 0) & ((rank[tails] < mid) != (rank[heads] < mid))
+            tails, heads, positions = slot[tails[crossing]], slot[heads[crossing]], positions[crossing]
+            separator = np.unique(np.concatenate([tails, heads]))
+            self._specs[p] = ('merge', self._boundary[first].size, union.size, tails, heads, positions,
+                              separator, slot[boundary])
+            slot[union] = -1
+
+        # Lignes et colonnes de chaque clique dans la matrice de bord de sa partie
+        self._clique_slices = []
+        for l, nodes in enumerate(self._cell_nodes):
+            slices = []
+            for c, p in enumerate(nodes):
+                boundary = self._boundary[p]
+                slices.append((np.searchsorted(boundary, self.entries[l][c]),
+                               np.searchsorted(boundary, self.exits[l][c])))
+            self._clique_slices.append(slices)
+
+    def customize(self, cost_func='tmin', graph=None):
+        """
+        Personnalise la surcouche pour une métrique.
+
+        graph : graphe de même topologie dont on lit les intervalles (par exemple
+        un graphe convergé par make_converge, ou le même réseau après une mise à
+        jour du trafic) ; par défaut celui qui a servi à la partition.
+        """
+        coeffs = resolve_metric(cost_func)
+        frozen = self.frozen
+        if graph is None or graph is self.graph or graph is frozen:
+            tmin, tmax = frozen.tmin, frozen.tmax
+        else:
+            tmin, tmax = self._intervals_from(graph)
+        if coeffs is not None:
+            weights = linear_cost(*coeffs)(tmin, tmax)
+        else:
+            labels = frozen.labels
+            weights = np.array([cost_func(labels[u], labels[v], lo, hi) for u, v, lo, hi in
+                                zip(self._sources.tolist(), frozen.indices.tolist(), tmin.tolist(), tmax.tolist())])
+        return self.customize_weights(weights)
+
+    def _intervals_from(self, graph):
+        # Intervalles (tmin, tmax) de `graph` pour chaque arc de la partition, dans l'ordre CSR
+        frozen = self.frozen
+        if isinstance(graph, FrozenGraph) and graph.labels == frozen.labels \
+                and np.array_equal(graph.indptr, frozen.indptr) and np.array_equal(graph.indices, frozen.indices):
+            return graph.tmin, graph.tmax
+        labels = frozen.labels
+        tmin, tmax = [], []
+        for u, v in zip(self._sources.tolist(), frozen.indices.tolist()):
+            interval = graph.neighbors(labels[u]).get(labels[v]) if isinstance(graph, FrozenGraph) \
+                else graph.adj.get(labels[u], {}).get(labels[v])
+            if interval is None:
+                raise ValueError(f'graph has no edge {labels[u]!r} -> {labels[v]!r}: topology differs from the partition')
+            tmin.append(interval[0])
+            tmax.append(interval[1])
+        return np.array(tmin), np.array(tmax)
+
+    def customize_weights(self, weights):
+        """Personnalise la surcouche pour un tableau de poids (un par arc, ordre CSR)."""
+        weights = np.asarray(weights)
+        if weights.shape != self.frozen.indices.shape:
+            raise ValueError('weights must have one value per edge, in CSR order')
+        return OverlayMetric(self, weights)
+
+    def levels(self, s, t):
+        """Pour chaque sommet, le plus haut niveau où sa cellule ne contient ni s ni t (-1 sinon)."""
+        level = np.full(len(self._rank), -1, dtype=np.int64)
+        for l, cell in enumerate(self.cells):
+            level[(cell != cell[s]) & (cell != cell[t])] = l
+        return level
+
+
+class OverlayMetric:
+    """
+    Surcouche personnalisée pour un tableau de poids ; voir Overlay.customize.
+
+    cliques[l][c] : matrice (entrées x sorties) des distances dans la cellule c
+    du niveau l, dans l'ordre de overlay.entries[l][c] et overlay.exits[l][c]
+    (inf si la sortie n'est pas joignable sans quitter la cellule).
+    """
+    def __init__(self, overlay, weights):
+        started = time.perf_counter()
+        self.overlay = overlay
+        self.weights = weights
+        self._weights = weights.tolist()
+        weights = weights.astype(float)
+
+        # Matrices de bord, des feuilles vers les cellules du plus haut niveau
+        cell_nodes = {p for nodes in overlay._cell_nodes for p in nodes}
+        boundary = {}
+        for p in sorted(overlay._specs, reverse=True):
+            spec = overlay._specs[p]
+            if spec[0] == 'leaf':
+                _, size, tails, heads, positions, keep = spec
+                dist = np.full((size, size), np.inf)
+                np.minimum.at(dist, (tails, heads), weights[positions])
+                np.fill_diagonal(dist, 0)
+                pivots = range(size)
+            else:
+                _, split, size, tails, heads, positions, pivots, keep = spec
+                first, second = overlay._children[p]
+                dist = np.full((size, size), np.inf)
+                dist[:split, :split] = boundary[first]
+                dist[split:, split:] = boundary[second]
+                np.minimum.at(dist, (tails, heads), weights[positions])
+                # Un chemin dans la partie alterne entre les deux moitiés par les arcs
+                # qui les relient : seuls leurs extrémités servent d'intermédiaires
+                for child in (first, second):
+                    if child not in cell_nodes:
+                        del boundary[child]
+            for x in pivots:
+                np.minimum(dist, dist[:, x, None] + dist[x], out=dist)
+            boundary[p] = dist[np.ix_(keep, keep)]
+
+        self.cliques = [[boundary[p][np.ix_(rows, cols)] for p, (rows, cols) in zip(nodes, slices)]
+                        for nodes, slices in zip(overlay._cell_nodes, overlay._clique_slices)]
+        self.customization_time = time.perf_counter() - started
+
+    def _cell_search(self, source, target, cell, c):
+        # Dijkstra sur les arcs réels de source à target, sans sortir de la cellule c ;
+        # renvoie les parents
+        indptr, indices = self.overlay.frozen.csr_lists()
+        weights = self._weights
+        dist, parent = {source: 0}, {source: -1}
+        heap = [(0, source)]
+        done = set()
+        while heap:
+            d, u = heapq.heappop(heap)
+            if u in done:
+                continue
+            done.add(u)
+            if u == target:
+                break
+            for pos in range(indptr[u], indptr[u + 1]):
+                v = indices[pos]
+                if cell[v] != c:
+                    continue
+                nd = d + weights[pos]
+                if nd < dist.get(v, float('inf')):
+                    dist[v] = nd
+                    parent[v] = u
+                    heapq.heappush(heap, (nd, v))
+        return parent
+
+    def query(self, start, end, stats=None):
+        """
+        Meilleur chemin de start à end sur la surcouche.
+
+        Même contrat que best_path (minimisation) : (chemin, valeur) ou (None, inf).
+        stats['settled'] reçoit le nombre de sommets fixés.
+        """
+        overlay = self.overlay
+        frozen = overlay.frozen
+        if start not in frozen.index or end not in frozen.index:
+            return None, float('inf')
+        s, t = frozen.index[start], frozen.index[end]
+        indptr, indices = frozen.csr_lists()
+        weights = self._weights
+        levels = overlay.levels(s, t).tolist()
+        push, pop = heapq.heappush, heapq.heappop
+
+        # parent[v] = u, via[v] = niveau de la clique utilisée (-1 pour un arc réel)
+        dist = np.full(frozen.num_nodes(), np.inf)
+        parent = np.full(frozen.num_nodes(), -1, dtype=np.int64)
+        via = np.full(frozen.num_nodes(), -1, dtype=np.int64)
+        dist[s] = 0
+        heap = [(0.0, s)]
+        settled = 0
+        while heap:
+            d, u = pop(heap)
+            if d > dist[u]:
+                continue
+            settled += 1
+            if u == t:
+                break
+            l = levels[u]
+            if l == -1:
+                for pos in range(indptr[u], indptr[u + 1]):
+                    v = indices[pos]
+                    nd = d + weights[pos]
+                    if nd < dist[v]:
+                        dist[v] = nd
+                        parent[v] = u
+                        via[v] = -1
+                        push(heap, (nd, v))
+                continue
+            row = overlay._rows[l][u]
+            # Atteint par la clique de sa propre cellule : sa ligne n'améliorerait rien
+            # (inégalité triangulaire dans la cellule), seuls ses arcs de coupe comptent
+            if row >= 0 and via[u] != l:
+                # Ligne de la clique : toutes les sorties de la cellule d'un coup
+                c = overlay._cell_lists[l][u]
+                exits = overlay.exits[l][c]
+                candidate = d + self.cliques[l][c][row]
+                better = np.flatnonzero(candidate < dist[exits])
+                if better.size:
+                    improved, candidate = exits[better], candidate[better]
+                    dist[improved] = candidate
+                    parent[improved] = u
+                    via[improved] = l
+                    for nd, v in zip(candidate.tolist(), improved.tolist()):
+                        push(heap, (nd, v))
+            for v, pos in overlay.cut_out[l].get(u, ()):
+                nd = d + weights[pos]
+                if nd < dist[v]:
+                    dist[v] = nd
+                    parent[v] = u
+                    via[v] = -1
+                    push(heap, (nd, v))
+
+        if stats is not None:
+            stats['settled'] = settled
+        if dist[t] == np.inf:
+            return None, float('inf')
+
+        # Déroulement : un arc de clique est remplacé par un plus court chemin dans sa cellule
+        ids = [t]
+        current = t
+        while current != s:
+            u, level = int(parent[current]), int(via[current])
+            if level >= 0:
+                cell = overlay._cell_lists[level]
+                inner = self._cell_search(u, current, cell, cell[u])
+                step = inner[current]
+                while step != u:
+                    ids.append(step)
+                    step = inner[step]
+            ids.append(u)
+            current = u
+        ids.reverse()
+        return [frozen.labels[i] for i in ids], float(dist[t])
+
+
+def test_random_graphs():
+    """Requêtes sur la surcouche contre best_path sur des graphes aléatoires, pour chaque métrique"""
+    import random
+    from GraphStruct import SimpleGraph
+    from Abstract import best_path, METRICS
+    rng = random.Random(3)
+    for trial in range(6):
+        g = SimpleGraph(directed=trial % 2 == 0)
+        n = rng.randint(20, 60)
+        for v in range(n):
+            g.add_node(v)
+        for _ in range(rng.randint(n, 3 * n)):
+            u, v = rng.randrange(n), rng.randrange(n)
+            if u != v:
+                tmin = rng.randint(1, 4)
+                g.add_edge(u, v, tmin, tmin + rng.randint(0, 3))
+        overlay = Overlay(g, cell_sizes=(4, 12))
+        for metric, (a, b) in METRICS.items():
+            overlay_metric = overlay.customize(metric)
+            for _ in range(40):
+                s, t = rng.randrange(n), rng.randrange(n)
+                path, value = overlay_metric.query(s, t)
+                expected = best_path(g, s, t, metric)[1]
+                assert value == expected, f"{metric} {s}->{t}: got {value}, expected {expected}"
+                if path is None:
+                    continue
+                cost = sum(a * g.adj[u][v][0] + b * g.adj[u][v][1] for u, v in zip(path, path[1:]))
+                assert path[0] == s and path[-1] == t and cost == value, f"{metric} {s}->{t}: path {path}"
+    print("✓ Test passed: overlay queries match best_path")
+
+test_random_graphs()
@@ -0,0 +1,129 @@
+import heapq
+from GraphStruct import FrozenGraph
+from Abstract import _tree_search
+
+# Front de Pareto (somme des tmin, somme des tmax) par recherche multi-étiquettes.
+# Une étiquette est un chemin partiel (tmin, tmax) arrivant en un sommet. Les
+# étiquettes sortent du tas par ordre lexicographique de (tmin + borne_min,
+# tmax + borne_max), où les bornes sont les distances exactes vers la
+# destination pour chaque critère (deux arbres inverses). Les étiquettes qui
+# arrivent en v sortent donc par tmin croissant : une nouvelle étiquette en v
+# est dominée dès que son tmax ne bat pas le plus petit tmax déjà fixé en v.
+# Une seule valeur par sommet suffit alors pour tester la dominance.
+
+
+def pareto_paths(graph, start, end, max_labels=None, stats=None):
+    """
+    Routes non dominées en (somme des tmin, somme des tmax) de start à end.
+
+    Renvoie une liste de (chemin, tmin, tmax) par tmin croissant (donc tmax
+    décroissant) : la première est la route optimiste, la dernière la prudente.
+    max_labels borne le nombre d'étiquettes fixées (front éventuellement
+    incomplet au-delà). stats['labels'] reçoit ce nombre.
+    """
+    frozen = graph if isinstance(graph, FrozenGraph) else graph.freeze()
+    if start not in frozen.index or end not in frozen.index:
+        return []
+    s, t = frozen.index[start], frozen.index[end]
+    indptr, indices = frozen.indptr.tolist(), frozen.indices.tolist()
+    tmin, tmax = frozen.tmin.tolist(), frozen.tmax.tolist()
+
+    # Minorants exacts vers t pour chaque critère ; inf = ne mène pas à t
+    low_min = _tree_search(frozen, frozen.tmin, t, reverse=True)[0].tolist()
+    low_max = _tree_search(frozen, frozen.tmax, t, reverse=True)[0].tolist()
+    if low_min[s] == float('inf'):
+        return []
+
+    # Étiquettes en listes parallèles : sommet, parent (indice d'étiquette), coûts
+    label_node, label_parent, label_min, label_max = [s], [-1], [0], [0]
+    best_max = [float('inf')] * len(frozen.labels)
+    heap = [(low_min[s], low_max[s], 0)]
+    front = []
+    settled = 0
+
+    while heap:
+        _, _, label = heapq.heappop(heap)
+        u, cost_max = label_node[label], label_max[label]
+        # Dominée par une étiquette fixée depuis son insertion, ou par une route trouvée
+        if cost_max >= best_max[u] or cost_max + low_max[u] >= best_max[t]:
+            continue
+        best_max[u] = cost_max
+        settled += 1
+        if u == t:
+            front.append(label)
+            continue
+        if max_labels is not None and settled >= max_labels:
+            break
+        cost_min = label_min[label]
+        for pos in range(indptr[u], indptr[u + 1]):
+            v = indices[pos]
+            new_max = cost_max + tmax[pos]
+            if low_min[v] == float('inf') or new_max >= best_max[v] or new_max + low_max[v] >= best_max[t]:
+                continue
+            new_min = cost_min + tmin[pos]
+            label_node.append(v)
+            label_parent.append(label)
+            label_min.append(new_min)
+            label_max.append(new_max)
+            heapq.heappush(heap, (new_min + low_min[v], new_max + low_max[v], len(label_node) - 1))
+
+    if stats is not None:
+        stats['labels'] = settled
+    routes = []
+    for label in front:
+        path = []
+        current = label
+        while current != -1:
+            path.append(frozen.labels[label_node[current]])
+            current = label_parent[current]
+        path.reverse()
+        routes.append((path, label_min[label], label_max[label]))
+    return routes
+
+
+def test_brute_force():
+    """Front de pareto_paths contre le front de tous les chemins sans boucle"""
+    import random
+    from GraphStruct import SimpleGraph
+    rng = random.Random(2)
+    for trial in range(15):
+        g = SimpleGraph(directed=trial % 3 != 0)
+        n = rng.randint(8, 12)
+        for v in range(n):
+            g.add_node(v)
+        # Arcs entre sommets proches : chemins longs de 0 à n - 1, avec des choix à chaque pas
+        for _ in range(rng.randint(3 * n, 4 * n)):
+            u = rng.randrange(n - 1)
+            v = min(n - 1, u + rng.randint(1, 2))
+            if rng.random() < 0.1:
+                u, v = v, u
+            if not g.has_edge(u, v):
+                # Arcs rapides mais incertains ou lents mais sûrs : des compromis sur le front
+                if rng.random() < 0.5:
+                    g.add_edge(u, v, rng.randint(1, 2), rng.randint(6, 10))
+                else:
+                    g.add_edge(u, v, rng.randint(3, 5), rng.randint(5, 6))
+
+        def costs(path):
+            pairs = list(zip(path, path[1:]))
+            return sum(g.adj[u][v][0] for u, v in pairs), sum(g.adj[u][v][1] for u, v in pairs)
+
+        s, t = 0, n - 1
+        points = set()
+        stack = [[s]]
+        while stack:
+            path = stack.pop()
+            if path[-1] == t:
+                points.add(costs(path))
+                continue
+            stack.extend(path + [v] for v in g.adj[path[-1]] if v not in path)
+        front = sorted(p for p in points
+                       if not any(q != p and q[0] <= p[0] and q[1] <= p[1] for q in points))
+
+        routes = pareto_paths(g, s, t)
+        assert [(lo, hi) for _, lo, hi in routes] == front, f"trial {trial}: got {routes}, expected {front}"
+        for path, lo, hi in routes:
+            assert path[0] == s and path[-1] == t and costs(path) == (lo, hi), f"Got {path}"
+    print("✓ Test passed: Pareto front matches brute force")
+
+test_brute_force()
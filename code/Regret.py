@@ -0,0 +1,222 @@
+import heapq
+import time
+from GraphStruct import FrozenGraph
+from Abstract import _tree_search
+from Alternatives import k_best_paths
+
+# Chemin robuste au sens du regret min-max sur des intervalles [tmin, tmax].
+# Le regret d'un chemin P est le pire écart, sur tous les scénarios, entre le
+# temps de P et le meilleur temps possible. Le pire scénario est connu : arcs
+# de P à tmax, tous les autres à tmin. Donc
+#     regret(P) = somme_P tmax - d(start, end | P à tmax, le reste à tmin)
+# soit un seul plus court chemin par évaluation. Ces recherches partagent le
+# même minorant (distances exactes vers end avec les tmin, valables puisque
+# tous les poids sont >= tmin) : des A* qui ne visitent que peu de sommets.
+# Recherche : on énumère les chemins par somme de tmax croissante (k_best_paths)
+# et comme d(... | P) <= D_max (tout à tmax), regret(P) >= somme_P tmax - D_max :
+# dès que ce minorant dépasse le meilleur regret trouvé, la solution est optimale.
+
+
+class RegretEngine:
+    """
+    Évaluations de regret entre start et end, avec leurs temps de calcul.
+
+    regret(path) évalue un chemin ; solve(max_paths) cherche le chemin de regret
+    minimal. Compteurs : evaluations, evaluation_time (secondes au total).
+    """
+    def __init__(self, graph, start, end):
+        frozen = graph if isinstance(graph, FrozenGraph) else graph.freeze()
+        if start not in frozen.index or end not in frozen.index:
+            raise ValueError(f'start {start!r} and end {end!r} must both be in the graph')
+        self.graph = graph
+        self.frozen = frozen
+        self.start, self.end = start, end
+        self._s, self._t = frozen.index[start], frozen.index[end]
+        self._indptr, self._indices = frozen.indptr.tolist(), frozen.indices.tolist()
+        self._tmin, self._tmax = frozen.tmin.tolist(), frozen.tmax.tolist()
+        # Identifiant d'arête de chaque arc : les deux sens d'une arête non orientée
+        # passent à tmax ensemble dans le pire scénario
+        self._edge_id = frozen._canonical_edges()[1].tolist()
+
+        to_t, next_hop = _tree_search(frozen, frozen.tmin, self._t, reverse=True)
+        self._to_t = to_t.tolist()
+        self.d_min = self._to_t[self._s]
+        self.d_max = float(_tree_search(frozen, frozen.tmax, self._t, reverse=True)[0][self._s])
+        # Un chemin optimal pour les tmin : si P ne partage aucune arête avec lui,
+        # le pire scénario de P laisse ce chemin à d_min
+        self._min_edges = set()
+        if self.d_min != float('inf'):
+            u = self._s
+            while u != self._t:
+                v = int(next_hop[u])
+                self._min_edges.add(self._edge_id[self._arc(u, v)])
+                u = v
+        self.evaluations = 0
+        self.evaluation_time = 0.0
+
+    def _arc(self, u, v):
+        # Position CSR de l'arc u -> v
+        lo, hi = self._indptr[u], self._indptr[u + 1]
+        return lo + self._indices[lo:hi].index(v)
+
+    def regret(self, path):
+        """Regret du chemin path (liste d'étiquettes de start à end)."""
+        index = self.frozen.index
+        ids = [index[v] for v in path]
+        if ids[0] != self._s or ids[-1] != self._t:
+            raise ValueError('path must go from start to end')
+        arcs = [self._arc(u, v) for u, v in zip(ids, ids[1:])]
+        return self._regret(arcs)
+
+    def _regret(self, arcs):
+        started = time.perf_counter()
+        edges = {self._edge_id[pos] for pos in arcs}
+        length = sum(self._tmax[pos] for pos in arcs)
+        if edges.isdisjoint(self._min_edges):
+            best = self.d_min
+        else:
+            best = self._worst_case_distance(edges)
+        self.evaluations += 1
+        self.evaluation_time += time.perf_counter() - started
+        return length - best
+
+    def _worst_case_distance(self, edges):
+        # A* de start à end : arcs de `edges` à tmax, les autres à tmin
+        indptr, indices, tmin, tmax = self._indptr, self._indices, self._tmin, self._tmax
+        edge_id, to_t = self._edge_id, self._to_t
+        s, t = self._s, self._t
+        dist = {s: 0}
+        heap = [(to_t[s], s)]
+        done = set()
+        while heap:
+            _, u = heapq.heappop(heap)
+            if u in done:
+                continue
+            if u == t:
+                return dist[u]
+            done.add(u)
+            d = dist[u]
+            for pos in range(indptr[u], indptr[u + 1]):
+                v = indices[pos]
+                if to_t[v] == float('inf'):
+                    continue
+                new_distance = d + (tmax[pos] if edge_id[pos] in edges else tmin[pos])
+                if new_distance < dist.get(v, float('inf')):
+                    dist[v] = new_distance
+                    heapq.heappush(heap, (new_distance + to_t[v], v))
+        return float('inf')
+
+    def solve(self, max_paths=1000, stats=None):
+        """
+        Chemin de regret minimal : (chemin, regret), ou (None, inf) sans chemin.
+
+        Énumère au plus max_paths chemins par somme de tmax croissante, après avoir
+        évalué les heuristiques classiques (tmin, tmax, milieu des intervalles).
+        stats reçoit 'evaluations', 'evaluation_time', 'time_per_evaluation',
+        'paths' (chemins énumérés), 'optimal' (borne atteinte avant max_paths :
+        le regret renvoyé est le minimum), 'lower_bound' (minorant prouvé du
+        regret minimal) et 'gap' (regret renvoyé - lower_bound, 0 si optimal).
+        """
+        if self.d_min == float('inf'):
+            if stats is not None:
+                stats.update(evaluations=0, evaluation_time=0.0, time_per_evaluation=0.0, paths=0,
+                             optimal=True, lower_bound=float('inf'), gap=0.0)
+            return None, float('inf')
+        best_path, best_regret = None, float('inf')
+        for metric in ('tmin', 'tmax', (0.5, 0.5)):
+            path = next(k_best_paths(self.frozen, self.start, self.end, metric))[0]
+            value = self.regret(path)
+            if value < best_regret:
+                best_path, best_regret = path, value
+
+        # Les chemins non énumérés ont une somme de tmax >= length : leur regret
+        # est au moins length - d_max
+        optimal, enumerated = False, 0
+        lower_bound = 0.0
+        for path, length in k_best_paths(self.frozen, self.start, self.end, 'tmax'):
+            if length - self.d_max >= best_regret:
+                optimal = True
+                break
+            if enumerated >= max_paths:
+                lower_bound = max(lower_bound, length - self.d_max)
+                break
+            enumerated += 1
+            value = self.regret(path)
+            if value < best_regret:
+                best_path, best_regret = path, value
+        else:
+            optimal = True
+
+        if stats is not None:
+            stats['evaluations'] = self.evaluations
+            stats['evaluation_time'] = self.evaluation_time
+            stats['time_per_evaluation'] = self.evaluation_time / max(1, self.evaluations)
+            stats['paths'] = enumerated
+            stats['optimal'] = optimal
+            stats['lower_bound'] = best_regret if optimal else lower_bound
+            stats['gap'] = 0.0 if optimal else best_regret - lower_bound
+        return best_path, best_regret
+
+
+def min_max_regret_path(graph, start, end, max_paths=1000, stats=None):
+    """
+    Chemin de regret min-max de start à end : (chemin, regret) ; voir RegretEngine.solve.
+
+    Au-delà de max_paths chemins énumérés, le chemin renvoyé peut ne pas être
+    optimal : stats['optimal'] le dit, et stats['gap'] borne l'écart au regret minimal.
+    """
+    if not graph.has_node(start) or not graph.has_node(end):
+        return None, float('inf')
+    return RegretEngine(graph, start, end).solve(max_paths, stats)
+
+
+def test_brute_force():
+    """Regret min-max contre l'évaluation de tous les chemins sans boucle"""
+    import random
+    from GraphStruct import SimpleGraph
+    from Abstract import best_path
+    rng = random.Random(4)
+    for trial in range(12):
+        g = SimpleGraph(directed=trial % 3 != 0)
+        n = rng.randint(5, 8)
+        for v in range(n):
+            g.add_node(v)
+        for _ in range(rng.randint(2 * n, 3 * n)):
+            u, v = rng.randrange(n), rng.randrange(n)
+            if u != v:
+                tmin = rng.randint(1, 5)
+                g.add_edge(u, v, tmin, tmin + rng.randint(0, 6))
+
+        def regret(path):
+            # Pire scénario par définition : arêtes du chemin à tmax, les autres à tmin
+            on_path = {(u, v) for u, v in zip(path, path[1:])}
+            if not g.directed:
+                on_path |= {(v, u) for u, v in on_path}
+            worst = SimpleGraph(directed=g.directed)
+            for u, v, tmin, tmax in g.edges():
+                w = tmax if (u, v) in on_path else tmin
+                worst.add_edge(u, v, w, w)
+            return sum(g.adj[u][v][1] for u, v in zip(path, path[1:])) - best_path(worst, path[0], path[-1], 'tmin')[1]
+
+        s, t = 0, n - 1
+        paths, stack = [], [[s]]
+        while stack:
+            path = stack.pop()
+            if path[-1] == t:
+                paths.append(path)
+                continue
+            stack.extend(path + [v] for v in g.adj[path[-1]] if v not in path)
+        expected = min((regret(p) for p in paths), default=float('inf'))
+
+        stats = {}
+        path, value = min_max_regret_path(g, s, t, stats=stats)
+        assert value == expected, f"trial {trial}: got {value}, expected {expected}"
+        assert stats['optimal'] and stats['gap'] == 0, f"trial {trial}: {stats}"
+        if path is not None:
+            assert regret(path) == value, f"trial {trial}: {path} has regret {regret(path)}, not {value}"
+            # Sans énumération, le minorant reste valide et l'écart le couvre
+            min_max_regret_path(g, s, t, max_paths=0, stats=stats)
+            assert stats['lower_bound'] <= expected <= stats['lower_bound'] + stats['gap'] + 1e-9, f"{stats}"
+    print("✓ Test passed: min-max regret matches brute force")
+
+test_brute_force()
@@ -0,0 +1,429 @@
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+# Moteurs d'échantillonnage vectorisés utilisés par SimpleGraph.make_converge.
+# Chaque fonction traite toutes les arêtes d'un coup : tmin et tmax sont des
+# tableaux de taille E, et on renvoie un tableau de E moyennes estimées.
+
+# Profils de trafic (fluide, normal, dense) -> paramètres (alpha, beta) de la Beta
+# qui place le centre de la gaussienne, comme dans noisy_edge_mean_gauss.
+PROFILE_ALPHA = np.array([2.0, 2.0, 5.0])
+PROFILE_BETA = np.array([5.0, 2.0, 2.0])
+
+# États initiaux de noisy_edge_mean_beta (fluide, normal, dense) : paramètres
+# (alpha, beta) de départ et limite vers laquelle la congestion les pousse.
+STATE_START = np.array([[2.0, 5.0], [2.0, 2.0], [5.0, 2.0]])
+STATE_LIMIT = np.array([[5.0, 2.0], [3.0, 3.0], [2.0, 5.0]])
+
+# Nombre maximal de tirages gardés en mémoire en même temps (blocs de E x n_samples)
+BLOCK_SIZE = 1 << 22
+
+# Taille des tranches d'arêtes de converge_edge_means. Chaque tranche a son propre
+# flux aléatoire : le découpage ne dépend pas du nombre de processus.
+SHARD_SIZE = 4096
+
+
+def _chunks(n_edges, n_samples):
+    """Découpe les arêtes en tranches pour borner la taille des blocs (E, n_samples)."""
+    step = max(1, BLOCK_SIZE // max(1, n_samples))
+    for lo in range(0, n_edges, step):
+        yield lo, min(n_edges, lo + step)
+
+
+def default_generator(rng=None):
+    """
+    numpy.random.Generator pour rng (graine, SeedSequence ou Generator).
+
+    Sans rng, le générateur est semé depuis l'état global de np.random : un
+    np.random.seed(...) fait avant make_converge rend donc les tirages
+    reproductibles, comme avec les appels np.random.* de la version scalaire.
+    """
+    if rng is None:
+        rng = int(np.random.randint(0, 2**63 - 1, dtype=np.int64))
+    return np.random.default_rng(rng)
+
+
+def _standard_normal(rng, out):
+    """Remplit le tableau float32 out de N(0, 1) (Box-Muller sur des uniformes float32).
+
+    Deux à trois fois plus rapide que rng.standard_normal en float32. Les queues
+    sont coupées vers 5.8 écarts types, au-delà de toute troncature utilisée ici.
+    """
+    flat = out.reshape(-1)
+    half = (flat.size + 1) // 2
+    radius = rng.random(half, dtype=np.float32)
+    angle = rng.random(half, dtype=np.float32)
+    # 1 - u est dans ]0, 1] : pas de log(0)
+    np.subtract(np.float32(1), radius, out=radius)
+    np.log(radius, out=radius)
+    radius *= np.float32(-2)
+    np.sqrt(radius, out=radius)
+    angle *= np.float32(2 * np.pi)
+    np.multiply(radius, np.cos(angle), out=flat[:half])
+    np.multiply(radius[:flat.size - half], np.sin(angle[:flat.size - half]), out=flat[half:])
+    return out
+
+
+def gauss_edge_means(tmin, tmax, noise_scale, n_samples=1000, rng=None, return_stats=False):
+    """
+    Version vectorisée de SimpleGraph.noisy_edge_mean_gauss pour E arêtes.
+
+    Tire les profils et les centres de toutes les arêtes, puis des blocs
+    (arêtes, n_samples) de gaussiennes ; la moyenne tronquée à [tmin, tmax] est
+    calculée par réduction masquée. Une arête sans échantillon valide garde
+    son centre, comme la version scalaire.
+    rng : graine ou numpy.random.Generator (défaut : dérivé de l'état global np.random).
+    return_stats : renvoie (moyennes, nombre de tirages, erreurs types) comme
+        adaptive_edge_means, calculés sur les mêmes tirages (moyennes identiques).
+    """
+    rng = default_generator(rng)
+    tmin = np.asarray(tmin, dtype=float)
+    tmax = np.asarray(tmax, dtype=float)
+    n_edges = len(tmin)
+
+    profiles = rng.integers(0, 3, size=n_edges)
+    centres = rng.beta(PROFILE_ALPHA[profiles], PROFILE_BETA[profiles])
+    width = tmax - tmin
+    mu = tmin + centres * width
+    std = width / (5 + noise_scale)
+
+    # On travaille sur z ~ N(0, 1) en float32 : x = mu + std * z est dans [tmin, tmax]
+    # ssi z est dans [z_lo, z_hi], ce qui évite de matérialiser les échantillons x.
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z_lo = np.where(std > 0, (tmin - mu) / std, -np.inf).astype(np.float32)
+        z_hi = np.where(std > 0, (tmax - mu) / std, np.inf).astype(np.float32)
+
+    if not n_edges or n_samples <= 0:
+        return _with_stats(np.clip(mu, tmin, tmax), 0, None, std, return_stats)
+    means = np.empty(n_edges)
+    n_valid = np.zeros(n_edges)
+    m2 = np.zeros(n_edges)
+    # Un seul bloc de tirages et deux masques, réutilisés d'une tranche à l'autre
+    rows = min(n_edges, max(1, BLOCK_SIZE // n_samples))
+    z = np.empty((rows, n_samples), dtype=np.float32)
+    mask = np.empty(z.shape, dtype=bool)
+    below = np.empty(z.shape, dtype=bool)
+    for lo, hi in _chunks(n_edges, n_samples):
+        zc, valid, high = z[:hi - lo], mask[:hi - lo], below[:hi - lo]
+        _standard_normal(rng, zc)
+        np.greater_equal(zc, z_lo[lo:hi, None], out=valid)
+        np.less_equal(zc, z_hi[lo:hi, None], out=high)
+        valid &= high
+        counts = np.count_nonzero(valid, axis=1)
+        zc *= valid
+        sums = zc.sum(axis=1, dtype=np.float64)
+        z_mean = np.where(counts > 0, sums / np.maximum(counts, 1), 0.0)
+        # Sans échantillon valide on garde le centre mu
+        means[lo:hi] = mu[lo:hi] + std[lo:hi] * z_mean
+        if return_stats:
+            # zc est nul hors du masque : somme des carrés des tirages valides
+            squares = np.square(zc).sum(axis=1, dtype=np.float64)
+            n_valid[lo:hi] = counts
+            m2[lo:hi] = np.maximum(squares - counts * z_mean ** 2, 0.0)
+    return _with_stats(np.clip(means, tmin, tmax), n_samples, (n_valid, m2), std, return_stats)
+
+
+def _with_stats(means, n_samples, moments, scale, return_stats):
+    """Ajoute à means le nombre de tirages et l'erreur type (n_valid, m2 en unité réduite)."""
+    if not return_stats:
+        return means
+    counts = np.full(len(means), max(n_samples, 0), dtype=np.int64)
+    if moments is None:
+        return means, counts, np.full(len(means), np.nan)
+    n_valid, m2 = moments
+    with np.errstate(invalid='ignore', divide='ignore'):
+        stderr = np.where(n_valid >= 2, scale * np.sqrt(m2 / (n_valid - 1) / n_valid), np.nan)
+    return means, counts, stderr
+
+
+@lru_cache(maxsize=16)
+def congestion_schedule(n_samples, congestion_speed=0.1, liberation_every=100, liberation_force=0.3):
+    """
+    Paramètres (alpha, beta) utilisés à chaque moment par noisy_edge_mean_beta.
+
+    L'évolution ne dépend que de l'état initial, on la précalcule donc une fois
+    pour les trois états : renvoie deux tableaux (3, n_samples) en lecture seule.
+    """
+    start_a, start_b = STATE_START[:, 0], STATE_START[:, 1]
+    limit_a, limit_b = STATE_LIMIT[:, 0], STATE_LIMIT[:, 1]
+    alpha, beta = start_a.copy(), start_b.copy()
+    alphas = np.empty((3, n_samples))
+    betas = np.empty((3, n_samples))
+
+    for moment in range(n_samples):
+        alphas[:, moment] = alpha
+        betas[:, moment] = beta
+
+        if moment > 0 and moment % liberation_every == 0:
+            alpha = alpha - (alpha - start_a) * liberation_force
+            beta = beta - (beta - start_b) * liberation_force
+
+        alpha = np.clip(alpha + (limit_a - alpha) * congestion_speed * 0.01, 0.5, 10)
+        beta = np.clip(beta + (limit_b - beta) * congestion_speed * 0.01, 0.5, 10)
+
+    alphas.flags.writeable = False
+    betas.flags.writeable = False
+    return alphas, betas
+
+
+def beta_edge_means(tmin, tmax, n_samples=1000, rng=None,
+                    congestion_speed=0.1, liberation_every=100, liberation_force=0.3,
+                    return_stats=False):
+    """
+    Version vectorisée de SimpleGraph.noisy_edge_mean_beta pour E arêtes.
+
+    Chaque arête tire son état initial, puis tous ses tirages Beta sont faits en
+    un appel sur les paramètres (E, n_samples) issus de congestion_schedule.
+    Un tirage Beta est dans [0, 1], donc tous les temps observés sont dans
+    [tmin, tmax] : la moyenne des temps est tmin + moyenne des tirages * (tmax - tmin).
+    return_stats : voir gauss_edge_means.
+    """
+    rng = default_generator(rng)
+    tmin = np.asarray(tmin, dtype=float)
+    tmax = np.asarray(tmax, dtype=float)
+    n_edges = len(tmin)
+    if n_samples <= 0:
+        return _with_stats((tmin + tmax) / 2, 0, None, tmax - tmin, return_stats)
+
+    alphas, betas = congestion_schedule(n_samples, congestion_speed, liberation_every, liberation_force)
+    states = rng.integers(0, 3, size=n_edges)
+
+    fraction = np.empty(n_edges)
+    m2 = np.zeros(n_edges)
+    for lo, hi in _chunks(n_edges, n_samples):
+        chunk_states = states[lo:hi]
+        samples = rng.beta(alphas[chunk_states], betas[chunk_states])
+        fraction[lo:hi] = samples.mean(axis=1)
+        if return_stats:
+            m2[lo:hi] = np.square(samples - fraction[lo:hi, None]).sum(axis=1)
+    return _with_stats(tmin + fraction * (tmax - tmin), n_samples, (np.full(n_edges, float(n_samples)), m2),
+                       tmax - tmin, return_stats)
+
+
+def edge_scenarios(tmin, tmax, n_scenarios, beta=False, noise_scale=0.0, rng=None, n_moments=1000):
+    """
+    Tire n_scenarios scénarios de trafic : un temps de parcours par arête et par scénario.
+
+    Mêmes modèles que gauss_edge_means / beta_edge_means, mais chaque scénario est
+    un seul tirage par arête au lieu d'une moyenne. Gaussien : profil et centre
+    tirés par (scénario, arête), gaussienne tronquée à [tmin, tmax] (rejet, puis
+    centre pour les rares tirages encore hors bornes). Beta : chaque scénario est
+    un moment de congestion_schedule(n_moments), avec un état initial par arête.
+    Renvoie un tableau (n_scenarios, E) en float32.
+    """
+    rng = default_generator(rng)
+    tmin = np.asarray(tmin, dtype=float)
+    tmax = np.asarray(tmax, dtype=float)
+    shape = (n_scenarios, len(tmin))
+    width = tmax - tmin
+
+    if beta:
+        alphas, betas = congestion_schedule(n_moments)
+        states = rng.integers(0, 3, size=shape)
+        moments = rng.integers(0, n_moments, size=(n_scenarios, 1))
+        u = rng.beta(alphas[states, moments], betas[states, moments])
+        return (tmin + u * width).astype(np.float32)
+
+    profiles = rng.integers(0, 3, size=shape)
+    mu = tmin + rng.beta(PROFILE_ALPHA[profiles], PROFILE_BETA[profiles]) * width
+    std = width / (5 + noise_scale)
+    times = mu + std * rng.standard_normal(size=shape, dtype=np.float32)
+    outside = (times < tmin) | (times > tmax)
+    for _ in range(8):
+        if not outside.any():
+            break
+        rows, cols = np.nonzero(outside)
+        times[rows, cols] = mu[rows, cols] + std[cols] * rng.standard_normal(size=rows.size, dtype=np.float32)
+        outside[rows, cols] = (times[rows, cols] < tmin[cols]) | (times[rows, cols] > tmax[cols])
+    times = np.where(outside, mu, times)
+    return times.astype(np.float32)
+
+
+def seed_sequence(rng=None):
+    """Convertit une graine, un SeedSequence ou un Generator en SeedSequence racine.
+
+    Sans rng, la graine racine est tirée de l'état global de np.random (voir
+    default_generator).
+    """
+    if isinstance(rng, np.random.SeedSequence):
+        return rng
+    if isinstance(rng, np.random.Generator):
+        return np.random.SeedSequence(int(rng.integers(2**63)))
+    if rng is None:
+        rng = int(np.random.randint(0, 2**63 - 1, dtype=np.int64))
+    return np.random.SeedSequence(rng)
+
+
+def adaptive_edge_means(tmin, tmax, beta=False, noise_scale=0.0, rtol=0.01, max_samples=1000,
+                        batch_size=50, rng=None):
+    """
+    Estimation séquentielle des moyennes avec arrêt anticipé, arête par arête.
+
+    On tire des lots de `batch_size` échantillons pour les arêtes encore actives
+    et on met à jour moyenne et variance en ligne (Welford, fusion par lots).
+    Une arête s'arrête dès que l'erreur type de sa moyenne passe sous
+    rtol * (tmax - tmin), ou quand elle a tiré `max_samples` échantillons.
+    Le modèle (gaussien ou beta) est celui de gauss_edge_means / beta_edge_means.
+
+    Modèle beta : les tirages suivent congestion_schedule, leur loi change d'un
+    moment à l'autre, et la moyenne des premiers tirages seulement est biaisée
+    (une arête fluide qui s'arrête tôt n'a pas vu la congestion monter). On estime
+    donc l'écart de chaque tirage à son espérance exacte alpha / (alpha + beta) :
+    ces écarts sont de moyenne nulle à tout moment, et la moyenne renvoyée est
+    l'espérance sur les max_samples moments plus la moyenne des écarts observés.
+
+    Renvoie (moyennes, nombre de tirages, erreurs types) ; l'erreur type vaut
+    nan pour une arête qui n'a pas deux échantillons valides.
+    """
+    rng = default_generator(rng)
+    tmin = np.asarray(tmin, dtype=float)
+    tmax = np.asarray(tmax, dtype=float)
+    n_edges = len(tmin)
+    width = tmax - tmin
+
+    # Les échantillons sont suivis dans une unité réduite u, avec temps = loc + scale * u :
+    # u = tirage Beta dans [0, 1] (modèle beta) ou u = z ~ N(0, 1) (modèle gaussien).
+    # Modèle beta : u = tirage - espérance du moment, temps = tmin + width * (horizon + u).
+    if beta:
+        alphas, betas = congestion_schedule(max_samples)
+        expected = alphas / (alphas + betas)
+        states = rng.integers(0, 3, size=n_edges)
+        loc, scale = tmin + width * expected.mean(axis=1)[states], width
+        fallback = (tmin + tmax) / 2
+    else:
+        profiles = rng.integers(0, 3, size=n_edges)
+        centres = rng.beta(PROFILE_ALPHA[profiles], PROFILE_BETA[profiles])
+        loc = tmin + centres * width
+        scale = width / (5 + noise_scale)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            z_lo = np.where(scale > 0, (tmin - loc) / scale, -np.inf).astype(np.float32)
+            z_hi = np.where(scale > 0, (tmax - loc) / scale, np.inf).astype(np.float32)
+        fallback = loc
+
+    counts = np.zeros(n_edges, dtype=np.int64)
+    n_valid = np.zeros(n_edges)
+    mean = np.zeros(n_edges)
+    m2 = np.zeros(n_edges)
+    active = np.arange(n_edges)
+    drawn = 0
+
+    while active.size and drawn < max_samples:
+        b = min(batch_size, max_samples - drawn)
+        if beta:
+            moments = states[active], slice(drawn, drawn + b)
+            u = rng.beta(alphas[moments], betas[moments]) - expected[moments]
+            mask = np.ones(u.shape, dtype=bool)
+        else:
+            u = rng.standard_normal(size=(active.size, b), dtype=np.float32)
+            mask = (u >= z_lo[active, None]) & (u <= z_hi[active, None])
+
+        # Statistiques du lot puis fusion avec l'état courant (formule de Chan)
+        nb = mask.sum(axis=1)
+        mb = np.where(mask, u, 0.0).sum(axis=1, dtype=np.float64) / np.maximum(nb, 1)
+        m2b = np.where(mask, (u - mb[:, None]) ** 2, 0.0).sum(axis=1, dtype=np.float64)
+        na = n_valid[active]
+        total = na + nb
+        delta = mb - mean[active]
+        ratio = nb / np.maximum(total, 1)
+        mean[active] += delta * ratio
+        m2[active] += m2b + delta ** 2 * na * ratio
+        n_valid[active] = total
+        counts[active] += b
+        drawn += b
+
+        n_act = n_valid[active]
+        stderr = scale[active] * np.sqrt(m2[active] / np.maximum(n_act - 1, 1) / np.maximum(n_act, 1))
+        done = (n_act >= 2) & (stderr <= rtol * width[active])
+        active = active[~done]
+
+    means = np.where(n_valid > 0, loc + scale * mean, fallback)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        stderr = np.where(n_valid >= 2, scale * np.sqrt(m2 / (n_valid - 1) / n_valid), np.nan)
+    return np.clip(means, tmin, tmax), counts, stderr
+
+
+def _shard_means(task):
+    tmin, tmax, beta, n_samples, noise_scale, rtol, batch_size, stats, seed = task
+    rng = np.random.default_rng(seed)
+    if rtol is not None:
+        return adaptive_edge_means(tmin, tmax, beta, noise_scale, rtol, n_samples, batch_size, rng)
+    if beta:
+        return beta_edge_means(tmin, tmax, n_samples, rng, return_stats=stats)
+    return gauss_edge_means(tmin, tmax, noise_scale, n_samples, rng, return_stats=stats)
+
+
+def _run_shards(tmin, tmax, beta, n_samples, rng, workers, rtol=None, batch_size=50, stats=False):
+    """Découpe les arêtes en tranches à graines indépendantes et les traite, en parallèle si workers > 1."""
+    tmin = np.asarray(tmin, dtype=float)
+    tmax = np.asarray(tmax, dtype=float)
+    root = seed_sequence(rng)
+    noise_scale = np.random.default_rng(root).uniform(0, 0.5)
+
+    bounds = list(range(0, len(tmin), SHARD_SIZE))
+    tasks = [(tmin[lo:lo + SHARD_SIZE], tmax[lo:lo + SHARD_SIZE], beta, n_samples, noise_scale,
+              rtol, batch_size, stats, child)
+             for lo, child in zip(bounds, root.spawn(len(bounds)))]
+
+    if workers is not None and workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            return list(pool.map(_shard_means, tasks))
+    return [_shard_means(task) for task in tasks]
+
+
+def converge_edge_means(tmin, tmax, beta=False, n_samples=1000, rng=None, workers=1):
+    """
+    Moyennes estimées de toutes les arêtes pour make_converge.
+
+    Les arêtes sont découpées en tranches de SHARD_SIZE ; la tranche k utilise le
+    k-ième enfant (SeedSequence.spawn) de la graine racine. Le résultat est donc
+    identique bit à bit quel que soit `workers`, le nombre de processus utilisés
+    pour traiter les tranches en parallèle.
+    """
+    results = _run_shards(tmin, tmax, beta, n_samples, rng, workers)
+    if not results:
+        return np.zeros(0)
+    return np.concatenate(results)
+
+
+def converge_edge_stats(tmin, tmax, beta=False, n_samples=1000, rng=None, workers=1,
+                        rtol=0.01, batch_size=50):
+    """
+    Comme converge_edge_means, avec le nombre de tirages et l'erreur type de chaque arête.
+
+    Avec rtol, estimateur adaptatif (adaptive_edge_means) et n_samples est le
+    plafond de tirages par arête. Avec rtol=None, mêmes tirages et mêmes moyennes
+    que converge_edge_means. Renvoie (moyennes, nombre de tirages, erreurs types).
+    """
+    results = _run_shards(tmin, tmax, beta, n_samples, rng, workers, rtol, batch_size, stats=True)
+    if not results:
+        return np.zeros(0), np.zeros(0, dtype=np.int64), np.zeros(0)
+    return tuple(np.concatenate(parts) for parts in zip(*results))
+
+
+def test_workers_reproducible():
+    """Le résultat de converge_edge_means ne dépend ni de workers ni des statistiques demandées."""
+    rng = np.random.default_rng(0)
+    tmin = rng.uniform(1, 10, 3 * SHARD_SIZE + 5)
+    tmax = tmin + rng.uniform(0, 5, len(tmin))
+    for beta in (False, True):
+        serial = converge_edge_means(tmin, tmax, beta, 20, rng=7, workers=1)
+        parallel = converge_edge_means(tmin, tmax, beta, 20, rng=7, workers=2)
+        assert np.array_equal(serial, parallel), f"workers changes the means (beta={beta})"
+        stats = converge_edge_stats(tmin, tmax, beta, 20, rng=7, workers=2, rtol=None)
+        assert np.array_equal(serial, stats[0]), f"return_stats changes the means (beta={beta})"
+        serial = converge_edge_stats(tmin, tmax, beta, 40, rng=7, workers=1, rtol=0.05, batch_size=10)
+        parallel = converge_edge_stats(tmin, tmax, beta, 40, rng=7, workers=2, rtol=0.05, batch_size=10)
+        assert all(np.array_equal(a, b, equal_nan=True) for a, b in zip(serial, parallel)), \
+            f"workers changes the adaptive estimates (beta={beta})"
+    # Sans rng, np.random.seed rend les tirages reproductibles
+    np.random.seed(3)
+    first = converge_edge_means(tmin[:10], tmax[:10], False, 20)
+    np.random.seed(3)
+    assert np.array_equal(first, converge_edge_means(tmin[:10], tmax[:10], False, 20)), "np.random.seed ignored"
+    print("✓ Test passed: workers reproducibility")
+
+
+# Pas à l'import : les processus de workers réimportent ce module (méthode spawn)
+if __name__ == '__main__':
+    test_workers_reproducible()
@@ -0,0 +1,201 @@
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from GraphStruct import FrozenGraph
+from Abstract import _tree_search
+from Sampling import BLOCK_SIZE, edge_scenarios, seed_sequence
+
+# Routage Monte-Carlo par lots de scénarios.
+# Un scénario donne un temps de parcours à chaque arête (Sampling.edge_scenarios).
+# Les S plus courts chemins sont résolus ensemble : Bellman-Ford vectorisé sur
+# les tableaux CSR, une colonne de la matrice des distances par scénario. Les
+# sommets sont relâchés dans l'ordre de l'arbre des plus courts chemins du
+# graphe moyen : comme les scénarios s'en écartent peu, quelques balayages
+# suffisent au lieu d'une itération par arc du plus long chemin.
+
+
+def route_scenarios(graph, start, end, n_scenarios=1000, beta=False, rng=None, workers=1):
+    """
+    Fréquence à laquelle chaque route est la plus rapide, sur n_scenarios scénarios.
+
+    Renvoie un dict :
+      'routes' : [(chemin, nombre de scénarios, fréquence), ...] par fréquence décroissante
+      'times'  : temps de parcours optimal de chaque scénario (tableau (S,), inf si injoignable)
+      'route'  : indice dans 'routes' de la route choisie par chaque scénario (-1 si aucune)
+    Les scénarios sont traités par lots à graines indépendantes (SeedSequence.spawn) :
+    le résultat ne dépend pas de workers, le nombre de processus utilisés.
+    """
+    frozen = graph if isinstance(graph, FrozenGraph) else graph.freeze()
+    if start not in frozen.index or end not in frozen.index:
+        raise ValueError(f'start {start!r} and end {end!r} must both be in the graph')
+    s, t = frozen.index[start], frozen.index[end]
+    canonical, position = frozen._canonical_edges()
+    rindptr, rsources, rpositions = frozen.reverse_csr()
+    root = seed_sequence(rng)
+    noise_scale = np.random.default_rng(root).uniform(0, 0.5)
+
+    # Ordre de balayage : sommets joignables groupés par profondeur dans l'arbre des
+    # plus courts chemins pour les temps moyens
+    dist, parent = _tree_search(frozen, (frozen.tmin + frozen.tmax) / 2, s)
+    reached = np.flatnonzero(np.isfinite(dist) & (parent >= 0))
+    depth = np.zeros(len(parent), dtype=np.int64)
+    for v in reached[np.argsort(dist[reached], kind='stable')].tolist():
+        depth[v] = depth[parent[v]] + 1
+    order = reached[np.argsort(depth[reached], kind='stable')]
+    levels = np.split(order, np.flatnonzero(np.diff(depth[order])) + 1) if len(order) else []
+
+    # Taille des lots : bornée par BLOCK_SIZE valeurs (scénarios x arcs)
+    chunk = max(1, BLOCK_SIZE // max(1, len(frozen.indices)))
+    sizes = [min(chunk, n_scenarios - lo) for lo in range(0, n_scenarios, chunk)]
+    tasks = [(frozen.tmin[canonical], frozen.tmax[canonical], position, rindptr, rsources, rpositions,
+              levels, s, t, size, beta, noise_scale, child)
+             for size, child in zip(sizes, root.spawn(len(sizes)))]
+    if workers is not None and workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            results = list(pool.map(_solve_chunk, tasks))
+    else:
+        results = [_solve_chunk(task) for task in tasks]
+
+    times = np.concatenate([r[0] for r in results]) if results else np.zeros(0)
+    # Table des routes : une ligne de la matrice des chemins par scénario
+    counts, route, paths = {}, [], []
+    for _, chunk_paths in results:
+        for row in chunk_paths:
+            key = tuple(v for v in row.tolist() if v >= 0)
+            if not key:
+                route.append(-1)
+                continue
+            if key not in counts:
+                counts[key] = 0
+                paths.append(key)
+            counts[key] += 1
+            route.append(key)
+    ranking = sorted(paths, key=lambda key: -counts[key])
+    rank = {key: i for i, key in enumerate(ranking)}
+    routes = [([frozen.labels[v] for v in key], counts[key], counts[key] / n_scenarios) for key in ranking]
+    return {'routes': routes, 'times': times,
+            'route': np.array([rank[key] if key != -1 else -1 for key in route], dtype=np.int64)}
+
+
+def _solve_chunk(task):
+    tmin, tmax, position, rindptr, rsources, rpositions, levels, s, t, size, beta, noise_scale, seed = task
+    n = len(rindptr) - 1
+    # Tableaux rangés par sommet / par arc, scénarios en colonnes : les lignes
+    # manipulées ensemble sont contiguës. Les arcs suivent l'ordre CSR inverse :
+    # les arcs entrants d'un sommet forment un segment, réduit par np.minimum.reduceat
+    # (pas de table complétée à la taille du plus grand degré entrant).
+    weights = edge_scenarios(tmin, tmax, size, beta, noise_scale, np.random.default_rng(seed))
+    weights = weights.T[position[rpositions]].astype(float)
+
+    # Bellman-Ford vectorisé sur les scénarios, en balayages Gauss-Seidel : les
+    # sommets sont relâchés profondeur par profondeur (min sur leurs arcs entrants),
+    # donc une distance corrigée se propage dans le même balayage le long de
+    # l'arbre moyen. Le premier balayage donne déjà les distances le long de cet
+    # arbre ; les suivants ne corrigent que les écarts, jusqu'à stabilité.
+    # Les sommets d'un niveau ont tous un parent, donc au moins un arc entrant.
+    dist = np.full((n, size), np.inf)
+    dist[s] = 0.0
+    gathers = []
+    for nodes in levels:
+        arcs, bounds = _incoming(rindptr, nodes)
+        gathers.append((nodes, rsources[arcs], arcs, bounds))
+    for _ in range(n):
+        improved = False
+        for nodes, srcs, arcs, bounds in gathers:
+            best = np.minimum.reduceat(dist[srcs] + weights[arcs], bounds, axis=0)
+            better = best < dist[nodes]
+            if better.any():
+                dist[nodes] = np.where(better, best, dist[nodes])
+                improved = True
+        if not improved:
+            break
+
+    # Remontée des chemins depuis t, vectorisée sur les scénarios : à chaque pas
+    # on prend le premier arc entrant qui réalise la distance
+    columns = [np.full(size, t, dtype=np.int64)]
+    current = columns[0].copy()
+    active = np.isfinite(dist[t]) & (current != s)
+    for _ in range(n):
+        if not active.any():
+            break
+        r = np.flatnonzero(active)
+        arcs, bounds = _incoming(rindptr, current[r])
+        counts = np.diff(np.append(bounds, len(arcs)))
+        rows = np.repeat(r, counts)
+        cand = dist[rsources[arcs], rows] + weights[arcs, rows]
+        hits = np.flatnonzero(cand == np.repeat(np.minimum.reduceat(cand, bounds), counts))
+        segment = np.repeat(np.arange(len(r)), counts)[hits]
+        chosen = arcs[hits[np.append(True, segment[1:] != segment[:-1])]]
+        current[r] = rsources[chosen]
+        column = np.full(size, -1, dtype=np.int64)
+        column[r] = current[r]
+        columns.append(column)
+        active &= current != s
+    paths = np.stack(columns[::-1], axis=1)
+    paths[~np.isfinite(dist[t])] = -1
+    return dist[t], paths
+
+
+def _incoming(rindptr, nodes):
+    # Arcs entrants (indices CSR inverses) des sommets nodes, mis bout à bout, et
+    # début du segment de chaque sommet
+    starts = rindptr[nodes]
+    counts = rindptr[nodes + 1] - starts
+    bounds = np.cumsum(counts) - counts
+    return np.arange(counts.sum()) + np.repeat(starts - bounds, counts), bounds
+
+
+def test_brute_force():
+    """Temps et routes de chaque scénario contre un Dijkstra par scénario sur les mêmes tirages"""
+    import random
+    from GraphStruct import SimpleGraph
+    global edge_scenarios
+    rng = random.Random(19)
+    drawn, draw = [], edge_scenarios
+
+    def recorded(*args, **kwargs):
+        # Tirages de _solve_chunk, gardés pour refaire chaque scénario
+        weights = draw(*args, **kwargs)
+        drawn.append(weights)
+        return weights
+
+    edge_scenarios = recorded
+    try:
+        for trial in range(40):
+            g = SimpleGraph(directed=trial % 2 == 0)
+            n = rng.randint(2, 12)
+            for v in range(n):
+                g.add_node(v)
+            for _ in range(rng.randint(n, 3 * n)):
+                u, v = rng.randrange(n), rng.randrange(n)
+                if u != v:
+                    tmin = rng.randint(1, 9)
+                    g.add_edge(u, v, tmin, tmin + rng.randint(0, 6))
+            frozen = g.freeze()
+            s, t = rng.randrange(n), rng.randrange(n)
+            drawn.clear()
+            result = route_scenarios(frozen, s, t, n_scenarios=25, beta=trial % 4 < 2, rng=trial)
+            canonical, position = frozen._canonical_edges()
+            scenarios = np.concatenate(drawn)
+            assert len(scenarios) == 25 == len(result['times']) == len(result['route'])
+            for k, row in enumerate(scenarios):
+                weights = row[position].astype(float)
+                dist, _ = _tree_search(frozen, weights, frozen.index[s])
+                best = dist[frozen.index[t]]
+                assert np.isclose(result['times'][k], best) or best == result['times'][k] == np.inf, \
+                    f"trial {trial}, scenario {k}: {result['times'][k]} != {best}"
+                if result['route'][k] < 0:
+                    assert best == np.inf
+                    continue
+                path = result['routes'][result['route'][k]][0]
+                assert path[0] == s and path[-1] == t, f"trial {trial}: {path}"
+                # Coût du chemin choisi avec les temps du scénario : optimal
+                cost = sum(min(weights[pos] for pos in range(frozen.indptr[u], frozen.indptr[u + 1])
+                               if frozen.indices[pos] == v)
+                           for u, v in zip(map(frozen.index.get, path), map(frozen.index.get, path[1:])))
+                assert np.isclose(cost, best), f"trial {trial}, scenario {k}: {path} costs {cost}, not {best}"
+            assert sum(count for _, count, _ in result['routes']) == int((result['route'] >= 0).sum())
+    finally:
+        edge_scenarios = draw
+    print("✓ Test passed: route_scenarios matches per-scenario Dijkstra")
+
+test_brute_force()
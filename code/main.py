@@ -42,15 +42,15 @@ edgelist_path = os.path.join(here, 'example_edgelist.txt')
 if os.path.exists(csv_path):
     print('Loading graph from CSV:', csv_path)
     gf = SimpleGraph.from_csv(csv_path, has_header=True)
-    print('Loaded', len(gf.nodes()), 'nodes from CSV')
+    print('Loaded', gf.num_nodes(), 'nodes from CSV')
 elif os.path.exists(json_path):
     print('Loading graph from JSON:', json_path)
     gf = SimpleGraph.from_json(json_path)
-    print('Loaded', len(gf.nodes()), 'nodes from JSON')
+    print('Loaded', gf.num_nodes(), 'nodes from JSON')
 elif os.path.exists(edgelist_path):
     print('Loading graph from edge-list file:', edgelist_path)
     gf = SimpleGraph.from_edgelist_file(edgelist_path)
-    print('Loaded', len(gf.nodes()), 'nodes from edge-list')
+    print('Loaded', gf.num_nodes(), 'nodes from edge-list')
 else:
     print('No example graph files found (put example_edges.csv, example_graph.json or example_edgelist.txt in code/)')
 